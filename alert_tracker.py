@@ -8,7 +8,32 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import time
-import threading
+
+from config.settings import ENABLE_PRICE_TRACKING_SCHEDULER
+from data.alert_index import AlertIndex
+from data.alert_state import AlertStateCache
+from data.alerts_schema import upgrade_alerts_schema
+from data.db import close_write_queue, connect, get_write_queue
+from tracking_scheduler import TrackingScheduler
+from utils.http_client import http_get
+from utils.metrics import metrics
+from utils.price_service import fetch_prices
+from utils.rate_limiter import geckoterminal_limiter, request_with_rate_limit
+
+# Colonnes renseignées par save_alert() (les autres prennent leur valeur par défaut)
+ALERT_INSERT_COLUMNS = (
+    'token_name', 'token_address', 'network',
+    'price_at_alert', 'score', 'tier', 'base_score', 'momentum_bonus', 'confidence_score',
+    'volume_24h', 'volume_6h', 'volume_1h', 'liquidity',
+    'buys_24h', 'sells_24h', 'buy_ratio', 'total_txns', 'age_hours',
+    'entry_price', 'stop_loss_price', 'stop_loss_percent',
+    'tp1_price', 'tp1_percent', 'tp2_price', 'tp2_percent',
+    'tp3_price', 'tp3_percent', 'alert_message',
+    'volume_acceleration_1h_vs_6h', 'volume_acceleration_6h_vs_24h',
+    'velocite_pump', 'type_pump', 'decision_tp_tracking',
+    'temps_depuis_alerte_precedente', 'is_alerte_suivante', 'version',
+)
+
 
 class AlertTracker:
     def __init__(self, db_path='alerts_history.db', version='v2'):
@@ -21,9 +46,18 @@ class AlertTracker:
         """
         self.db_path = db_path
         self.version = version
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Lectures + création du schéma; toutes les écritures passent ensuite par
+        # la file d'écriture unique du process (WAL, transactions groupées)
+        self.conn = connect(db_path, check_same_thread=False)
+        self.scheduler = None  # TrackingScheduler, démarré par start_scheduler()
         self.create_tables()
-        print(f"✅ AlertTracker initialisé - DB: {db_path} - Version: {version}")
+        self.writer = get_write_queue(db_path)
+        # Index mémoire des tokens alertés (déduplication / anti-rug sans SQL par candidat)
+        self.index = AlertIndex()
+        self.index.load(self.conn)
+        # État par alerte (entry, epoch, plus haut/bas) pour le tracking temps réel, hydraté à la demande
+        self.states = AlertStateCache()
+        print(f"✅ AlertTracker initialisé - DB: {db_path} - Version: {version} - {len(self.index)} token(s) indexé(s)")
 
     def create_tables(self):
         """Crée les tables de la base de données."""
@@ -201,6 +235,10 @@ class AlertTracker:
         except sqlite3.OperationalError:
             pass  # Colonne existe déjà
 
+        # Colonne created_at_epoch + index composites (filtres temporels indexables)
+        for operation in upgrade_alerts_schema(self.conn):
+            print(f"✅ Schéma alerts: {operation}")
+
         self.conn.commit()
         print("✅ Tables créées avec succès")
 
@@ -214,23 +252,10 @@ class AlertTracker:
         Returns:
             alert_id: ID de l'alerte créée
         """
-        cursor = self.conn.cursor()
+        write_start = time.perf_counter()
 
         try:
-            cursor.execute("""
-                INSERT INTO alerts (
-                    token_name, token_address, network,
-                    price_at_alert, score, tier, base_score, momentum_bonus, confidence_score,
-                    volume_24h, volume_6h, volume_1h, liquidity,
-                    buys_24h, sells_24h, buy_ratio, total_txns, age_hours,
-                    entry_price, stop_loss_price, stop_loss_percent,
-                    tp1_price, tp1_percent, tp2_price, tp2_percent,
-                    tp3_price, tp3_percent, alert_message,
-                    volume_acceleration_1h_vs_6h, volume_acceleration_6h_vs_24h,
-                    velocite_pump, type_pump, decision_tp_tracking,
-                    temps_depuis_alerte_precedente, is_alerte_suivante, version
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            row = dict(zip(ALERT_INSERT_COLUMNS, (
                 alert_data['token_name'],
                 alert_data['token_address'],
                 alert_data['network'],
@@ -267,16 +292,21 @@ class AlertTracker:
                 alert_data.get('temps_depuis_alerte_precedente', 0),
                 alert_data.get('is_alerte_suivante', 0),
                 alert_data.get('version', self.version)  # Utilise version de l'instance
-            ))
+            )))
+
+            # Attente du commit: l'ID est nécessaire au tracking et aux déduplications suivantes
+            alert_id, created_at, created_epoch = self.writer.submit(lambda conn: self._insert_alert(conn, row)).result()
+            self.index.add(dict(row, id=alert_id, created_at=created_at))
+            self.states.add(alert_id, row['entry_price'], created_epoch)
 
-            self.conn.commit()
-            alert_id = cursor.lastrowid
+            metrics.observe("sqlite_write_seconds", time.perf_counter() - write_start, op="save_alert")
 
             print(f"✅ Alerte sauvegardée - ID: {alert_id} - Token: {alert_data['token_name']}")
 
-            # NOTE: Le tracking prix est maintenant géré par le cron job Railway (price_tracker_cron_railway.py)
-            # Pas besoin de créer des threads ici pour éviter "can't start new thread"
-            # self.start_price_tracking(alert_id, alert_data['token_address'], alert_data['network'])
+            # Checkpoints 15min/1h/4h/24h (table price_tracking + analyse 24h) via le scheduler
+            # mono-thread; les colonnes price_Xh_after restent gérées par le cron Railway
+            if ENABLE_PRICE_TRACKING_SCHEDULER:
+                self.start_price_tracking(alert_id, alert_data['token_address'], alert_data['network'])
 
             return alert_id
 
@@ -285,43 +315,43 @@ class AlertTracker:
             return -1
         except Exception as e:
             print(f"❌ Erreur sauvegarde alerte: {e}")
-            self.conn.rollback()
             return -1
 
+    @staticmethod
+    def _insert_alert(conn, row: Dict) -> tuple:
+        """Opération de la file d'écriture: INSERT + created_at (et son epoch, trigger) attribués par SQLite."""
+        cursor = conn.execute(
+            f"INSERT INTO alerts ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            tuple(row.values()),
+        )
+        created_at, created_epoch = conn.execute(
+            "SELECT created_at, created_at_epoch FROM alerts WHERE id = ?", (cursor.lastrowid,)
+        ).fetchone()
+        return cursor.lastrowid, created_at, created_epoch
+
+    def start_scheduler(self) -> TrackingScheduler:
+        """Démarre (une fois) le scheduler de tracking et reprend les checkpoints en attente."""
+        if self.scheduler is None:
+            self.scheduler = TrackingScheduler(self)
+            self.scheduler.start()
+        return self.scheduler
+
     def start_price_tracking(self, alert_id: int, token_address: str, network: str):
         """
-        Démarre le tracking automatique des prix à intervalles définis.
+        Planifie le tracking automatique des prix à intervalles définis
+        (PRICE_TRACKING_INTERVALS_MINUTES, analyse finale au dernier checkpoint).
 
         Args:
             alert_id: ID de l'alerte
             token_address: Adresse du token
             network: Réseau (eth, bsc, etc.)
         """
-        # Intervalles de tracking (en minutes)
-        intervals = [15, 60, 240, 1440]  # 15min, 1h, 4h, 24h
-
-        def track_at_interval(minutes):
-            """Fonction qui sera appelée après X minutes."""
-            time.sleep(minutes * 60)
-            self.update_price_tracking(alert_id, token_address, network, minutes)
-
-            # Si c'est le tracking 24h, faire l'analyse finale
-            if minutes == 1440:
-                self.analyze_alert_performance(alert_id)
-
-        # Lancer un thread pour chaque intervalle
-        for interval in intervals:
-            thread = threading.Thread(
-                target=track_at_interval,
-                args=(interval,),
-                daemon=True,
-                name=f"Tracker-{alert_id}-{interval}min"
-            )
-            thread.start()
+        scheduler = self.start_scheduler()
+        scheduler.schedule(alert_id, token_address, network)
+        print(f"📊 Tracking planifié pour alerte {alert_id} aux intervalles: {scheduler.intervals} minutes")
 
-        print(f"📊 Tracking démarré pour alerte {alert_id} aux intervalles: {intervals} minutes")
-
-    def update_price_tracking(self, alert_id: int, token_address: str, network: str, minutes_after: int):
+    def update_price_tracking(self, alert_id: int, token_address: str, network: str, minutes_after: int,
+                              current_price: Optional[float] = None):
         """
         Met à jour le tracking du prix à un moment donné.
 
@@ -330,6 +360,7 @@ class AlertTracker:
             token_address: Adresse du token
             network: Réseau
             minutes_after: Minutes écoulées depuis l'alerte
+            current_price: Prix déjà récupéré (lot du scheduler), sinon fetch
         """
         try:
             # Récupérer les données de l'alerte
@@ -347,8 +378,9 @@ class AlertTracker:
 
             price_at_alert, entry_price, sl_price, tp1_price, tp2_price, tp3_price = result
 
-            # Récupérer le prix actuel (fonction à implémenter selon ton API)
-            current_price = self.fetch_current_price(token_address, network)
+            # Récupérer le prix actuel (sauf si fourni par le lot du scheduler)
+            if current_price is None:
+                current_price = self.fetch_current_price(token_address, network)
 
             if current_price is None or current_price <= 0:
                 print(f"⚠️ Prix invalide pour {token_address} - Skip tracking")
@@ -373,8 +405,8 @@ class AlertTracker:
             highest_price = max(current_price, highest or current_price)
             lowest_price = min(current_price, lowest or current_price)
 
-            # Insérer ou mettre à jour le tracking
-            cursor.execute("""
+            # Insérer ou mettre à jour le tracking (commit groupé par la file d'écriture)
+            self.writer.execute("""
                 INSERT OR REPLACE INTO price_tracking (
                     alert_id, minutes_after_alert, price, roi_percent,
                     sl_hit, tp1_hit, tp2_hit, tp3_hit,
@@ -385,8 +417,7 @@ class AlertTracker:
                 sl_hit, tp1_hit, tp2_hit, tp3_hit,
                 highest_price, lowest_price
             ))
-
-            self.conn.commit()
+            self.states.observe(alert_id, current_price)
 
             # Log
             status = []
@@ -418,11 +449,9 @@ class AlertTracker:
             Prix actuel ou None si erreur
         """
         try:
-            import requests
-
             # Méthode 1: DexScreener API (fonctionne pour tous les réseaux)
             url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -455,7 +484,11 @@ class AlertTracker:
 
             gecko_network = network_map.get(network, network)
             url = f"https://api.geckoterminal.com/api/v2/networks/{gecko_network}/tokens/{token_address}"
-            response = requests.get(url, timeout=10)
+            response = request_with_rate_limit(
+                geckoterminal_limiter,
+                lambda: http_get(url, timeout=10),
+                label=f"token {token_address[:8]}",
+            )
 
             if response.status_code == 200:
                 data = response.json()
@@ -471,6 +504,18 @@ class AlertTracker:
             print(f"❌ Erreur fetch price {token_address[:10]}...: {e}")
             return None
 
+    def fetch_current_prices(self, pools: List[tuple]) -> Dict[str, float]:
+        """
+        Prix actuels de plusieurs pools en requêtes groupées (service de prix partagé).
+
+        Args:
+            pools: Couples (token_address, network) - token_address = adresse du pool alerté
+
+        Returns:
+            {token_address: prix} (adresses sans prix absentes)
+        """
+        return fetch_prices((network, token_address) for token_address, network in pools)
+
     def analyze_alert_performance(self, alert_id: int):
         """
         Analyse la performance globale d'une alerte après 24h.
@@ -479,6 +524,8 @@ class AlertTracker:
             alert_id: ID de l'alerte
         """
         try:
+            # Les checkpoints du lot en cours doivent être commités avant lecture
+            self.writer.flush()
             cursor = self.conn.cursor()
 
             # Récupérer tous les trackings
@@ -547,7 +594,7 @@ class AlertTracker:
                 coherence_notes = "Aucun niveau significatif atteint"
 
             # Sauvegarder l'analyse
-            cursor.execute("""
+            self.writer.execute("""
                 INSERT OR REPLACE INTO alert_analysis (
                     alert_id, was_profitable, best_roi_4h, worst_roi_4h,
                     roi_at_4h, roi_at_24h,
@@ -563,8 +610,6 @@ class AlertTracker:
                 prediction_quality, was_coherent, coherence_notes
             ))
 
-            self.conn.commit()
-
             print(f"\n{'='*80}")
             print(f"📊 ANALYSE FINALE - Alerte {alert_id}")
             print(f"{'='*80}")
@@ -580,7 +625,7 @@ class AlertTracker:
 
     def token_already_alerted(self, token_address: str) -> bool:
         """
-        Vérifie si un token a déjà reçu une alerte.
+        Vérifie si un token a déjà reçu une alerte (index mémoire, sans SQL).
 
         Args:
             token_address: Adresse du token
@@ -588,14 +633,24 @@ class AlertTracker:
         Returns:
             True si le token a déjà été alerté, False sinon
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) FROM alerts
-            WHERE token_address = ?
-        """, (token_address,))
+        return self.index.has(token_address)
 
-        count = cursor.fetchone()[0]
-        return count > 0
+    def reserve_alert(self, token_address: str) -> bool:
+        """
+        Réserve l'envoi d'une alerte pour un token (avant la mise en file Telegram).
+
+        Returns:
+            False si une alerte pour ce token est déjà en file d'envoi
+        """
+        return self.index.reserve(token_address)
+
+    def release_alert(self, token_address: str):
+        """Libère la réservation (après save_alert() ou échec d'envoi)."""
+        self.index.release(token_address)
+
+    def alert_in_flight(self, token_address: str) -> bool:
+        """True si une alerte pour ce token est en file d'envoi, pas encore sauvegardée."""
+        return self.index.in_flight(token_address)
 
     def count_alerts_for_token(self, token_address: str, hours: int = 24) -> int:
         """
@@ -609,19 +664,24 @@ class AlertTracker:
         Returns:
             Nombre d'alertes récentes pour ce token
         """
+        count = self.index.count_recent(token_address, hours)
+        if count is not None:
+            return count
+
+        # Fenêtre au-delà de la rétention de l'index: requête SQL
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT COUNT(*) FROM alerts
             WHERE token_address = ?
-            AND datetime(created_at) >= datetime('now', ?)
-        """, (token_address, f'-{hours} hours'))
+            AND created_at_epoch >= ?
+        """, (token_address, int(time.time() - hours * 3600)))
 
         count = cursor.fetchone()[0]
         return count
 
     def get_last_alert_for_token(self, token_address: str) -> Optional[Dict]:
         """
-        Récupère la dernière alerte pour un token donné.
+        Récupère la dernière alerte pour un token donné (index mémoire).
 
         Args:
             token_address: Adresse du token
@@ -629,45 +689,7 @@ class AlertTracker:
         Returns:
             Dict avec les données de la dernière alerte, ou None si aucune alerte
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT
-                id, token_name, token_address, network,
-                price_at_alert, score, base_score, momentum_bonus,
-                confidence_score, volume_24h, volume_6h, volume_1h,
-                liquidity, buys_24h, sells_24h, buy_ratio,
-                total_txns, age_hours, created_at,
-                entry_price, stop_loss_price, stop_loss_percent,
-                tp1_price, tp1_percent, tp2_price, tp2_percent,
-                tp3_price, tp3_percent,
-                volume_acceleration_1h_vs_6h, volume_acceleration_6h_vs_24h,
-                velocite_pump, type_pump, decision_tp_tracking,
-                temps_depuis_alerte_precedente, is_alerte_suivante
-            FROM alerts
-            WHERE token_address = ?
-            ORDER BY created_at DESC
-            LIMIT 1
-        """, (token_address,))
-
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        columns = [
-            'id', 'token_name', 'token_address', 'network',
-            'price_at_alert', 'score', 'base_score', 'momentum_bonus',
-            'confidence_score', 'volume_24h', 'volume_6h', 'volume_1h',
-            'liquidity', 'buys_24h', 'sells_24h', 'buy_ratio',
-            'total_txns', 'age_hours', 'created_at',
-            'entry_price', 'stop_loss_price', 'stop_loss_percent',
-            'tp1_price', 'tp1_percent', 'tp2_price', 'tp2_percent',
-            'tp3_price', 'tp3_percent',
-            'volume_acceleration_1h_vs_6h', 'volume_acceleration_6h_vs_24h',
-            'velocite_pump', 'type_pump', 'decision_tp_tracking',
-            'temps_depuis_alerte_precedente', 'is_alerte_suivante'
-        ]
-
-        return dict(zip(columns, row))
+        return self.index.last_alert(token_address)
 
     def get_active_alerts(self, max_age_hours: int = 24) -> List[Dict]:
         """
@@ -688,9 +710,9 @@ class AlertTracker:
                 tp1_price, tp2_price, tp3_price,
                 stop_loss_price, created_at
             FROM alerts
-            WHERE datetime(created_at) >= datetime('now', ? || ' hours')
-            ORDER BY created_at DESC
-        """, (f'-{max_age_hours}',))
+            WHERE created_at_epoch >= ?
+            ORDER BY created_at_epoch DESC
+        """, (int(time.time() - max_age_hours * 3600),))
 
         rows = cursor.fetchall()
 
@@ -715,45 +737,31 @@ class AlertTracker:
         Returns:
             True si update réussi, False sinon
         """
-        try:
-            cursor = self.conn.cursor()
+        return self.update_prices_max_realtime({alert_id: current_price}) == 1
 
-            # Récupérer l'entry price pour calculer ROI
-            cursor.execute("SELECT entry_price FROM alerts WHERE id = ?", (alert_id,))
-            result = cursor.fetchone()
-            if not result:
-                return False
-
-            entry_price = result[0]
-
-            # Calculer combien de minutes depuis l'alerte
-            cursor.execute("""
-                SELECT CAST((julianday('now') - julianday(created_at)) * 1440 AS INTEGER) as minutes_elapsed
-                FROM alerts WHERE id = ?
-            """, (alert_id,))
-            minutes_elapsed = cursor.fetchone()[0]
-
-            # Récupérer le prix MAX actuel depuis price_tracking
-            cursor.execute("""
-                SELECT MAX(highest_price) FROM price_tracking
-                WHERE alert_id = ?
-            """, (alert_id,))
-
-            current_max = cursor.fetchone()[0]
+    def update_prices_max_realtime(self, prices: Dict[int, float]) -> int:
+        """
+        Version groupée de update_price_max_realtime (un scan): comparaison en mémoire
+        via le cache d'état par alerte, une seule transaction d'écriture.
 
-            # Déterminer le nouveau prix MAX
-            if current_max is None:
-                new_max = current_price
-            else:
-                new_max = max(float(current_max), current_price)
+        Args:
+            prices: {alert_id: prix actuel}
 
-            # Calculer ROI
-            roi = ((current_price - entry_price) / entry_price) * 100
+        Returns:
+            Nombre d'alertes à jour (écrites, ou déjà écrites à ce prix cette minute)
+        """
+        if not prices:
+            return 0
+        try:
+            # Entry price, epoch de création et plus haut: une requête pour les seules alertes inconnues
+            self.states.hydrate(self.conn, prices)
+            updates, unchanged = self.states.build_realtime_rows(prices, time.time())
 
             # Insérer ou mettre à jour le tracking temps réel
-            # Note: On utilise minutes_elapsed = 0 pour les updates temps réel
+            # Note: minutes_after_alert = minutes exactes écoulées pour les updates temps réel
             # Les updates schedulés (15min, 1h, etc.) utilisent leurs propres minutes
-            cursor.execute("""
+            # Écriture asynchrone: une seule opération (une transaction) pour tout le lot
+            self.writer.executemany("""
                 INSERT INTO price_tracking (
                     alert_id, minutes_after_alert, price, roi_percent,
                     highest_price, lowest_price, timestamp
@@ -765,21 +773,12 @@ class AlertTracker:
                     highest_price = MAX(highest_price, excluded.highest_price),
                     lowest_price = MIN(COALESCE(lowest_price, 999999), excluded.price),
                     timestamp = excluded.timestamp
-            """, (
-                alert_id,
-                minutes_elapsed,  # Minutes exactes depuis création
-                current_price,
-                roi,
-                new_max,
-                current_price  # lowest_price initialisé au prix actuel
-            ))
-
-            self.conn.commit()
-            return True
+            """, updates)
+            return len(updates) + unchanged
 
         except Exception as e:
-            print(f"❌ Erreur update prix_max realtime pour alerte {alert_id}: {e}")
-            return False
+            print(f"❌ Erreur update prix_max realtime ({len(prices)} alertes): {e}")
+            return 0
 
     def get_highest_price_for_alert(self, alert_id: int) -> Optional[float]:
         """
@@ -974,7 +973,7 @@ class AlertTracker:
                        stop_loss_price, created_at, version
                 FROM alerts
                 WHERE version = ?
-                ORDER BY created_at DESC
+                ORDER BY created_at_epoch DESC
                 LIMIT ?
             """, (version, limit))
         else:
@@ -984,7 +983,7 @@ class AlertTracker:
                        entry_price, tp1_price, tp2_price, tp3_price,
                        stop_loss_price, created_at, version
                 FROM alerts
-                ORDER BY created_at DESC
+                ORDER BY created_at_epoch DESC
                 LIMIT ?
             """, (limit,))
 
@@ -1102,6 +1101,10 @@ class AlertTracker:
 
     def close(self):
         """Ferme la connexion à la base de données."""
+        if self.scheduler is not None:
+            self.scheduler.close()
+            self.scheduler = None
+        close_write_queue(self.db_path)  # Vide la file (commit des écritures en attente)
         self.conn.close()
         print("✅ Connexion DB fermée")
 
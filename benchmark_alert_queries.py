@@ -0,0 +1,172 @@
+"""
+Benchmark des requêtes de la table alerts (plans SQLite avant/après migration)
+
+Génère une base temporaire de N alertes (défaut 100k) au schéma d'origine,
+exécute les requêtes du scanner, du dashboard et du cron de prix sous leur
+forme d'origine, applique data/alerts_schema.upgrade_alerts_schema() puis
+rejoue les requêtes réécrites sur created_at_epoch.
+
+Pour chaque requête: EXPLAIN QUERY PLAN (SCAN = parcours complet, SEARCH =
+index) et temps médian.
+
+Usage:
+  python benchmark_alert_queries.py
+  python benchmark_alert_queries.py --alerts 200000 --runs 20
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alert_tracker import AlertTracker
+from data.alerts_schema import ALERT_INDEXES, upgrade_alerts_schema
+
+NETWORKS = ("eth", "bsc", "base", "solana", "polygon_pos", "avax", "arbitrum")
+TIERS = ("ULTRA_HIGH", "HIGH", "MEDIUM", "LOW", "VERY_LOW")
+
+# Index/trigger ajoutés par la migration: supprimés pour reproduire le schéma d'origine
+MIGRATION_OBJECTS = [("index", name) for name, _ in ALERT_INDEXES] + [
+    ("index", "idx_alerts_open"),
+    ("trigger", "trg_alerts_created_at_epoch"),
+]
+
+
+def build_database(path: str, alerts: int, tokens: int, days: int):
+    """Base au schéma AlertTracker + colonnes backtesting, sans les objets de la migration."""
+    AlertTracker(db_path=path).close()
+    conn = sqlite3.connect(path)
+    for column in ("is_closed INTEGER", "final_outcome TEXT", "highest_tp_reached TEXT", "sl_hit INTEGER"):
+        try:
+            conn.execute(f"ALTER TABLE alerts ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass
+    for kind, name in MIGRATION_OBJECTS:
+        conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+
+    rng = random.Random(42)
+    now = time.time()
+    token_addresses = [f"0x{rng.getrandbits(160):040x}" for _ in range(tokens)]
+    rows = []
+    for i in range(alerts):
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - rng.random() * days * 86400))
+        price = rng.uniform(0.0001, 2.0)
+        rows.append((
+            f"TOKEN{i % tokens}", token_addresses[i % tokens], rng.choice(NETWORKS),
+            price, rng.randint(40, 100), rng.choice(TIERS), price,
+            price * 0.9, -10, price * 1.05, 5, price * 1.1, 10, price * 1.15, 15,
+            created, created, 1 if rng.random() < 0.8 else None,
+        ))
+    conn.executemany("""
+        INSERT INTO alerts (
+            token_name, token_address, network, price_at_alert, score, tier, entry_price,
+            stop_loss_price, stop_loss_percent, tp1_price, tp1_percent, tp2_price, tp2_percent,
+            tp3_price, tp3_percent, timestamp, created_at, is_closed
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.execute("UPDATE alerts SET created_at_epoch = NULL")
+    conn.commit()
+    return conn, token_addresses
+
+
+def query_cases(token_address: str):
+    """(nom, requête d'origine, paramètres, requête réécrite, paramètres)."""
+    now = int(time.time())
+    day_iso = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - 86400))
+    week_iso = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - 7 * 86400))
+    open_cutoff = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - 48 * 3600))
+    open_query = """
+        SELECT id FROM alerts
+        WHERE timestamp >= ? AND (is_closed IS NULL OR is_closed = 0)
+    """
+    return [
+        (
+            "scanner: alertes actives 24h",
+            "SELECT id FROM alerts WHERE datetime(created_at) >= datetime('now', '-24 hours') ORDER BY created_at DESC",
+            (),
+            "SELECT id FROM alerts WHERE created_at_epoch >= ? ORDER BY created_at_epoch DESC",
+            (now - 86400,),
+        ),
+        (
+            "scanner: anti-rug token 24h",
+            "SELECT COUNT(*) FROM alerts WHERE token_address = ? AND datetime(created_at) >= datetime('now', '-24 hours')",
+            (token_address,),
+            "SELECT COUNT(*) FROM alerts WHERE token_address = ? AND created_at_epoch >= ?",
+            (token_address, now - 86400),
+        ),
+        (
+            "dashboard: liste réseau+tier 7j",
+            "SELECT * FROM alerts WHERE created_at >= ? AND network = ? AND tier = ? ORDER BY created_at DESC LIMIT 100",
+            (week_iso, "base", "HIGH"),
+            "SELECT * FROM alerts WHERE created_at_epoch >= ? AND network = ? AND tier = ? ORDER BY created_at_epoch DESC LIMIT 100",
+            (now - 7 * 86400, "base", "HIGH"),
+        ),
+        (
+            "dashboard: stats par réseau 24h",
+            "SELECT network, COUNT(*), AVG(score) FROM alerts WHERE created_at >= ? GROUP BY network",
+            (day_iso,),
+            "SELECT network, COUNT(*), AVG(score) FROM alerts WHERE created_at_epoch >= ? GROUP BY network",
+            (now - 86400,),
+        ),
+        (
+            "cron: alertes ouvertes 48h",
+            open_query, (open_cutoff,),
+            open_query, (open_cutoff,),
+        ),
+    ]
+
+
+def plan(conn, sql: str, params) -> str:
+    return " | ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def median_ms(conn, sql: str, params, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plans et temps des requêtes alerts avant/après migration")
+    parser.add_argument("--alerts", type=int, default=100_000, help="Nombre d'alertes générées")
+    parser.add_argument("--tokens", type=int, default=20_000, help="Nombre de tokens distincts")
+    parser.add_argument("--days", type=int, default=60, help="Historique couvert (jours)")
+    parser.add_argument("--runs", type=int, default=10, help="Exécutions par requête")
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_alerts_"), "bench_alerts.db")
+    conn, token_addresses = build_database(db_path, args.alerts, args.tokens, args.days)
+    cases = query_cases(token_addresses[0])
+
+    before = [(plan(conn, old, p), median_ms(conn, old, p, args.runs)) for _, old, p, _, _ in cases]
+
+    migration_start = time.perf_counter()
+    upgrade_alerts_schema(conn)
+    conn.commit()
+    migration_seconds = time.perf_counter() - migration_start
+
+    after = [(plan(conn, new, p), median_ms(conn, new, p, args.runs)) for _, _, _, new, p in cases]
+
+    print()
+    print("=" * 100)
+    print(f"BENCHMARK REQUÊTES ALERTS - {args.alerts} alertes, {args.tokens} tokens, migration {migration_seconds:.2f}s")
+    print("=" * 100)
+    for (name, *_), (plan_before, ms_before), (plan_after, ms_after) in zip(cases, before, after):
+        print(f"\n{name}: {ms_before:.2f}ms -> {ms_after:.2f}ms (x{ms_before / max(ms_after, 1e-6):.1f})")
+        print(f"  avant: {plan_before}")
+        print(f"  après: {plan_after}")
+    print("=" * 100)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
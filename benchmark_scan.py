@@ -0,0 +1,162 @@
+"""
+Benchmark end-to-end du scan V3 (hors ligne via record/replay HTTP)
+
+Mesure, pour chaque étape du scan, le temps mur, le temps CPU et la mémoire
+allouée (tracemalloc):
+  collect  -> collect_pools_from_networks()
+  analyze  -> analyze_and_filter_tokens()
+  alerts   -> process_and_send_alerts()
+
+Usage:
+  1. Enregistrer une fois les réponses réelles (réseau requis):
+       python benchmark_scan.py --record --fixtures benchmarks/fixtures
+  2. Rejouer hors ligne autant de fois que nécessaire:
+       python benchmark_scan.py --scans 5 --fixtures benchmarks/fixtures
+       python benchmark_scan.py --scans 5 --latency 0.15 --inject-429 25
+
+Le token bucket GeckoTerminal reste actif en replay (comportement réel);
+pour isoler le coût CPU: GECKOTERMINAL_REQUESTS_PER_MINUTE=100000 python benchmark_scan.py
+
+Telegram n'est jamais appelé (réponse simulée) et les alertes comme le cache
+sécurité sont écrits dans des bases SQLite temporaires.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.http_replay import install_replay
+from utils.helpers import log
+from data.cache import update_buy_ratio_history
+from utils.telegram import flush_telegram
+from core.scanner_steps import (
+    collect_pools_from_networks,
+    analyze_and_filter_tokens,
+    process_and_send_alerts,
+)
+from security_checker import SecurityChecker
+from data.security_cache import SecurityCache
+from alert_tracker import AlertTracker
+
+STAGES = ("collect", "analyze", "alerts")
+
+
+@contextmanager
+def measure(results, stage: str, track_alloc: bool):
+    """Enregistre wall time, CPU time et pic d'allocation d'une étape."""
+    if track_alloc:
+        tracemalloc.reset_peak()
+        mem_before, _ = tracemalloc.get_traced_memory()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        sample = {
+            "wall": time.perf_counter() - wall_start,
+            "cpu": time.process_time() - cpu_start,
+            "alloc_peak": 0,
+            "alloc_net": 0,
+        }
+        if track_alloc:
+            mem_after, mem_peak = tracemalloc.get_traced_memory()
+            sample["alloc_peak"] = max(0, mem_peak - mem_before)
+            sample["alloc_net"] = mem_after - mem_before
+        results[stage].append(sample)
+
+
+def run_scan(results, security_checker, alert_tracker, track_alloc: bool):
+    """Un scan complet (mêmes étapes que scan_geckoterminal, hors tracking actif)."""
+    liquidity_stats = defaultdict(int)
+
+    with measure(results, "collect", track_alloc):
+        all_pools = collect_pools_from_networks(liquidity_stats)
+        for pool_data in all_pools:
+            update_buy_ratio_history(pool_data)
+
+    with measure(results, "analyze", track_alloc):
+        opportunities, _ = analyze_and_filter_tokens(all_pools, security_checker)
+
+    with measure(results, "alerts", track_alloc):
+        process_and_send_alerts(opportunities, alert_tracker, security_checker)
+    # Envois Telegram (et sauvegardes DB) asynchrones: terminés hors mesure avant le scan suivant
+    flush_telegram()
+
+    return len(all_pools), len(opportunities)
+
+
+def print_report(results, scans: int, adapter):
+    print()
+    print("=" * 78)
+    print(f"BENCHMARK SCAN V3 - {scans} scan(s)")
+    print("=" * 78)
+    print(f"{'Étape':<10} {'wall moy':>10} {'wall min':>10} {'cpu moy':>10} {'pic alloc':>12} {'net alloc':>12}")
+    total_wall = 0.0
+    for stage in STAGES:
+        samples = results[stage]
+        if not samples:
+            continue
+        walls = [s["wall"] for s in samples]
+        cpus = [s["cpu"] for s in samples]
+        peak = max(s["alloc_peak"] for s in samples)
+        net = sum(s["alloc_net"] for s in samples) / len(samples)
+        total_wall += sum(walls) / len(walls)
+        print(f"{stage:<10} {sum(walls) / len(walls):>9.3f}s {min(walls):>9.3f}s {sum(cpus) / len(cpus):>9.3f}s "
+              f"{peak / 1024 / 1024:>10.2f}MB {net / 1024 / 1024:>10.2f}MB")
+    print("-" * 78)
+    print(f"{'total':<10} {total_wall:>9.3f}s")
+    print(f"HTTP: {adapter.stats}")
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne du scan GeckoTerminal V3")
+    parser.add_argument("--fixtures", default=os.path.join("benchmarks", "fixtures"),
+                        help="Dossier des réponses HTTP enregistrées")
+    parser.add_argument("--record", action="store_true", help="Appels réels + enregistrement des réponses")
+    parser.add_argument("--scans", type=int, default=3, help="Nombre de scans complets à exécuter")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence injectée par requête (s)")
+    parser.add_argument("--inject-429", type=int, default=0, help="Renvoie un 429 toutes les N requêtes")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After des 429 injectés (s)")
+    parser.add_argument("--no-alloc", action="store_true", help="Désactive tracemalloc (mesure plus rapide)")
+    args = parser.parse_args()
+
+    adapter = install_replay(
+        args.fixtures,
+        mode="record" if args.record else "replay",
+        latency=args.latency,
+        inject_429_every=args.inject_429,
+        retry_after=args.retry_after,
+    )
+
+    db_dir = tempfile.mkdtemp(prefix="bench_scan_")
+    alert_tracker = AlertTracker(db_path=os.path.join(db_dir, "bench_alerts.db"))
+    # Cache sécurité vide et temporaire: chaque benchmark part du même état
+    security_checker = SecurityChecker(cache=SecurityCache(os.path.join(db_dir, "bench_security_cache.db")))
+
+    track_alloc = not args.no_alloc
+    if track_alloc:
+        tracemalloc.start()
+
+    results = defaultdict(list)
+    scans = 1 if args.record else args.scans
+    for i in range(scans):
+        log(f"⏱️ Benchmark scan {i + 1}/{scans}")
+        pools, opportunities = run_scan(results, security_checker, alert_tracker, track_alloc)
+        log(f"   {pools} pools, {opportunities} opportunités")
+
+    if track_alloc:
+        tracemalloc.stop()
+
+    print_report(results, scans, adapter)
+
+
+if __name__ == "__main__":
+    main()
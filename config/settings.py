@@ -29,6 +29,13 @@ GECKOTERMINAL_API = "https://api.geckoterminal.com/api/v2"
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
+# File d'envoi Telegram asynchrone (limites Bot API: ~30 msg/s global, 1 msg/s par chat, 20 msg/min par groupe)
+TELEGRAM_QUEUE_MAX_SIZE = 200              # Au-delà: message abandonné (callback(False))
+TELEGRAM_GLOBAL_MESSAGES_PER_SECOND = 25
+TELEGRAM_CHAT_MESSAGES_PER_MINUTE = 60
+TELEGRAM_GROUP_MESSAGES_PER_MINUTE = 20    # Groupes / canaux (chat_id négatif)
+TELEGRAM_MAX_RETRIES = 3                   # 429 (retry_after respecté), 5xx, erreurs réseau
+
 # ============================================
 # RÉSEAUX BLOCKCHAIN
 # ============================================
@@ -39,6 +46,148 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 # Avalanche: Écosystème DeFi mature, bonne qualité
 NETWORKS = ["eth", "bsc", "base", "solana", "polygon_pos", "avax"]  # V3.2: +Polygon +Avalanche
 
+# ============================================
+# COLLECTE CONCURRENTE DES POOLS
+# ============================================
+# Toutes les paires (réseau, endpoint) sont récupérées en parallèle au lieu
+# d'enchaîner 2 appels + 2 pauses de 2s par réseau (24s de sleep pour 6 réseaux).
+# La latence de l'étape 1 devient celle de la requête la plus lente.
+ENABLE_CONCURRENT_COLLECTION = True
+COLLECTION_MAX_WORKERS = 6  # Threads max pour la collecte (bounded pool)
+
+# ============================================
+# RATE LIMITING API (token bucket partagé)
+# ============================================
+# Budget API GeckoTerminal partagé par tout le process (plan gratuit: 30 appels/minute)
+GECKOTERMINAL_REQUESTS_PER_MINUTE = int(os.getenv("GECKOTERMINAL_REQUESTS_PER_MINUTE", "30"))
+GECKOTERMINAL_BURST = 12  # Jetons max: couvre les 12 requêtes de collecte d'un scan
+
+# Sur HTTP 429: Retry-After respecté, sinon backoff exponentiel (2s, 4s, 8s...) + jitter
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 2.0
+RATE_LIMIT_MAX_BACKOFF_SECONDS = 60.0
+
+# ============================================
+# CLIENT HTTP PARTAGÉ (keep-alive + pools de connexions)
+# ============================================
+# Une Session requests unique: connexions TCP/TLS réutilisées entre appels
+HTTP_POOL_CONNECTIONS = 10   # Nombre d'hôtes distincts gardés en pool
+HTTP_POOL_MAXSIZE = 16       # Connexions keep-alive max par hôte (>= COLLECTION_MAX_WORKERS)
+HTTP_DEFAULT_TIMEOUT = 15    # Timeout (secondes) si l'appelant n'en donne pas
+
+# ============================================
+# SERVICE DE PRIX GROUPÉ (trackers)
+# ============================================
+PRICE_BATCH_SIZE_DEXSCREENER = 30    # Adresses max par requête /pairs/{chain}/{a,b,...}
+PRICE_BATCH_SIZE_GECKOTERMINAL = 30  # Adresses max par requête /pools/multi/{a,b,...}
+PRICE_SERVICE_MAX_WORKERS = 6        # Paquets envoyés en parallèle
+
+# ============================================
+# SQLITE (alerts_history.db)
+# ============================================
+# WAL + synchronous=NORMAL; une seule thread d'écriture par process (data/db.py)
+SQLITE_BUSY_TIMEOUT_MS = 10000          # Attente max d'un verrou avant "database is locked"
+SQLITE_CACHE_SIZE_KB = 16384            # Cache de pages par connexion (16 MiB)
+SQLITE_MMAP_SIZE_BYTES = 268435456      # Lectures mmap jusqu'à 256 MiB
+DB_WRITE_FLUSH_SECONDS = 0.05           # Fenêtre de regroupement des écritures en une transaction
+DB_WRITE_MAX_BATCH = 500                # Opérations max par transaction
+
+# ============================================
+# MÉTRIQUES DU SCAN (Prometheus /metrics + table SQLite scan_metrics)
+# ============================================
+ENABLE_SCAN_METRICS = True
+SCAN_METRICS_RETENTION_ROWS = 5000  # ~7 jours de scans toutes les 2 min
+
+# ============================================
+# PIPELINE DE SCAN (étapes concurrentes, core/scan_pipeline.py)
+# ============================================
+# Collecte / scoring / alertes / tracking actif dans des threads reliés par des files bornées,
+# au lieu de scans séquentiels espacés de 120s. False: boucle séquentielle historique
+ENABLE_SCAN_PIPELINE = True
+SCAN_PIPELINE_QUEUE_SIZE = 4          # Lots max en attente entre deux étapes (backpressure)
+SCAN_PIPELINE_MIN_ROUND_SECONDS = 60  # Fenêtre d'un tour: tracking actif, budget d'alertes, scan_metrics
+
+# Cadence adaptative par réseau (core/scan_cadence.py): réseau actif interrogé plus souvent
+SCAN_CADENCE_DEFAULT_SECONDS = 120
+SCAN_CADENCE_MIN_SECONDS = 30
+SCAN_CADENCE_MAX_SECONDS = 300
+SCAN_CADENCE_SPEEDUP = 0.5               # Intervalle × 0.5 si le lot du réseau est actif
+SCAN_CADENCE_SLOWDOWN = 1.5              # Intervalle × 1.5 si le réseau est calme
+SCAN_CADENCE_HOT_OPPORTUNITIES = 1       # Opportunités (score >= seuil réseau) pour qualifier le réseau d'actif
+SCAN_CADENCE_HOT_BUY_RATIO_SPIKES = 3    # ... ou nombre de pools en pic de buy ratio
+SCAN_CADENCE_BUY_RATIO_SPIKE_PERCENT = 30  # Pic: buy ratio +30% sur 1h
+SCAN_CADENCE_API_BUDGET_PER_MINUTE = 20  # Part des 30 req/min GeckoTerminal réservée à la collecte
+
+# Pools chauds (core/hot_pools.py): near-miss et WATCHLIST_TOKENS re-scorés entre deux passages réseau
+ENABLE_HOT_POOLS = True
+HOT_POOL_SCORE_MARGIN = 10              # Near-miss: score à moins de 10 points du seuil réseau
+HOT_POOL_MAX_SIZE = 200                 # Pools chauds max (les moins prioritaires évincés)
+HOT_POOL_TTL_SECONDS = 1800             # Retiré si plus revu en near-miss depuis 30 min
+HOT_POOL_REFRESH_SECONDS = 15           # Tick de rafraîchissement (/pools/multi groupé par réseau)
+HOT_POOL_API_BUDGET_PER_MINUTE = 6      # Part des 30 req/min GeckoTerminal réservée aux pools chauds
+HOT_POOL_PRICE_MOMENTUM_WEIGHT = 0.1    # Points de priorité par % de hausse 1h
+
+# ============================================
+# PIPELINE DE FILTRES (rejet précoce)
+# ============================================
+# Filtres colonnes (vol/liq, âge, heure) avant le scoring, SecurityChecker en dernier.
+# Adaptatif: ordre réajusté selon le taux de rejet observé (rang = coût / taux de rejet)
+FILTER_PIPELINE_ADAPTIVE = True
+
+# ============================================
+# MÉMO D'ANALYSE (pools inchangés entre deux scans, data/analysis_memo.py)
+# ============================================
+# Empreinte des entrées du scoring, quantifiée par les tolérances ci-dessous:
+# même empreinte qu'au scan précédent -> score, rejet et enrichissements réutilisés
+ENABLE_ANALYSIS_MEMO = True
+ANALYSIS_MEMO_RELATIVE_TOLERANCE = 0.01   # Montants et compteurs (liquidité, volumes, txns): ±1%
+ANALYSIS_MEMO_PERCENT_TOLERANCE = 0.5     # Variations de prix et vélocité: ±0.5 point de %
+ANALYSIS_MEMO_AGE_TOLERANCE_HOURS = 0.25  # Âge du pool: tranches de 15 min
+ANALYSIS_MEMO_TTL_SECONDS = 600           # Ré-analyse complète au moins toutes les 10 min
+ANALYSIS_MEMO_MAX_ENTRIES = 20000         # Pools mémorisés max (les moins récents évincés)
+
+# ============================================
+# HISTORIQUE BUY RATIO (mémoire, data/cache.py)
+# ============================================
+BUY_RATIO_HISTORY_WINDOW_SECONDS = 7200   # Fenêtre conservée par pool (2h, on a besoin de 1h)
+BUY_RATIO_LOOKBACK_SECONDS = 3600         # Variation comparée à la valeur d'il y a 1h
+BUY_RATIO_IDLE_EVICTION_SECONDS = 7200    # Pool non revu depuis 2h: historique entièrement expiré, évincé
+BUY_RATIO_HISTORY_MAX_ENTRIES = 200000    # Plafond global (~15 Mo), évince les pools les moins récents
+
+# ============================================
+# SNAPSHOT DE L'ÉTAT MÉMOIRE (warm-start après redéploiement)
+# ============================================
+SCANNER_STATE_PATH = os.getenv(
+    "SCANNER_STATE_PATH",
+    "/data/scanner_state.bin" if os.path.exists("/data") else "scanner_state.bin",
+)
+SCANNER_STATE_SNAPSHOT_INTERVAL_SECONDS = 300  # Sauvegarde au plus toutes les 5 min (fin de scan)
+SCANNER_STATE_MAX_AGE_SECONDS = 6 * 3600       # Snapshot plus ancien: démarrage à froid
+
+# ============================================
+# CACHE SÉCURITÉ PERSISTANT (SQLite partagé scanner / dashboard / price tracker)
+# ============================================
+SECURITY_CACHE_DB_PATH = os.getenv(
+    "SECURITY_CACHE_DB_PATH",
+    "/data/security_cache.db" if os.path.exists("/data") else "security_cache.db",
+)
+SECURITY_CACHE_MAX_ENTRIES = 20000  # Borne LRU (~4 entrées par token)
+
+# TTL par check (secondes): honeypot/ownership changent rarement, LP lock plus vite
+SECURITY_CACHE_TTL_SECONDS = {
+    'honeypot': 24 * 3600,
+    'contract': 24 * 3600,
+    'lp_lock': 3600,
+    'verdict': 3600,  # Verdict global: jamais plus long que son check le plus court
+}
+SECURITY_CACHE_NEGATIVE_TTL_SECONDS = 300  # Erreurs API / pas de données (checked=False)
+
+# Checks honeypot / LP lock / contrat en parallèle, sources LP lock en course
+SECURITY_CHECK_DEADLINE_SECONDS = 12  # Deadline globale par token (au lieu de 45s+ en séquentiel)
+SECURITY_CHECK_MAX_WORKERS = 8        # Threads par pool (checks / sources LP), marge pour les checks hors délai
+SECURITY_LP_FALLBACK_MARGIN_SECONDS = 1  # Source LP prioritaire muette 1s avant la deadline: meilleure réponse reçue (provisoire)
+GOPLUS_BATCH_SIZE = 30                # Adresses max par requête GoPlus token_security (contract_addresses=a,b,c)
+
 # Mapping des networks pour affichage lisible
 NETWORK_NAMES = {
     "eth": "Ethereum",
@@ -557,6 +706,18 @@ ENABLE_SMART_REALERT = False  # DÉSACTIVÉ pour phase backtesting (collecte max
 ENABLE_ACTIVE_TRACKING = True  # Activer le tracking actif des pools alertés
 ACTIVE_TRACKING_MAX_AGE_HOURS = 24  # Suivre les alertes des dernières 24h
 ACTIVE_TRACKING_UPDATE_COOLDOWN_MINUTES = 15  # Cooldown 15min entre mises à jour
+ACTIVE_TRACKING_BATCH_SIZE = 30  # Pools max par requête GeckoTerminal /pools/multi
+
+# CHECKPOINTS PRIX (15min/1h/4h/24h): un seul thread ordonnanceur, échéances persistées en SQLite
+ENABLE_PRICE_TRACKING_SCHEDULER = True
+PRICE_TRACKING_INTERVALS_MINUTES = [15, 60, 240, 1440]
+TRACKING_COALESCE_SECONDS = 30         # Checkpoints échus dans cette fenêtre -> un seul lot de fetchs
+TRACKING_MAX_LATENESS_RATIO = 0.25     # Retard max toléré (fraction de l'intervalle) avant 'skipped'
+TRACKING_MIN_LATENESS_SECONDS = 300    # ... mais au moins 5 min
+
+# INDEX DES TOKENS ALERTÉS (mémoire): déduplication / anti-rug / re-alerte sans requête SQL
+ALERT_INDEX_BUCKET_SECONDS = 300       # Granularité des compteurs d'alertes récentes par token
+ALERT_INDEX_RETENTION_HOURS = 48       # Fenêtres plus longues -> repli sur COUNT(*) SQL
 
 # ============================================
 # V4.2: SMART MONEY & WHALE TRACKING (NEW!)
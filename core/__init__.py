@@ -5,6 +5,7 @@ Modules:
 - alerts.py : Gestion des alertes
 - filters.py : Filtres de tokens
 - scoring.py : Système de scoring V3/V4
+- batch_scoring.py : Scoring vectorisé NumPy (parité avec scoring.py)
 - signals.py : Analyse des signaux
 - scanner_steps.py : Étapes du scanner
 - strategy_validator.py : Validation des stratégies
@@ -24,6 +25,10 @@ from core.scoring import (
     analyze_whale_activity,
 )
 
+from core.batch_scoring import (
+    score_pools_batch,
+)
+
 from core.signal_strategy import (
     get_signal_quality,
     should_exclude,
@@ -41,6 +46,7 @@ __all__ = [
     'calculate_confidence_tier',
     'calculate_confidence_score',
     'analyze_whale_activity',
+    'score_pools_batch',
     # Signal Strategy
     'get_signal_quality',
     'should_exclude',
@@ -9,6 +9,7 @@ Fonctions de gestion d'alertes:
 - Génération alertes complètes (Entry/SL/TP + analyse)
 """
 
+from collections.abc import Mapping
 from typing import Dict, Tuple, List
 from datetime import datetime
 from utils.helpers import log, format_price, get_network_display_name
@@ -388,7 +389,7 @@ def analyser_alerte_suivante(previous_alert: Dict, current_price: float, pool_da
             'temps_ecoule_heures': 0
         }
 
-    if not pool_data or not isinstance(pool_data, dict):
+    if not pool_data or not isinstance(pool_data, Mapping):
         log(f"   ⚠️ pool_data invalide dans analyser_alerte_suivante: {type(pool_data)}")
         return {
             'decision': 'ERROR',
@@ -0,0 +1,353 @@
+"""
+Scoring vectorisé (NumPy) - Tous les pools d'un scan en une passe
+
+Version colonne des fonctions de core/scoring.py:
+- calculate_base_score()      -> base score
+- calculate_momentum_bonus()  -> bonus momentum
+- analyze_whale_activity()    -> pattern / whale_score / signaux
+
+Les pools sont convertis en tableaux float64 (liquidité, volumes, txns, âge,
+variations de prix) et chaque cascade if/elif devient un np.select.
+Résultats identiques bit à bit aux fonctions scalaires (cf.
+test_batch_scoring_parity.py). Les lignes non numériques (None renvoyé par
+l'API...) passent par le code scalaire. Sans NumPy, tout passe par le code scalaire.
+"""
+
+from operator import attrgetter
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.helpers import log
+from data.pool_snapshot import PoolSnapshot
+from core.scoring import (
+    analyze_whale_activity,
+    calculate_base_score,
+    calculate_momentum_bonus,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    log("[WARNING] numpy non disponible - scoring batch désactivé (scoring scalaire)")
+
+
+_NUMBER_TYPES = frozenset((int, float))
+
+# Colonnes numériques lues par calculate_base_score / calculate_momentum_bonus
+_SCORE_FIELDS = (
+    "liquidity", "volume_24h", "age_hours", "buys_24h", "sells_24h", "price_change_24h",
+    "velocite_pump", "buys_1h", "sells_1h", "total_txns",
+)
+(LIQ, VOL, AGE, BUYS_24H, SELLS_24H, PC_24H, VELOCITE, BUYS_1H, SELLS_1H, TXNS_24H) = range(len(_SCORE_FIELDS))
+
+# Colonnes lues uniquement (avec `or 0`) par analyze_whale_activity
+_WHALE_FIELDS = ("buyers_1h", "sellers_1h", "buyers_24h", "sellers_24h")
+(BUYERS_1H, SELLERS_1H, BUYERS_24H, SELLERS_24H) = range(len(_WHALE_FIELDS))
+
+_get_score_fields = attrgetter(*_SCORE_FIELDS)
+_get_whale_fields = attrgetter(*_WHALE_FIELDS)
+
+# Cascade whale: (whale_score, pattern, concentration_risk, signal, moyenne formatée dans le signal)
+_WHALE_CASES = (
+    (-20, "WHALE_MANIPULATION", "HIGH", "🐋🐋 WHALE MANIPULATION EXTRÊME détectée (avg: {:.1f}x buys/buyer)", "buys"),
+    (-15, "WHALE_MANIPULATION", "HIGH", "🐋 WHALE ACCUMULATION détectée (avg: {:.1f}x buys/buyer)", "buys"),
+    (-30, "WHALE_SELLING", "HIGH", "🚨🚨 WHALE DUMP EXTRÊME détecté (avg: {:.1f}x sells/seller)", "sells"),
+    (-25, "WHALE_SELLING", "HIGH", "🚨 WHALE DUMP détecté (avg: {:.1f}x sells/seller)", "sells"),
+    (-15, "WHALE_SELLING", "MEDIUM", "⚠️ WHALE SELLING détectée (avg: {:.1f}x sells/seller)", "sells"),
+    (15, "DISTRIBUTED_BUYING", "LOW", "✅ ACCUMULATION DISTRIBUÉE (achat par many wallets)", None),
+    (10, "DISTRIBUTED_BUYING", "LOW", "📈 Sentiment BULLISH (plus de buyers que sellers)", None),
+    (0, "NORMAL", "MEDIUM", "⚖️ Marché équilibré (buyers ≈ sellers)", None),
+    (-10, "DISTRIBUTED_SELLING", "MEDIUM", "⚠️ SELLING PRESSURE (plus de sellers que buyers)", None),
+    (0, "NORMAL", "MEDIUM", None, None),
+)
+_WHALE_24H_SIGNAL = "⚠️ Concentration whale sur 24h (peu de wallets uniques)"
+
+
+def _all_numbers(values) -> bool:
+    return all(map(_NUMBER_TYPES.__contains__, map(type, values)))
+
+
+def _is_number(value) -> bool:
+    return type(value) in _NUMBER_TYPES
+
+
+def _safe_div(num, den, default: float):
+    """num / den là où den > 0, sinon default (sans warning division par zéro)."""
+    out = np.full(num.shape, default, dtype=np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _extract_row(pool: Mapping, momentum: Optional[Dict]):
+    """
+    Valeurs brutes d'un pool pour le batch, ou None si la ligne doit passer
+    par le code scalaire (champ manquant / non numérique, momentum invalide).
+    """
+    if not momentum or not isinstance(momentum, dict):
+        return None
+    price_1h = momentum.get("1h", 0)
+    network = pool.get("network", "")
+    if not _is_number(price_1h) or not isinstance(network, str):
+        return None
+
+    if type(pool) is PoolSnapshot:
+        values = _get_score_fields(pool)
+        whale = _get_whale_fields(pool)
+    else:
+        try:
+            values = tuple(pool[key] for key in _SCORE_FIELDS)
+        except KeyError:
+            return None
+        whale = tuple(pool.get(key) for key in _WHALE_FIELDS)
+
+    # analyze_whale_activity lit ces champs avec `or 0` (None de l'API -> 0)
+    whale = tuple(v or 0 for v in whale)
+    if not _all_numbers(values) or not _all_numbers(whale):
+        return None
+    return network, price_1h, values, whale
+
+
+def _base_scores(network, cols):
+    liq, vol, age = cols[:, LIQ], cols[:, VOL], cols[:, AGE]
+    buys, sells, pc24 = cols[:, BUYS_24H], cols[:, SELLS_24H], cols[:, PC_24H]
+
+    eth, sol, bsc = network == "eth", network == "solana", network == "bsc"
+    base, poly, avax, arb = network == "base", network == "polygon_pos", network == "avax", network == "arbitrum"
+
+    # Bonus réseau + zones de liquidité optimales
+    score = np.select([eth, sol, bsc, base, poly, avax, arb], [35, 32, 25, 15, 20, 28, 5], default=10).astype(np.int64)
+    score += np.select(
+        [
+            eth & (100000 <= liq) & (liq <= 200000),
+            sol & (100000 <= liq) & (liq <= 200000),
+            bsc & (500000 <= liq) & (liq <= 5000000),
+            poly & (50000 <= liq) & (liq <= 300000),
+            avax & (100000 <= liq) & (liq <= 500000),
+        ],
+        [15, 12, 10, 10, 12],
+        default=0,
+    )
+
+    # Liquidité
+    score += np.select(
+        [liq >= 1000000, liq >= 500000, liq >= 200000, liq >= 100000, liq >= 50000],
+        [15, 20, 25, 25, 15],
+        default=0,
+    )
+
+    # Volume
+    score += np.select([vol >= 1000000, vol >= 500000, vol >= 200000, vol >= 100000], [20, 15, 10, 5], default=0)
+
+    # Âge
+    score += np.select(
+        [
+            (48 <= age) & (age <= 72),
+            ((24 <= age) & (age < 48)) | ((72 < age) & (age <= 96)),
+            (6 <= age) & (age < 24),
+            age < 6,
+            (96 < age) & (age <= 168),
+        ],
+        [25, 20, 15, 8, 10],
+        default=0,
+    )
+    score -= np.where((12 <= age) & (age <= 24), 15, 0)
+
+    # Vol/Liq
+    vol_liq = _safe_div(vol, liq, 0.0)
+    score += np.select(
+        [
+            (0.5 <= vol_liq) & (vol_liq <= 1.5),
+            ((0.3 <= vol_liq) & (vol_liq < 0.5)) | ((1.5 < vol_liq) & (vol_liq <= 2.0)),
+            vol_liq > 2.0,
+        ],
+        [15, 10, np.where(vol > 2000000, 12, 5)],
+        default=0,
+    )
+
+    # Buy/Sell balance
+    buy_ratio = _safe_div(buys, sells, 1.0)
+    score += np.select(
+        [
+            (0.6 <= buy_ratio) & (buy_ratio <= 1.4),
+            ((0.4 <= buy_ratio) & (buy_ratio < 0.6)) | ((1.4 < buy_ratio) & (buy_ratio <= 2.0)),
+            (buy_ratio < 0.4) | (buy_ratio > 2.0),
+        ],
+        [15, 10, 5],
+        default=0,
+    )
+
+    # Pénalités dynamiques
+    score -= np.select([pc24 < -40, pc24 < -30, pc24 < -20, pc24 < -10], [35, 25, 15, 8], default=0)
+
+    total = buys + sells
+    sell_pressure = _safe_div(sells, total, 0.0)
+    score -= np.select(
+        [(total > 0) & (sell_pressure > 0.70), (total > 0) & (sell_pressure > 0.65), (total > 0) & (sell_pressure > 0.60)],
+        [25, 20, 12],
+        default=0,
+    )
+    score -= np.where(vol_liq > 3.0, 10, 0)
+
+    score = np.maximum(score, 0)
+    return np.where(liq == 0, 0, score)
+
+
+def _momentum_bonuses(cols, p1, is_multi, is_weth):
+    velocite, p24 = cols[:, VELOCITE], cols[:, PC_24H]
+    buys_1h, sells_1h = cols[:, BUYS_1H], cols[:, SELLS_1H]
+    buys_24h, sells_24h, txn_24h = cols[:, BUYS_24H], cols[:, SELLS_24H], cols[:, TXNS_24H]
+
+    bonus = np.select(
+        [velocite >= 100, velocite >= 50, velocite >= 20, velocite >= 10, velocite >= 5, velocite < 5],
+        [20, 18, 15, 10, 5, -5],
+        default=0,
+    ).astype(np.int64)
+
+    bonus += np.select([p1 >= 10, p1 >= 5, p1 >= 2], [10, 7, 3], default=0)
+
+    # Dead cat bounce
+    bonus -= np.where((p1 > 0) & (p24 < -20) & (p1 < 10), 10, 0)
+
+    # Volume spike
+    txn_1h_normalized = (buys_1h + sells_1h) * 24
+    has_activity = txn_24h > 0
+    spike = has_activity & (txn_1h_normalized > txn_24h * 1.5)
+    moderate = has_activity & ~spike & (txn_1h_normalized > txn_24h * 1.2)
+    bonus += np.where(spike, np.select([p1 > 3, p1 > 0, p1 < -5], [10, 5, -10], default=0), 0)
+    bonus += np.where(moderate & (p1 > 0), 5, 0)
+
+    # Buy pressure 1h
+    buy_ratio_1h = _safe_div(buys_1h, sells_1h, 1.0)
+    buy_ratio_24h = _safe_div(buys_24h, sells_24h, 1.0)
+    bonus += np.select(
+        [buy_ratio_1h >= 1.2, buy_ratio_1h >= 1.0, buy_ratio_1h >= 0.8, (buy_ratio_1h < 0.5) & (buy_ratio_24h < 0.5)],
+        [10, 8, 5, -5],
+        default=0,
+    )
+
+    # Multi-pool
+    bonus += np.where(is_multi, 5, 0) + np.where(is_multi & is_weth, 5, 0)
+
+    # Contexte global
+    bonus = np.where(p24 < -30, np.minimum(bonus, 10), np.where(p24 < -20, np.minimum(bonus, 15), bonus))
+    return np.clip(bonus, -20, 30)
+
+
+def _whale_analyses(cols, whale_cols, whale_raw) -> List[Dict]:
+    buys_1h, sells_1h, buys_24h = cols[:, BUYS_1H], cols[:, SELLS_1H], cols[:, BUYS_24H]
+    buyers_1h, sellers_1h = whale_cols[:, BUYERS_1H], whale_cols[:, SELLERS_1H]
+    buyers_24h = whale_cols[:, BUYERS_24H]
+
+    avg_buys = _safe_div(buys_1h, buyers_1h, 0.0)
+    avg_sells = _safe_div(sells_1h, sellers_1h, 0.0)
+    wallet_ratio = _safe_div(buyers_1h, sellers_1h, 1.0)
+
+    case = np.select(
+        [
+            avg_buys > 15,
+            avg_buys > 10,
+            avg_sells > 15,
+            avg_sells > 10,
+            (avg_sells > 5) & (sellers_1h < 50),
+            (buyers_1h > sellers_1h * 1.5) & (buyers_1h > 15),
+            (buyers_1h > sellers_1h * 1.2) & (buyers_1h > 10),
+            (0.8 <= wallet_ratio) & (wallet_ratio <= 1.2),
+            sellers_1h > buyers_1h * 1.3,
+        ],
+        list(range(9)),
+        default=9,
+    ).tolist()
+    concentrated_24h = ((buyers_24h > 0) & (_safe_div(buys_24h, buyers_24h, 0.0) > 8)).tolist()
+    avg_buys, avg_sells, wallet_ratio = avg_buys.tolist(), avg_sells.tolist(), wallet_ratio.tolist()
+
+    results = []
+    for i, raw in enumerate(whale_raw):
+        whale_score, pattern, risk, signal, avg_kind = _WHALE_CASES[case[i]]
+        signals = []
+        if avg_kind == "buys":
+            signals.append(signal.format(avg_buys[i]))
+        elif avg_kind == "sells":
+            signals.append(signal.format(avg_sells[i]))
+        elif signal is not None:
+            signals.append(signal)
+        if concentrated_24h[i]:
+            signals.append(_WHALE_24H_SIGNAL)
+            whale_score -= 8
+            risk = "HIGH"
+        # Mêmes types que le scalaire: 0 (int) si pas de wallets uniques
+        results.append({
+            'pattern': pattern,
+            'whale_score': whale_score,
+            'avg_buys_per_buyer': round(avg_buys[i], 2) if raw[BUYERS_1H] > 0 else 0,
+            'avg_sells_per_seller': round(avg_sells[i], 2) if raw[SELLERS_1H] > 0 else 0,
+            'unique_wallet_ratio': round(wallet_ratio[i], 2),
+            'concentration_risk': risk,
+            'signals': signals,
+            'buyers_1h': raw[BUYERS_1H],
+            'sellers_1h': raw[SELLERS_1H],
+        })
+    return results
+
+
+def score_pools_batch(
+    pools: Sequence[Mapping],
+    momentums: Sequence[Dict],
+    multi_pools: Sequence[Dict],
+) -> List[Tuple[int, int, int, Dict]]:
+    """
+    Équivalent vectorisé de [calculate_final_score(p, m, mp) for ...].
+
+    Args:
+        pools: Pools du scan (PoolSnapshot ou dict)
+        momentums: Momentum de chaque pool (get_price_momentum_from_api)
+        multi_pools: Données multi-pool du token de chaque pool
+
+    Returns:
+        Liste de (final_score, base_score, momentum_bonus, whale_analysis)
+    """
+    n = len(pools)
+    results: List[Optional[Tuple[int, int, int, Dict]]] = [None] * n
+
+    rows, networks, prices_1h, values, whales = [], [], [], [], []
+    if NUMPY_AVAILABLE:
+        for i in range(n):
+            extracted = _extract_row(pools[i], momentums[i])
+            if extracted is not None:
+                rows.append(i)
+                networks.append(extracted[0])
+                prices_1h.append(extracted[1])
+                values.append(extracted[2])
+                whales.append(extracted[3])
+
+    if rows:
+        cols = np.array(values, dtype=np.float64)
+        whale_cols = np.array(whales, dtype=np.float64)
+        network = np.array(networks, dtype=object)
+        p1 = np.array(prices_1h, dtype=np.float64)
+        is_multi = np.array([bool(multi_pools[i].get("is_multi_pool")) for i in rows], dtype=bool)
+        is_weth = np.array([bool(multi_pools[i].get("is_weth_dominant")) for i in rows], dtype=bool)
+
+        base = _base_scores(network, cols).tolist()
+        momentum = _momentum_bonuses(cols, p1, is_multi, is_weth).tolist()
+        whale_analyses = _whale_analyses(cols, whale_cols, whales)
+
+        for j, i in enumerate(rows):
+            if values[j][LIQ] == 0:
+                pool = pools[i]
+                log(f"   [DEBUG] Pool {pool.get('name', 'UNK')}: liq=0, vol={pool.get('volume_24h', 0)}, age={pool.get('age_hours', 0)}")
+            whale_analysis = whale_analyses[j]
+            final = max(min(base[j] + momentum[j] + whale_analysis['whale_score'], 100), 0)
+            results[i] = (final, base[j], momentum[j], whale_analysis)
+
+    # Lignes hors batch: fonctions scalaires d'origine
+    for i in range(n):
+        if results[i] is None:
+            base_score = calculate_base_score(pools[i])
+            momentum_bonus = calculate_momentum_bonus(pools[i], momentums[i], multi_pools[i])
+            whale_analysis = analyze_whale_activity(pools[i])
+            final = max(min(base_score + momentum_bonus + whale_analysis['whale_score'], 100), 0)
+            results[i] = (final, base_score, momentum_bonus, whale_analysis)
+
+    return results
+
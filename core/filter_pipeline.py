@@ -0,0 +1,138 @@
+"""
+Filter Pipeline - Filtres de rejet précoce ordonnés par coût
+
+Chaque filtre est déclaré avec un coût relatif estimé. Le pipeline exécute
+les filtres du moins cher au plus cher, pondéré par la sélectivité observée:
+rang = coût / taux de rejet. Un filtre bon marché qui rejette beaucoup passe
+en tête, l'appel réseau SecurityChecker reste en dernier.
+
+Les filtres d'une même étape doivent être indépendants (conjonction de
+prédicats): l'ordre ne change pas l'ensemble des survivants, seulement le
+travail effectué et le filtre auquel le rejet est attribué.
+
+Les compteurs vus/passés sont cumulés d'un scan à l'autre (pipelines
+module-level dans le scanner) et exportés dans `filter_survivors_total`.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import FILTER_PIPELINE_ADAPTIVE
+from utils.helpers import log
+from utils.metrics import metrics
+
+# Prior tant qu'un filtre n'a rien observé: 1 passage sur 2
+PRIOR_PASSED = 1
+PRIOR_SEEN = 2
+
+# Plancher du taux de rejet (évite rang infini pour un filtre qui ne rejette jamais)
+MIN_REJECT_RATE = 0.01
+
+Predicate = Callable[[Any], Tuple[bool, str]]
+
+
+@dataclass(frozen=True)
+class FilterStage:
+    """
+    Un filtre du pipeline (déclaration, sans état).
+
+    predicate(candidate) -> (passe, raison du rejet)
+    cost: coût relatif par candidat (1 = comparaison de colonnes, 1000 = appel réseau)
+    counts_as_rejection: compte dans tokens_rejected (False pour la validation finale)
+    prepare(survivants): appelé une fois avant le filtre (ex: prefetch groupé)
+    """
+    name: str
+    predicate: Predicate
+    cost: float = 1.0
+    counts_as_rejection: bool = True
+    prepare: Optional[Callable[[List[Any]], None]] = None
+
+
+class FilterPipeline:
+    """
+    Exécute des FilterStage dans l'ordre coût/sélectivité.
+
+    Les étapes sont déclarées à chaque appel (elles peuvent capturer le
+    SecurityChecker du scan); le pipeline, lui, est persistant et garde les
+    compteurs vus/passés par nom d'étape.
+    """
+
+    def __init__(self, name: str, adaptive: Optional[bool] = None):
+        self.name = name
+        self.adaptive = FILTER_PIPELINE_ADAPTIVE if adaptive is None else adaptive
+        self._seen: Dict[str, int] = {}
+        self._passed: Dict[str, int] = {}
+        self.last_run: List[Tuple[str, int]] = []
+
+    def pass_rate(self, stage_name: str) -> float:
+        return (self._passed.get(stage_name, 0) + PRIOR_PASSED) / (self._seen.get(stage_name, 0) + PRIOR_SEEN)
+
+    def rank(self, stage: FilterStage) -> float:
+        return stage.cost / max(1.0 - self.pass_rate(stage.name), MIN_REJECT_RATE)
+
+    def order(self, stages: List[FilterStage]) -> List[FilterStage]:
+        """Ordre d'exécution: par rang observé (adaptatif) ou par coût déclaré."""
+        if self.adaptive:
+            return sorted(stages, key=self.rank)
+        return sorted(stages, key=lambda stage: stage.cost)
+
+    def run(self, stages: List[FilterStage], candidates: List[Any],
+            label: Callable[[Any], str] = str,
+            on_reject: Optional[Callable[[Any, FilterStage, str], None]] = None) -> Tuple[List[Any], int]:
+        """
+        Filtre les candidats étape par étape (chaque filtre ne voit que les
+        survivants des filtres précédents).
+
+        Args:
+            stages: Filtres à appliquer (ordre de déclaration indifférent)
+            candidates: Candidats à filtrer
+            label: Nom affiché dans les logs de rejet
+            on_reject: Appelé avec (candidat, étape, raison) pour chaque rejet
+
+        Returns:
+            (survivants, nombre de rejets comptés dans tokens_rejected)
+        """
+        survivors = list(candidates)
+        rejected = 0
+        self.last_run = [("input", len(survivors))]
+
+        for stage in self.order(stages):
+            if not survivors:
+                break
+            if stage.prepare is not None:
+                stage.prepare(survivors)
+            kept = []
+            for candidate in survivors:
+                ok, reason = stage.predicate(candidate)
+                if ok:
+                    kept.append(candidate)
+                    continue
+                log(f"   ⏭️  {label(candidate)}: {reason}")
+                metrics.inc("filter_rejections_total", filter=stage.name)
+                if stage.counts_as_rejection:
+                    rejected += 1
+                if on_reject is not None:
+                    on_reject(candidate, stage, reason)
+
+            self._seen[stage.name] = self._seen.get(stage.name, 0) + len(survivors)
+            self._passed[stage.name] = self._passed.get(stage.name, 0) + len(kept)
+            metrics.inc("filter_survivors_total", len(kept), pipeline=self.name, stage=stage.name)
+            self.last_run.append((stage.name, len(kept)))
+            survivors = kept
+
+        return survivors, rejected
+
+    def summary(self) -> str:
+        """Survivants par étape du dernier run, ex: 'input 240 → vol_liq 96 → age_danger_zone 80'."""
+        return " → ".join(f"{name} {count}" for name, count in self.last_run)
+
+    def stats(self) -> Dict[str, dict]:
+        """Compteurs cumulés par étape."""
+        return {
+            name: {
+                "seen": seen,
+                "passed": self._passed.get(name, 0),
+                "pass_rate": round(self.pass_rate(name), 3),
+            }
+            for name, seen in self._seen.items()
+        }
@@ -0,0 +1,161 @@
+"""
+Pools chauds - Watchlist prioritaire rafraîchie entre deux passages réseau
+
+Un pool à 2 points du seuil de son réseau attend le prochain passage du réseau
+(30s à 5 min selon la cadence) pour être re-scoré: s'il franchit le seuil
+entre-temps, l'alerte part avec autant de retard. Ici:
+
+- Alimentation: chaque lot scoré (analyze_and_filter_tokens, on_scored) ajoute
+  les near-miss (score à moins de HOT_POOL_SCORE_MARGIN du seuil réseau) et les
+  tokens WATCHLIST_TOKENS; un pool qui s'éloigne du seuil ou le franchit sort
+- Multi-pool: un rafraîchissement ne ramène que les pools chauds, sans leurs
+  pools frères; multi_pool_data() rend l'analyse multi-pool du groupe complet
+  (dernier passage réseau) pour les re-scorer avec le même bonus
+- Priorité (plus petite = plus chaude): écart au seuil - tendance du score
+  (points gagnés depuis l'observation précédente) - hausse de prix 1h ×
+  HOT_POOL_PRICE_MOMENTUM_WEIGHT - un point par tick d'attente (pas de famine)
+- Rafraîchissement: select() retient les réseaux des pools les plus chauds,
+  une requête /pools/multi (ACTIVE_TRACKING_BATCH_SIZE adresses) par réseau,
+  dans HOT_POOL_API_BUDGET_PER_MINUTE
+"""
+
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from config.settings import (
+    NETWORK_SCORE_FILTERS,
+    ACTIVE_TRACKING_BATCH_SIZE,
+    HOT_POOL_SCORE_MARGIN,
+    HOT_POOL_MAX_SIZE,
+    HOT_POOL_TTL_SECONDS,
+    HOT_POOL_REFRESH_SECONDS,
+    HOT_POOL_PRICE_MOMENTUM_WEIGHT,
+)
+from core.filters import check_watchlist_token
+from utils.metrics import metrics
+
+
+@dataclass(slots=True)
+class HotPool:
+    network: str
+    pool_address: str
+    score: float
+    gap: float                  # Points manquants pour le seuil réseau (<= 0 pour la watchlist)
+    trend: float = 0.0          # Score gagné depuis l'observation précédente
+    price_change_1h: float = 0.0
+    watchlist: bool = False
+    multi_pool_data: Optional[Dict] = None  # Groupe complet du token (passage réseau)
+    last_seen: float = 0.0
+    last_refresh: float = 0.0
+
+    def priority(self, now: float) -> float:
+        waiting_ticks = (now - max(self.last_seen, self.last_refresh)) / HOT_POOL_REFRESH_SECONDS
+        return (max(0.0, self.gap) - self.trend
+                - max(0.0, self.price_change_1h) * HOT_POOL_PRICE_MOMENTUM_WEIGHT
+                - waiting_ticks)
+
+
+class HotPoolWatchlist:
+    """(réseau, adresse pool) -> HotPool, thread-safe (scoring + thread de rafraîchissement)."""
+
+    def __init__(self, score_margin: float = HOT_POOL_SCORE_MARGIN, max_size: int = HOT_POOL_MAX_SIZE,
+                 ttl_seconds: float = HOT_POOL_TTL_SECONDS):
+        self.score_margin = score_margin
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._pools: Dict[Tuple[str, str], HotPool] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, candidates: Iterable[Dict], now: Optional[float] = None) -> int:
+        """
+        Met à jour la watchlist avec des candidats scorés (clés pool_data, score).
+
+        Returns:
+            Nombre de pools chauds après mise à jour
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for candidate in candidates:
+                pool_data = candidate["pool_data"]
+                network = pool_data.get("network", "").lower()
+                key = (network, pool_data["pool_address"].lower())
+                score = candidate["score"]
+                min_score = NETWORK_SCORE_FILTERS.get(network, {}).get("min_score", 85)
+                gap = min_score - score
+                watchlist = check_watchlist_token(pool_data)
+                previous = self._pools.get(key)
+
+                if not watchlist and (gap <= 0 or gap > self.score_margin):
+                    # Seuil franchi (le lot courant le traite) ou pool redevenu froid
+                    if previous is not None:
+                        del self._pools[key]
+                        if gap <= 0:
+                            metrics.inc("hot_pool_crossings_total", network=network)
+                    continue
+
+                self._pools[key] = HotPool(
+                    network=network,
+                    pool_address=pool_data["pool_address"],
+                    score=score,
+                    gap=min(gap, 0.0) if watchlist else gap,  # Watchlist: bypass du seuil, priorité max
+                    trend=score - previous.score if previous is not None else 0.0,
+                    price_change_1h=pool_data.get("price_change_1h") or 0.0,
+                    watchlist=watchlist,
+                    multi_pool_data=candidate.get("multi_pool_data"),
+                    last_seen=now,
+                    last_refresh=previous.last_refresh if previous is not None else 0.0,
+                )
+            self._evict(now)
+            size = len(self._pools)
+        metrics.set_gauge("hot_pools_watched", size)
+        return size
+
+    def _evict(self, now: float):
+        """Pools non revus depuis ttl_seconds, puis les moins prioritaires au-delà de max_size."""
+        expired = [key for key, pool in self._pools.items() if now - pool.last_seen > self.ttl_seconds]
+        for key in expired:
+            del self._pools[key]
+        overflow = len(self._pools) - self.max_size
+        if overflow > 0:
+            coldest = heapq.nlargest(overflow, self._pools.items(), key=lambda item: item[1].priority(now))
+            for key, _ in coldest:
+                del self._pools[key]
+
+    def select(self, max_requests: int, batch_size: int = ACTIVE_TRACKING_BATCH_SIZE,
+               now: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Pools à rafraîchir: {réseau: adresses}, au plus max_requests réseaux
+        (une requête /pools/multi chacun), réseaux du pool le plus chaud d'abord.
+        """
+        now = time.time() if now is None else now
+        selection: Dict[str, List[str]] = {}
+        with self._lock:
+            ranked = sorted(self._pools.values(), key=lambda pool: pool.priority(now))
+            for pool in ranked:
+                addresses = selection.get(pool.network)
+                if addresses is None:
+                    if len(selection) >= max_requests:
+                        continue
+                    addresses = selection[pool.network] = []
+                if len(addresses) < batch_size:
+                    addresses.append(pool.pool_address)
+                    pool.last_refresh = now
+        return selection
+
+    def multi_pool_data(self, pool_data: Mapping) -> Optional[Dict]:
+        """Analyse multi-pool mémorisée pour un pool chaud, None s'il n'est pas suivi."""
+        key = (pool_data.get("network", "").lower(), pool_data["pool_address"].lower())
+        with self._lock:
+            pool = self._pools.get(key)
+            return pool.multi_pool_data if pool is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            watchlist = sum(1 for pool in self._pools.values() if pool.watchlist)
+            return {"pools": len(self._pools), "near_miss": len(self._pools) - watchlist, "watchlist": watchlist}
+
+    def __len__(self) -> int:
+        return len(self._pools)
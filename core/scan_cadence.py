@@ -0,0 +1,84 @@
+"""
+Cadence de scan adaptative par réseau
+
+Au lieu d'un tour de tous les réseaux à intervalle fixe, chaque réseau a son
+propre intervalle, ajusté après chaque analyse de son lot:
+- Réseau actif (opportunités au-dessus du seuil, pics de buy ratio):
+  intervalle × SCAN_CADENCE_SPEEDUP, jusqu'à SCAN_CADENCE_MIN_SECONDS
+- Réseau calme: intervalle × SCAN_CADENCE_SLOWDOWN, jusqu'à SCAN_CADENCE_MAX_SECONDS
+
+Budget API: chaque passage coûte une requête par endpoint de collecte. Si la
+somme des cadences dépasse SCAN_CADENCE_API_BUDGET_PER_MINUTE, tous les
+intervalles sont allongés du même facteur (priorités relatives conservées).
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import (
+    SCAN_CADENCE_DEFAULT_SECONDS,
+    SCAN_CADENCE_MIN_SECONDS,
+    SCAN_CADENCE_MAX_SECONDS,
+    SCAN_CADENCE_SPEEDUP,
+    SCAN_CADENCE_SLOWDOWN,
+    SCAN_CADENCE_HOT_OPPORTUNITIES,
+    SCAN_CADENCE_HOT_BUY_RATIO_SPIKES,
+    SCAN_CADENCE_API_BUDGET_PER_MINUTE,
+)
+from utils.metrics import metrics
+
+
+class AdaptiveCadence:
+    """Intervalle de scan par réseau, ajusté à l'activité et borné par le budget API."""
+
+    def __init__(self, networks: Iterable[str], requests_per_poll: int,
+                 budget_per_minute: float = SCAN_CADENCE_API_BUDGET_PER_MINUTE):
+        self.requests_per_poll = requests_per_poll
+        self.budget_per_minute = budget_per_minute
+        self._intervals: Dict[str, float] = {network: float(SCAN_CADENCE_DEFAULT_SECONDS) for network in networks}
+        self._next_due: Dict[str, float] = {network: 0.0 for network in self._intervals}  # Tous dus au démarrage
+        self._lock = threading.Lock()
+
+    def budget_factor(self) -> float:
+        """Facteur (>= 1) appliqué aux intervalles pour rester dans le budget de requêtes/minute."""
+        demand = sum(self.requests_per_poll * 60.0 / interval for interval in self._intervals.values())
+        return max(1.0, demand / self.budget_per_minute)
+
+    def effective_interval(self, network: str) -> float:
+        with self._lock:
+            return self._intervals[network] * self.budget_factor()
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Réseaux à interroger maintenant (leur prochain passage est aussitôt planifié)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            factor = self.budget_factor()
+            networks = [network for network, due_at in self._next_due.items() if due_at <= now]
+            for network in networks:
+                self._next_due[network] = now + self._intervals[network] * factor
+        return networks
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return max(0.0, min(self._next_due.values()) - now)
+
+    def record(self, network: str, opportunities: int, buy_ratio_spikes: int):
+        """Ajuste l'intervalle du réseau après l'analyse de son lot."""
+        hot = (opportunities >= SCAN_CADENCE_HOT_OPPORTUNITIES
+               or buy_ratio_spikes >= SCAN_CADENCE_HOT_BUY_RATIO_SPIKES)
+        with self._lock:
+            interval = self._intervals[network] * (SCAN_CADENCE_SPEEDUP if hot else SCAN_CADENCE_SLOWDOWN)
+            interval = min(SCAN_CADENCE_MAX_SECONDS, max(SCAN_CADENCE_MIN_SECONDS, interval))
+            previous, self._intervals[network] = self._intervals[network], interval
+            # Réseau qui s'active: avancer le prochain passage déjà planifié
+            if interval < previous:
+                self._next_due[network] -= (previous - interval) * self.budget_factor()
+        metrics.set_gauge("scan_cadence_seconds", interval, network=network)
+
+    def intervals(self) -> Dict[str, float]:
+        """Intervalles effectifs (budget appliqué), pour les logs."""
+        with self._lock:
+            factor = self.budget_factor()
+            return {network: round(interval * factor) for network, interval in self._intervals.items()}
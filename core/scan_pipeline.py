@@ -0,0 +1,299 @@
+"""
+Pipeline de scan - Étapes concurrentes reliées par des files bornées
+
+scan_geckoterminal() enchaîne collecte -> analyse -> alertes -> tracking, puis
+la boucle principale dort 120s: un nouveau pool attend jusqu'à 120s + durée
+du scan avant d'être analysé. Ici, 4 threads:
+
+    collecte --(pools d'un réseau)--> scoring --(opportunités)--> alertes
+    pools chauds --(near-miss)------/    \\--(pools du tour)----> tracking actif
+
+- La collecte interroge chaque réseau à sa propre cadence (core/scan_cadence.py:
+  réseau actif toutes les 30s, réseau calme toutes les 5 min, dans le budget
+  API) et publie chaque réseau dès que ses endpoints sont reçus
+- Files bornées (SCAN_PIPELINE_QUEUE_SIZE): une étape lente bloque la
+  précédente (backpressure) au lieu d'accumuler des lots périmés
+- Un tour (fenêtre de SCAN_PIPELINE_MIN_ROUND_SECONDS, réseaux dus pendant la
+  fenêtre) garde la sémantique d'un scan: MAX_ALERTS_PER_SCAN, tracking actif,
+  ligne scan_metrics, callback on_round_end (snapshot d'état)
+- Pools chauds (core/hot_pools.py, ENABLE_HOT_POOLS): les near-miss et tokens
+  watchlist vus au scoring sont re-scorés toutes les HOT_POOL_REFRESH_SECONDS
+  par /pools/multi, sans attendre le prochain passage de leur réseau
+
+Différence avec le scan séquentiel: le regroupement multi-pool et le tri par
+score se font par réseau (un lot), plus sur l'ensemble du scan.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config.settings import (
+    NETWORKS,
+    ENABLE_HOT_POOLS,
+    HOT_POOL_REFRESH_SECONDS,
+    HOT_POOL_API_BUDGET_PER_MINUTE,
+    MAX_ALERTS_PER_SCAN,
+    SCAN_CADENCE_BUY_RATIO_SPIKE_PERCENT,
+    SCAN_PIPELINE_QUEUE_SIZE,
+    SCAN_PIPELINE_MIN_ROUND_SECONDS,
+)
+from core.hot_pools import HotPoolWatchlist
+from core.scan_cadence import AdaptiveCadence
+from core.scanner_steps import (
+    COLLECTION_ENDPOINTS,
+    iter_pools_by_network,
+    update_price_max_for_tracked_tokens,
+    analyze_and_filter_tokens,
+    process_and_send_alerts,
+    track_active_alerts,
+    report_liquidity_stats,
+)
+from data.cache import update_buy_ratio_history, get_buy_ratio_change, get_buy_ratio_history_stats
+from utils.api_client import get_pools_by_addresses
+from utils.helpers import log
+from utils.metrics import metrics, persist_scan_metrics
+
+# Fin de flux, propagée d'étape en étape à l'arrêt
+_STOP = object()
+
+
+class ScanPipeline:
+    """Collecte, scoring, alertes et tracking actif en threads reliés par des files bornées."""
+
+    def __init__(self, security_checker, alert_tracker, on_round_end: Optional[Callable[[], None]] = None,
+                 queue_size: int = SCAN_PIPELINE_QUEUE_SIZE,
+                 min_round_seconds: float = SCAN_PIPELINE_MIN_ROUND_SECONDS):
+        self.security_checker = security_checker
+        self.alert_tracker = alert_tracker
+        self.on_round_end = on_round_end
+        self.min_round_seconds = min_round_seconds
+        self.cadence = AdaptiveCadence(NETWORKS, requests_per_poll=len(COLLECTION_ENDPOINTS))
+        self.hot_pools = HotPoolWatchlist() if ENABLE_HOT_POOLS else None
+        self._round_id = 1  # Tour courant (collecte), repris par les rafraîchissements de pools chauds
+        self._pools_queue = queue.Queue(maxsize=queue_size)
+        self._alerts_queue = queue.Queue(maxsize=queue_size)
+        self._tracking_queue = queue.Queue(maxsize=1)  # Un tour en attente au plus
+        self._stopping = threading.Event()
+        self._threads = []
+        self._hot_thread = None
+        self._counts_lock = threading.Lock()
+        self._counts = self._empty_counts()
+
+    @staticmethod
+    def _empty_counts() -> Dict[str, int]:
+        return {"pools": 0, "opportunities": 0, "alerts": 0, "rejected": 0}
+
+    def _count(self, **values):
+        with self._counts_lock:
+            for key, value in values.items():
+                self._counts[key] += value
+
+    def _take_counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            counts, self._counts = self._counts, self._empty_counts()
+        return counts
+
+    # ===== Cycle de vie =====
+
+    def start(self):
+        stages = [("collect", self._collect), ("score", self._score),
+                  ("alerts", self._alert), ("tracking", self._track)]
+        if self.hot_pools is not None:
+            stages.append(("hot_pools", self._refresh_hot))
+        for name, target in stages:
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            if target == self._refresh_hot:
+                self._hot_thread = thread
+            thread.start()
+            self._threads.append(thread)
+        log(f"🚀 Pipeline de scan démarré ({len(stages)} étapes, files de {self._pools_queue.maxsize} lots)")
+
+    def run_forever(self):
+        """Démarre le pipeline et bloque jusqu'à l'arrêt (KeyboardInterrupt propagé à l'appelant)."""
+        if not self._threads:
+            self.start()
+        while any(thread.is_alive() for thread in self._threads):
+            self._threads[0].join(timeout=1)
+
+    def stop(self, timeout: float = 30):
+        """Arrête la collecte; les étapes suivantes terminent les lots en file puis s'arrêtent."""
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        log("⏹️ Pipeline de scan arrêté")
+
+    # ===== Étapes =====
+
+    def _collect(self):
+        """Producteur: réseaux dus selon leur cadence, publiés un par un; fin de tour par fenêtre de temps."""
+        round_id = 1
+        round_started = time.monotonic()
+        liquidity_stats = {}
+        while not self._stopping.is_set():
+            due = self.cadence.due()
+            if due:
+                try:
+                    with metrics.time_stage("collect"):
+                        for network, pools in iter_pools_by_network(liquidity_stats, due):
+                            self._pools_queue.put(("pools", round_id, network, pools))
+                except Exception as e:
+                    log(f"❌ Erreur collecte (tour #{round_id}): {e}")
+
+            if time.monotonic() - round_started >= self.min_round_seconds:
+                self._pools_queue.put(("round_end", round_id, liquidity_stats))
+                log(f"⏱️ Cadence par réseau: " + ", ".join(f"{n}={s}s" for n, s in self.cadence.intervals().items()))
+                round_id += 1
+                self._round_id = round_id
+                round_started = time.monotonic()
+                liquidity_stats = {}
+
+            # Attente du prochain réseau dû ou de la fin du tour (interrompue par stop())
+            until_round_end = self.min_round_seconds - (time.monotonic() - round_started)
+            self._stopping.wait(max(0.5, min(self.cadence.seconds_until_next(), until_round_end)))
+        # Plus aucun lot après _STOP: le rafraîchissement des pools chauds s'arrête d'abord
+        if self._hot_thread is not None:
+            self._hot_thread.join()
+        self._pools_queue.put(_STOP)
+
+    def _refresh_hot(self):
+        """Producteur rapide: pools chauds les plus prioritaires, une requête /pools/multi par réseau."""
+        max_requests = max(1, int(HOT_POOL_API_BUDGET_PER_MINUTE * HOT_POOL_REFRESH_SECONDS / 60))
+        while not self._stopping.wait(HOT_POOL_REFRESH_SECONDS):
+            for network, addresses in self.hot_pools.select(max_requests).items():
+                try:
+                    pools = get_pools_by_addresses(network, addresses)
+                    metrics.inc("hot_pool_refresh_requests_total", network=network)
+                except Exception as e:
+                    log(f"❌ Erreur rafraîchissement pools chauds {network.upper()}: {e}")
+                    continue
+                if pools:
+                    self._pools_queue.put(("hot", self._round_id, network, list(pools.values())))
+
+    def _score(self):
+        """Historique buy ratio, prix MAX et analyse/filtrage de chaque lot réseau."""
+        round_pools = []
+        while True:
+            item = self._pools_queue.get()
+            if item is _STOP:
+                self._alerts_queue.put(_STOP)
+                self._tracking_queue.put(_STOP)
+                return
+
+            if item[0] == "round_end":
+                _, round_id, liquidity_stats = item
+                self._tracking_queue.put((round_id, round_pools, liquidity_stats))
+                round_pools = []
+                continue
+
+            kind, round_id, network, pools = item
+            if kind != "hot":
+                # Pools chauds déjà comptés (et suivis) par le passage de leur réseau
+                round_pools.extend(pools)
+            try:
+                with metrics.time_stage("buy_ratio_history"):
+                    for pool_data in pools:
+                        update_buy_ratio_history(pool_data)
+
+                with metrics.time_stage("price_max_update"):
+                    update_price_max_for_tracked_tokens(pools, self.alert_tracker)
+
+                with metrics.time_stage("analyze"):
+                    opportunities, rejected = analyze_and_filter_tokens(
+                        pools, self.security_checker,
+                        on_scored=self.hot_pools.observe if self.hot_pools is not None else None,
+                        # Lot chaud sans pools frères: multi-pool du dernier passage réseau
+                        multi_pool_lookup=self.hot_pools.multi_pool_data if kind == "hot" else None,
+                    )
+
+                if kind == "hot":
+                    self._count(opportunities=len(opportunities), rejected=rejected)
+                    metrics.inc("hot_pool_rescored_total", len(pools), network=network)
+                    # Re-scoring ciblé: pas un passage réseau, la cadence n'est pas ajustée
+                    log(f"🔥 Pools chauds {network.upper()}: {len(pools)} re-scorés, {len(opportunities)} opportunité(s)")
+                    if opportunities:
+                        self._alerts_queue.put((round_id, opportunities))
+                    continue
+
+                self._count(pools=len(pools), opportunities=len(opportunities), rejected=rejected)
+                # Activité du réseau -> cadence de son prochain passage
+                spikes = sum(
+                    1 for pool_data in pools
+                    if (get_buy_ratio_change(pool_data["base_token_name"], pool_data["pool_address"]) or 0)
+                    >= SCAN_CADENCE_BUY_RATIO_SPIKE_PERCENT
+                )
+                self.cadence.record(network, len(opportunities), spikes)
+                if opportunities:
+                    self._alerts_queue.put((round_id, opportunities))
+            except Exception as e:
+                log(f"❌ Erreur analyse {network.upper()} (tour #{round_id}): {e}")
+
+    def _alert(self):
+        """Alertes Telegram, budget MAX_ALERTS_PER_SCAN par tour."""
+        current_round, sent_this_round = None, 0
+        while True:
+            item = self._alerts_queue.get()
+            if item is _STOP:
+                return
+
+            round_id, opportunities = item
+            # Tour en avant seulement: un lot chaud (self._round_id lu sans verrou autour
+            # de round_end) peut porter le tour précédent; il compte dans le tour courant
+            if current_round is None or round_id > current_round:
+                current_round, sent_this_round = round_id, 0
+            round_id = current_round
+            remaining = MAX_ALERTS_PER_SCAN - sent_this_round
+            if remaining <= 0:
+                log(f"⚠️ Limite {MAX_ALERTS_PER_SCAN} alertes atteinte (tour #{round_id}): {len(opportunities)} opportunité(s) ignorée(s)")
+                continue
+
+            try:
+                with metrics.time_stage("alerts"):
+                    sent, rejected = process_and_send_alerts(
+                        opportunities, self.alert_tracker, self.security_checker, max_alerts=remaining
+                    )
+                sent_this_round += sent
+                self._count(alerts=sent, rejected=rejected)
+            except Exception as e:
+                log(f"❌ Erreur alertes (tour #{round_id}): {e}")
+
+    def _track(self):
+        """Fin de tour: tracking actif sur les pools du tour, rapport, métriques du scan."""
+        metrics.begin_scan()
+        while True:
+            item = self._tracking_queue.get()
+            if item is _STOP:
+                return
+
+            round_id, pools, liquidity_stats = item
+            try:
+                get_buy_ratio_history_stats()  # Gauges entrées / pools suivis
+
+                with metrics.time_stage("active_tracking"):
+                    track_active_alerts(self.alert_tracker, pools)
+
+                with metrics.time_stage("report"):
+                    report_liquidity_stats(liquidity_stats)
+
+                if self.hot_pools is not None:
+                    hot = self.hot_pools.stats()
+                    log(f"🔥 Pools chauds surveillés: {hot['pools']} ({hot['near_miss']} near-miss, {hot['watchlist']} watchlist)")
+            except Exception as e:
+                log(f"❌ Erreur tracking actif (tour #{round_id}): {e}")
+
+            # Métriques du tour -> table scan_metrics (lue par /metrics du dashboard)
+            counts = self._take_counts()
+            scan_summary = metrics.end_scan(counts["pools"], counts["opportunities"], counts["alerts"])
+            if self.alert_tracker is not None:
+                persist_scan_metrics(self.alert_tracker.db_path, scan_summary, writer=self.alert_tracker.writer)
+            log(f"✅ Tour #{round_id} terminé en {scan_summary['duration_seconds']:.1f}s: {counts['pools']} pools, "
+                f"{counts['alerts']} alertes, {counts['rejected']} tokens rejetés")
+
+            if self.on_round_end is not None:
+                try:
+                    self.on_round_end()
+                except Exception as e:
+                    log(f"⚠️ Erreur fin de tour: {e}")
+            metrics.begin_scan()
@@ -3,6 +3,7 @@ Scanner Steps - Sous-fonctions du scanner principal
 
 Décomposition du scan_geckoterminal() en étapes logiques:
 - collect_pools_from_networks(): Collecte des pools depuis l'API
+- iter_pools_by_network(): Collecte en flux, réseau par réseau (pipeline)
 - update_price_max_for_tracked_tokens(): Mise à jour des prix max en DB
 - analyze_and_filter_tokens(): Analyse et filtrage des opportunités
 - process_and_send_alerts(): Traitement et envoi des alertes
@@ -11,11 +12,16 @@ Décomposition du scan_geckoterminal() en étapes logiques:
 """
 
 import time
-from typing import Dict, List, Tuple, Optional
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 from datetime import datetime
 
 from config.settings import (
     NETWORKS,
+    ENABLE_CONCURRENT_COLLECTION,
+    COLLECTION_MAX_WORKERS,
     MAX_TOKEN_AGE_HOURS,
     MAX_ALERTS_PER_SCAN,
     NETWORK_SCORE_FILTERS,
@@ -31,61 +37,146 @@ from config.settings import (
     get_alert_quality_score,
     STOP_LOSS_PERCENT,
     ENABLE_TIME_FILTERING,
+    ENABLE_ANALYSIS_MEMO,
     ENABLE_SMART_MONEY_TRACKING,
     calculate_partial_profit_result,
 )
 from utils.helpers import log
-from utils.api_client import get_trending_pools, get_new_pools, get_pool_by_address, parse_pool_data
-from utils.telegram import send_telegram
+from utils.metrics import metrics
+from utils.api_client import get_trending_pools, get_new_pools, get_pools_by_addresses, parse_pool_data
+from utils.telegram import send_telegram_async
 from data.cache import update_buy_ratio_history
+from data.analysis_memo import AnalysisResult, analysis_memo, memo_key, pool_fingerprint
 from core.signals import get_price_momentum_from_api, find_resistance_simple, group_pools_by_token, analyze_multi_pool, detect_signals
 from core.scoring import calculate_final_score, calculate_confidence_tier
+from core.batch_scoring import score_pools_batch
 from core.filters import check_watchlist_token, is_valid_opportunity
+from core.filter_pipeline import FilterPipeline, FilterStage
 from core.alerts import should_send_alert, generer_alerte_complete
 from core.strategy_validator import check_and_send_vip_alert
 
 
-def collect_pools_from_networks(liquidity_stats: Dict) -> List[Dict]:
+# Endpoints collectés pour chaque réseau (1 page = 20 pools chacun)
+COLLECTION_ENDPOINTS = {
+    "trending": get_trending_pools,
+    "new": get_new_pools,
+}
+
+
+def _fetch_endpoint(network: str, endpoint: str) -> Optional[List[Dict]]:
+    """Récupère une page brute d'un endpoint (pacing fait par le token bucket de l'api_client)."""
+    return COLLECTION_ENDPOINTS[endpoint](network)
+
+
+def _append_parsed_pools(raw_pools: Optional[List[Dict]], network: str, endpoint: str,
+                         liquidity_stats: Dict, all_pools: List[Dict]) -> None:
+    """Parse une page de pools bruts et ajoute ceux dans la limite d'âge."""
+    if not raw_pools:
+        return
+
+    parsed = 0
+    for pool in raw_pools:
+        pool_data = parse_pool_data(pool, network, liquidity_stats)
+        if pool_data and pool_data["age_hours"] <= MAX_TOKEN_AGE_HOURS:
+            all_pools.append(pool_data)
+            parsed += 1
+    metrics.inc("pools_parsed_total", parsed, network=network)
+
+    if endpoint == "trending":
+        log(f"   📊 {len(raw_pools)} pools trending trouvés")
+    else:
+        log(f"   🆕 {len(raw_pools)} nouveaux pools trouvés")
+
+
+def collect_pools_from_networks(liquidity_stats: Dict, concurrent: Optional[bool] = None) -> List[Dict]:
     """
     Collecte tous les pools depuis tous les réseaux configurés.
 
+    En mode concurrent, toutes les paires (réseau, endpoint) sont récupérées
+    en parallèle par un pool de threads borné, sous le token bucket partagé
+    de utils/rate_limiter.py. Le parsing reste fait dans le thread
+    appelant, dans l'ordre de NETWORKS: le résultat est identique au mode
+    séquentiel.
+
     Args:
         liquidity_stats: Dictionnaire pour tracker les sources de liquidité
+        concurrent: Force le mode (None = ENABLE_CONCURRENT_COLLECTION)
 
     Returns:
         Liste de tous les pools collectés avec leurs données
     """
+    if concurrent is None:
+        concurrent = ENABLE_CONCURRENT_COLLECTION
+
     all_pools = []
 
-    for network in NETWORKS:
-        log(f"\n🔍 Scan réseau: {network.upper()}")
+    if not concurrent:
+        for network in NETWORKS:
+            log(f"\n🔍 Scan réseau: {network.upper()}")
+            for endpoint, fetch in COLLECTION_ENDPOINTS.items():
+                _append_parsed_pools(fetch(network), network, endpoint, liquidity_stats, all_pools)
+                time.sleep(2)
+
+        log(f"\n📊 Total pools collectés: {len(all_pools)}")
+        return all_pools
 
-        # Trending pools - 1 page seulement (20 pools)
-        trending = get_trending_pools(network)
-        if trending:
-            for pool in trending:
-                pool_data = parse_pool_data(pool, network, liquidity_stats)
-                if pool_data and pool_data["age_hours"] <= MAX_TOKEN_AGE_HOURS:
-                    all_pools.append(pool_data)
-            log(f"   📊 {len(trending)} pools trending trouvés")
+    tasks = [(network, endpoint) for network in NETWORKS for endpoint in COLLECTION_ENDPOINTS]
+    max_workers = max(1, min(COLLECTION_MAX_WORKERS, len(tasks)))
 
-        time.sleep(2)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect") as executor:
+        futures = {task: executor.submit(_fetch_endpoint, *task) for task in tasks}
 
-        # New pools - 1 page seulement (20 pools)
-        new_pools = get_new_pools(network)
-        if new_pools:
-            for pool in new_pools:
-                pool_data = parse_pool_data(pool, network, liquidity_stats)
-                if pool_data and pool_data["age_hours"] <= MAX_TOKEN_AGE_HOURS:
-                    all_pools.append(pool_data)
-            log(f"   🆕 {len(new_pools)} nouveaux pools trouvés")
+    # Les get_* attrapent déjà leurs exceptions et renvoient None
+    raw_results = {task: future.result() for task, future in futures.items()}
+    log(f"⚡ Collecte concurrente: {len(tasks)} requêtes en {time.time() - start:.1f}s ({max_workers} threads)")
 
-        time.sleep(2)
+    for network in NETWORKS:
+        log(f"\n🔍 Scan réseau: {network.upper()}")
+        for endpoint in COLLECTION_ENDPOINTS:
+            _append_parsed_pools(raw_results[(network, endpoint)], network, endpoint, liquidity_stats, all_pools)
 
     log(f"\n📊 Total pools collectés: {len(all_pools)}")
     return all_pools
 
 
+def iter_pools_by_network(liquidity_stats: Dict, networks: Optional[List[str]] = None) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Variante en flux de collect_pools_from_networks() (core/scan_pipeline.py).
+
+    Toutes les paires (réseau, endpoint) partent en parallèle; chaque réseau
+    est parsé et publié dès que ses endpoints sont reçus, sans attendre les
+    autres réseaux.
+
+    Args:
+        liquidity_stats: Dictionnaire pour tracker les sources de liquidité
+        networks: Réseaux à collecter (None = NETWORKS)
+
+    Yields:
+        (network, pools du réseau dans la limite d'âge)
+    """
+    networks = NETWORKS if networks is None else networks
+    tasks = [(network, endpoint) for network in networks for endpoint in COLLECTION_ENDPOINTS]
+    max_workers = max(1, min(COLLECTION_MAX_WORKERS, len(tasks)))
+    pending = {network: len(COLLECTION_ENDPOINTS) for network in networks}
+    raw_results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collect") as executor:
+        futures = {executor.submit(_fetch_endpoint, *task): task for task in tasks}
+        for future in as_completed(futures):
+            network, endpoint = futures[future]
+            raw_results[(network, endpoint)] = future.result()
+            pending[network] -= 1
+            if pending[network]:
+                continue
+
+            pools = []
+            for endpoint in COLLECTION_ENDPOINTS:
+                _append_parsed_pools(raw_results.pop((network, endpoint)), network, endpoint, liquidity_stats, pools)
+            log(f"🔍 Réseau {network.upper()}: {len(pools)} pools")
+            yield network, pools
+
+
 def update_price_max_for_tracked_tokens(all_pools: List[Dict], alert_tracker) -> None:
     """
     Met à jour le prix MAX en temps réel pour TOUS les tokens trackés.
@@ -98,29 +189,252 @@ def update_price_max_for_tracked_tokens(all_pools: List[Dict], alert_tracker) ->
     if alert_tracker is None:
         return
 
+    # alerts.token_address contient l'adresse du pool alerté
+    prices = {}
     for pool_data in all_pools:
-        token_address = pool_data.get('token_address')
-        current_price = pool_data.get('price', 0)
+        pool_address = pool_data.get('pool_address')
+        current_price = pool_data.get('price_usd') or 0
 
-        if token_address and current_price > 0:
-            # Vérifier si ce token a une alerte active
-            previous_alert = alert_tracker.get_last_alert_for_token(token_address)
+        if pool_address and current_price > 0:
+            # Vérifier si ce token a une alerte (index mémoire, sans SQL)
+            previous_alert = alert_tracker.get_last_alert_for_token(pool_address)
             if previous_alert:
-                alert_id = previous_alert.get('id')
-                # Mettre à jour le prix MAX en DB
-                alert_tracker.update_price_max_realtime(alert_id, current_price)
+                prices[previous_alert['id']] = current_price
+
+    # Comparaison en mémoire (cache d'état par alerte) + un seul upsert groupé
+    updated = alert_tracker.update_prices_max_realtime(prices)
+    if prices:
+        log(f"📈 Prix MAX temps réel: {updated}/{len(prices)} alerte(s) trackée(s)")
+
+
+# Pipelines persistants: les taux de rejet observés pilotent l'ordre des filtres
+PRE_SCORE_FILTERS = FilterPipeline("pre_score")
+POST_SCORE_FILTERS = FilterPipeline("post_score")
+MEMO_SECURITY_FILTERS = FilterPipeline("memo_security")  # Pools inchangés (mémo d'analyse): sécurité seule
+
+
+def _candidate_label(candidate: Dict) -> str:
+    return candidate["pool_data"]["name"]
+
+
+def _passes_vol_liq(candidate: Dict) -> Tuple[bool, str]:
+    """V4.1: VOL/LIQ RATIO FILTER (CRITICAL!)"""
+    pool_data = candidate["pool_data"]
+    volume_24h = pool_data.get('volume_24h', 0)
+    liquidity = pool_data.get('liquidity', 0)
+    if liquidity > 0 and volume_24h > 0:
+        network = pool_data.get('network', '').lower()
+        vol_liq_ratio = calculate_vol_liq_ratio(volume_24h, liquidity)
+        is_good_vol_liq, vol_liq_reason = is_optimal_vol_liq(network, vol_liq_ratio)
+        if not is_good_vol_liq:
+            return False, f"[V4.1 REJECT] {vol_liq_reason}"
+    return True, ""
+
+
+def _passes_age_danger_zone(candidate: Dict) -> Tuple[bool, str]:
+    """V4.1: AGE DANGER ZONE FILTER"""
+    pool_data = candidate["pool_data"]
+    network = pool_data.get('network', '').lower()
+    age_hours = pool_data.get('age_hours', 0)
+    if is_in_age_danger_zone(network, age_hours):
+        return False, f"[V4.1 REJECT] Age {age_hours:.1f}h in danger zone for {network}"
+    return True, ""
+
+
+def _passes_time(candidate: Dict) -> Tuple[bool, str]:
+    """V4.1: TIME FILTER (optional - can be disabled)"""
+    from datetime import datetime, timezone
+    is_good_time, time_reason = is_optimal_time(datetime.now(timezone.utc).hour)
+    if not is_good_time:
+        return False, f"[V4.1 REJECT] {time_reason}"
+    return True, ""
+
+
+def _passes_whale_dump(candidate: Dict) -> Tuple[bool, str]:
+    """Rejet immédiat si WHALE DUMP détecté"""
+    if candidate["whale_analysis"]['pattern'] == 'WHALE_SELLING':
+        return False, "🚨 WHALE DUMP détecté - REJETÉ"
+    return True, ""
+
+
+def _passes_network_score(candidate: Dict) -> Tuple[bool, str]:
+    """Filtre score par réseau (token watchlist: bypass)"""
+    pool_data = candidate["pool_data"]
+    network = pool_data.get('network', '').lower()
+    min_score_required = NETWORK_SCORE_FILTERS.get(network, {}).get('min_score', 85)
+    score = candidate["score"]
+    if not check_watchlist_token(pool_data) and score < min_score_required:
+        return False, f"[V3 REJECT] Score insuffisant: {score} < {min_score_required} ({network.upper()})"
+    return True, ""
+
+
+def _passes_opportunity(candidate: Dict) -> Tuple[bool, str]:
+    """Validation opportunité (filtres V3 + validation classique)"""
+    return is_valid_opportunity(candidate["pool_data"], candidate["score"])
+
+
+def _security_predicate(security_checker):
+    """Validation sécurité (appels réseau): le filtre le plus cher, exécuté sur les survivants."""
+    def passes_security(candidate: Dict) -> Tuple[bool, str]:
+        pool_data = candidate["pool_data"]
+        log(f"\n🔒 Vérification sécurité: {pool_data['name']}")
+        security_result = security_checker.check_token_security(pool_data["pool_address"], pool_data["network"])
+        candidate["security_result"] = security_result
+
+        should_send, reason = security_checker.should_send_alert(
+            security_result, min_security_score=50
+        )
+        if not should_send:
+            return False, (f"⛔ Token rejeté: {reason} (sécurité {security_result['security_score']}/100, "
+                           f"risque {security_result['risk_level']})")
+
+        log(f"✅ Sécurité validée (Score: {security_result['security_score']}/100)")
+        return True, ""
+    return passes_security
+
+
+def _security_prefetch(security_checker):
+    """Avant le filtre sécurité: une requête GoPlus groupée par chaîne pour tous les survivants."""
+    def prefetch(candidates: List[Dict]):
+        security_checker.prefetch_goplus(
+            (c["pool_data"]["pool_address"], c["pool_data"]["network"]) for c in candidates
+        )
+    return prefetch
+
+
+def _build_opportunity(candidate: Dict) -> Dict:
+    """Enrichissements d'un survivant (résistance, signaux, score qualité) -> opportunité."""
+    pool_data = candidate["pool_data"]
+    momentum = candidate["momentum"]
+    multi_pool_data = candidate["multi_pool_data"]
+    score = candidate["score"]
+    whale_analysis = candidate["whale_analysis"]
+    network = pool_data["network"]
+
+    # Résistance - SIMPLIFIÉ: calcul basique
+    resistance_data = find_resistance_simple(pool_data)
+
+    # Détecter signaux
+    signals = detect_signals(pool_data, momentum, multi_pool_data)
+
+    # Ajouter signaux whale aux signaux existants
+    if whale_analysis['signals']:
+        signals.extend(whale_analysis['signals'])
+
+    # ============================================
+    # V4.1: Calculate Quality Score & Tier
+    # ============================================
+    volume_24h = pool_data.get('volume_24h', 0)
+    liquidity = pool_data.get('liquidity', 0)
+    vol_liq_ratio = calculate_vol_liq_ratio(volume_24h, liquidity) if liquidity > 0 else 0
+    buy_ratio = pool_data.get('buy_ratio', 1.0)
+
+    from datetime import datetime, timezone
+    current_hour = datetime.now(timezone.utc).hour
+
+    quality_result = get_alert_quality_score(
+        network=network,
+        score=score,
+        velocite=pool_data.get('volume_acceleration_1h_vs_6h', 10),  # Use as velocite proxy
+        buy_ratio=buy_ratio,
+        vol_liq_ratio=vol_liq_ratio,
+        hour_utc=current_hour
+    )
+
+    log(f"   🏆 Quality: {quality_result['quality_score']}/100 ({quality_result['tier']})")
+
+    return {
+        "pool_data": pool_data,
+        "score": score,
+        "base_score": candidate["base_score"],
+        "momentum_bonus": candidate["momentum_bonus"],
+        "whale_analysis": whale_analysis,
+        "momentum": momentum,
+        "multi_pool_data": multi_pool_data,
+        "signals": signals,
+        "resistance_data": resistance_data,
+        "security_result": candidate["security_result"],
+        # V4.1: Quality scoring
+        "quality_score": quality_result['quality_score'],
+        "quality_tier": quality_result['tier'],
+        "quality_factors": quality_result['factors'],
+        "vol_liq_ratio": vol_liq_ratio,
+    }
+
+
+# Sorties du scoring réutilisées telles quelles pour un pool inchangé
+_MEMO_SCORE_KEYS = ("score", "base_score", "momentum_bonus", "whale_analysis", "momentum")
+
+
+def _reuse_analysis(candidates: List[Dict]) -> Tuple[List[Dict], List[Dict], int]:
+    """
+    Sépare les candidats selon le mémo d'analyse (empreinte inchangée depuis le scan précédent).
+
+    Returns:
+        (à analyser, réutilisés hors rejet, rejets réutilisés comptés dans tokens_rejected)
+    """
+    fresh, reused, rejected = [], [], 0
+    for candidate in candidates:
+        pool_data = candidate["pool_data"]
+        candidate["fingerprint"] = pool_fingerprint(pool_data, candidate["multi_pool_data"])
+        result = analysis_memo.get(memo_key(pool_data), candidate["fingerprint"])
+        if result is None:
+            fresh.append(candidate)
+            continue
+
+        candidate.update(result.scores)
+        if result.v3_filter_reasons is not None:
+            pool_data['v3_filter_reasons'] = result.v3_filter_reasons
+        if result.rejection is not None:
+            stage_name, reason, counts_as_rejection = result.rejection
+            log(f"   ⏭️  {_candidate_label(candidate)}: {reason} (inchangé)")
+            metrics.inc("filter_rejections_total", filter=stage_name)
+            rejected += counts_as_rejection
+            continue
+        candidate["memo"] = result
+        reused.append(candidate)
+    return fresh, reused, rejected
+
+
+def _remember_analysis(candidate: Dict, rejection: Optional[Tuple[str, str, bool]] = None,
+                       opportunity: Optional[Dict] = None):
+    """Mémorise le résultat d'un candidat analysé (clés ajoutées par le scoring)."""
+    if "fingerprint" not in candidate:
+        return
+    pool_data = candidate["pool_data"]
+    if opportunity is not None:
+        opportunity = {key: value for key, value in opportunity.items()
+                       if key not in ("pool_data", "security_result", "resistance_data")}
+    analysis_memo.put(memo_key(pool_data), AnalysisResult(
+        fingerprint=candidate["fingerprint"],
+        stored_at=time.time(),
+        scores={key: candidate[key] for key in _MEMO_SCORE_KEYS},
+        v3_filter_reasons=pool_data.get('v3_filter_reasons'),
+        rejection=rejection,
+        opportunity=opportunity,
+    ))
 
 
 def analyze_and_filter_tokens(
     all_pools: List[Dict],
-    security_checker
+    security_checker,
+    on_scored: Optional[Callable[[List[Dict]], None]] = None,
+    multi_pool_lookup: Optional[Callable[[Dict], Optional[Dict]]] = None
 ) -> Tuple[List[Dict], int]:
     """
     Analyse tous les tokens, calcule les scores et filtre les opportunités.
 
+    Ordre par coût: filtres colonnes (vol/liq, âge, heure) -> mémo d'analyse
+    (pools inchangés: score, rejet et enrichissements du scan précédent) ->
+    scoring batch des survivants -> filtres sur le score -> SecurityChecker (réseau).
+
     Args:
         all_pools: Liste de tous les pools collectés
         security_checker: Instance SecurityChecker pour validation sécurité
+        on_scored: Appelé avec tous les candidats scorés, avant les filtres sur
+            le score (watchlist des pools chauds: near-miss compris)
+        multi_pool_lookup: Analyse multi-pool connue d'un pool (None: analysée
+            sur all_pools); lot partiel sans les pools frères (pools chauds)
 
     Returns:
         (opportunités, tokens_rejected)
@@ -132,160 +446,239 @@ def analyze_and_filter_tokens(
     log(f"🔗 Tokens uniques détectés: {len(grouped)}")
 
     opportunities = []
-    tokens_rejected = 0
 
-    for base_token, pools in grouped.items():
-        # Multi-pool analysis
+    # Multi-pool analysis sur le groupe complet (avant tout filtrage)
+    candidates = []
+    for pools in grouped.values():
         multi_pool_data = analyze_multi_pool(pools)
-
-        # Analyser chaque pool
         for pool_data in pools:
-            # Momentum - SIMPLIFIÉ: depuis API directement
-            momentum = get_price_momentum_from_api(pool_data)
-
-            # Résistance - SIMPLIFIÉ: calcul basique
-            resistance_data = find_resistance_simple(pool_data)
-
-            # Score (avec analyse whale)
-            score, base_score, momentum_bonus, whale_analysis = calculate_final_score(
-                pool_data, momentum, multi_pool_data
-            )
-
-            # NOUVEAU: Rejeter immédiatement si WHALE DUMP détecté
-            if whale_analysis['pattern'] == 'WHALE_SELLING':
-                log(f"   🚨 {pool_data['name']}: WHALE DUMP détecté - REJETÉ")
-                tokens_rejected += 1
-                continue
-
-            # FILTRE SCORE PAR RÉSEAU (maintenant que le score est calculé!)
-            network = pool_data.get('network', '').lower()
-            min_score_required = NETWORK_SCORE_FILTERS.get(network, {}).get('min_score', 85)
-
-            # Token watchlist: bypass filtre score
-            if not check_watchlist_token(pool_data) and score < min_score_required:
-                log(f"   ⏭️  {pool_data['name']}: [V3 REJECT] Score insuffisant: {score} < {min_score_required} ({network.upper()})")
-                tokens_rejected += 1
-                continue
-
-            # ============================================
-            # V4.1: VOL/LIQ RATIO FILTER (CRITICAL!)
-            # ============================================
-            volume_24h = pool_data.get('volume_24h', 0)
-            liquidity = pool_data.get('liquidity', 0)
-            if liquidity > 0 and volume_24h > 0:
-                vol_liq_ratio = calculate_vol_liq_ratio(volume_24h, liquidity)
-                is_good_vol_liq, vol_liq_reason = is_optimal_vol_liq(network, vol_liq_ratio)
-                if not is_good_vol_liq:
-                    log(f"   ⏭️  {pool_data['name']}: [V4.1 REJECT] {vol_liq_reason}")
-                    tokens_rejected += 1
-                    continue
-
-            # V4.1: AGE DANGER ZONE FILTER
-            age_hours = pool_data.get('age_hours', 0)
-            if is_in_age_danger_zone(network, age_hours):
-                log(f"   ⏭️  {pool_data['name']}: [V4.1 REJECT] Age {age_hours:.1f}h in danger zone for {network}")
-                tokens_rejected += 1
-                continue
-
-            # V4.1: TIME FILTER (optional - can be disabled)
-            if ENABLE_TIME_FILTERING:
-                from datetime import datetime, timezone
-                current_hour = datetime.now(timezone.utc).hour
-                is_good_time, time_reason = is_optimal_time(current_hour)
-                if not is_good_time:
-                    log(f"   ⏭️  {pool_data['name']}: [V4.1 REJECT] {time_reason}")
-                    tokens_rejected += 1
-                    continue
-
-            # Validation sécurité
-            token_address = pool_data["pool_address"]
-            network = pool_data["network"]
-
-            log(f"\n🔒 Vérification sécurité: {pool_data['name']}")
-            security_result = security_checker.check_token_security(token_address, network)
-
-            # Vérifier si le token passe les critères de sécurité
-            should_send, reason = security_checker.should_send_alert(
-                security_result, min_security_score=50
-            )
+            known = multi_pool_lookup(pool_data) if multi_pool_lookup is not None else None
+            candidates.append({"pool_data": pool_data,
+                               "multi_pool_data": multi_pool_data if known is None else known})
+
+    # 1. Filtres colonnes bon marché, avant momentum et scoring
+    pre_score_stages = [
+        FilterStage("vol_liq", _passes_vol_liq, cost=1),
+        FilterStage("age_danger_zone", _passes_age_danger_zone, cost=1),
+    ]
+    if ENABLE_TIME_FILTERING:
+        pre_score_stages.append(FilterStage("time", _passes_time, cost=1))
+    candidates, tokens_rejected = PRE_SCORE_FILTERS.run(pre_score_stages, candidates, _candidate_label)
+
+    # 2. Pools inchangés depuis le scan précédent: résultat mémorisé
+    reused = []
+    if ENABLE_ANALYSIS_MEMO:
+        unchanged = len(candidates)
+        candidates, reused, memo_rejected = _reuse_analysis(candidates)
+        unchanged -= len(candidates)
+        tokens_rejected += memo_rejected
+
+    # 3. Momentum (depuis API directement) + score avec analyse whale, vectorisé sur les survivants
+    for candidate in candidates:
+        candidate["momentum"] = get_price_momentum_from_api(candidate["pool_data"])
+    scored = score_pools_batch(
+        [c["pool_data"] for c in candidates],
+        [c["momentum"] for c in candidates],
+        [c["multi_pool_data"] for c in candidates],
+    )
+    for candidate, (score, base_score, momentum_bonus, whale_analysis) in zip(candidates, scored):
+        candidate.update(score=score, base_score=base_score, momentum_bonus=momentum_bonus,
+                         whale_analysis=whale_analysis)
+    if on_scored is not None:
+        on_scored(candidates + reused)
+
+    # 4. Filtres sur le score, puis sécurité (réseau) en dernier
+    security_stage = FilterStage("security", _security_predicate(security_checker), cost=1000,
+                                 prepare=_security_prefetch(security_checker))
+    post_score_stages = [
+        FilterStage("whale_dump", _passes_whale_dump, cost=1),
+        FilterStage("score", _passes_network_score, cost=1),
+        FilterStage("opportunity", _passes_opportunity, cost=3, counts_as_rejection=False),
+        security_stage,
+    ]
+
+    def remember_rejection(candidate: Dict, stage: FilterStage, reason: str):
+        # Rejet sécurité non mémorisé: réévalué par le cache SecurityChecker
+        if ENABLE_ANALYSIS_MEMO:
+            rejection = None if stage is security_stage else (stage.name, reason, stage.counts_as_rejection)
+            _remember_analysis(candidate, rejection)
+
+    candidates, post_rejected = POST_SCORE_FILTERS.run(post_score_stages, candidates, _candidate_label,
+                                                       on_reject=remember_rejection)
+    tokens_rejected += post_rejected
+
+    # Pools inchangés non rejetés: sécurité seulement (filtres sur le score déjà passés)
+    if reused:
+        reused, security_rejected = MEMO_SECURITY_FILTERS.run([security_stage], reused, _candidate_label)
+        tokens_rejected += security_rejected
+
+    log(f"🧮 Filtres: {PRE_SCORE_FILTERS.summary()} | {POST_SCORE_FILTERS.summary()}")
+    if ENABLE_ANALYSIS_MEMO:
+        log(f"♻️ Mémo d'analyse: {unchanged} pool(s) inchangé(s) réutilisé(s), {len(analysis_memo)} mémorisé(s)")
+
+    for candidate in candidates:
+        opportunity = _build_opportunity(candidate)
+        if ENABLE_ANALYSIS_MEMO:
+            _remember_analysis(candidate, opportunity=opportunity)
+        opportunities.append(opportunity)
+        log(f"   ✅ Opportunité: {candidate['pool_data']['name']} (Score: {candidate['score']})")
+
+    for candidate in reused:
+        cached = candidate["memo"].opportunity
+        if cached is None:
+            # Rejeté par la sécurité au scan précédent: enrichissements jamais calculés
+            opportunity = _build_opportunity(candidate)
+            _remember_analysis(candidate, opportunity=opportunity)
+        else:
+            # Résistance calculée sur le prix absolu (hors empreinte): recalculée au prix courant
+            opportunity = dict(cached, pool_data=candidate["pool_data"],
+                               security_result=candidate["security_result"],
+                               resistance_data=find_resistance_simple(candidate["pool_data"]))
+        opportunities.append(opportunity)
+        log(f"   ✅ Opportunité (inchangée): {candidate['pool_data']['name']} (Score: {candidate['score']})")
 
-            if not should_send:
-                log(f"⛔ Token rejeté: {reason}")
-                log(f"   Score sécurité: {security_result['security_score']}/100")
-                log(f"   Niveau risque: {security_result['risk_level']}")
-                tokens_rejected += 1
-                continue
+    # Trier par score
+    opportunities.sort(key=lambda x: x["score"], reverse=True)
 
-            log(f"✅ Sécurité validée (Score: {security_result['security_score']}/100)")
+    log(f"\n📊 TOTAL: {len(opportunities)} opportunités détectées")
 
-            # Validation opportunité (filtres V3 + validation classique)
-            is_valid, reason = is_valid_opportunity(pool_data, score)
+    return opportunities, tokens_rejected
 
-            if not is_valid:
-                log(f"   ⏭️  {pool_data['name']}: {reason}")
-                continue
 
-            # Détecter signaux
-            signals = detect_signals(pool_data, momentum, multi_pool_data)
-
-            # Ajouter signaux whale aux signaux existants
-            if whale_analysis['signals']:
-                signals.extend(whale_analysis['signals'])
-
-            # ============================================
-            # V4.1: Calculate Quality Score & Tier
-            # ============================================
-            volume_24h = pool_data.get('volume_24h', 0)
-            liquidity = pool_data.get('liquidity', 0)
-            vol_liq_ratio = calculate_vol_liq_ratio(volume_24h, liquidity) if liquidity > 0 else 0
-            buy_ratio = pool_data.get('buy_ratio', 1.0)
-
-            from datetime import datetime, timezone
-            current_hour = datetime.now(timezone.utc).hour
-
-            quality_result = get_alert_quality_score(
-                network=network,
-                score=score,
-                velocite=pool_data.get('volume_acceleration_1h_vs_6h', 10),  # Use as velocite proxy
-                buy_ratio=buy_ratio,
-                vol_liq_ratio=vol_liq_ratio,
-                hour_utc=current_hour
-            )
+def _build_alert_data(opp: Dict, alert_msg: str, regle5_data: Dict, security_result: Dict,
+                      token_address: str, network: str) -> Dict:
+    """Données de l'alerte pour AlertTracker.save_alert() (prix d'entrée, TPs dynamiques, scores)."""
+    whale_analysis = opp.get("whale_analysis")
+
+    # Préparer les données pour la DB
+    price = opp["pool_data"].get("price_usd", 0)
+    entry_price = price
+
+    # ============================================
+    # V4.0: DYNAMIC TPs based on velocite_pump
+    # ============================================
+    velocite_pump = regle5_data.get('velocite_pump', 10)
+    dynamic_tps = calculate_dynamic_tps(velocite_pump)
+
+    # Use dynamic TPs instead of fixed percentages
+    tp1_percent = dynamic_tps['TP1']
+    tp2_percent = dynamic_tps['TP2']
+    tp3_percent = dynamic_tps['TP3']
+    sl_percent = dynamic_tps['SL']  # Now -12% instead of -10%
+
+    stop_loss_price = price * (1 + sl_percent / 100)
+    tp1_price = price * (1 + tp1_percent / 100)
+    tp2_price = price * (1 + tp2_percent / 100)
+    tp3_price = price * (1 + tp3_percent / 100)
+
+    log(f"   📊 Dynamic TPs (vel={velocite_pump:.1f}): TP1=+{tp1_percent}%, TP2=+{tp2_percent}%, TP3=+{tp3_percent}%, SL={sl_percent}%")
+
+    # Calculate tier for confidence level (CRITICAL for dashboard display)
+    tier = calculate_confidence_tier(opp["pool_data"])
+
+    return {
+        'token_name': opp["pool_data"]["name"],
+        'token_address': token_address,
+        'network': network,
+        'price_at_alert': price,
+        'score': opp["score"],
+        'tier': tier,  # CRITICAL: Added for dashboard filtering
+        'base_score': opp["base_score"],
+        'momentum_bonus': opp["momentum_bonus"],
+        'confidence_score': security_result.get('security_score', 0),
+        'volume_24h': opp["pool_data"].get("volume_24h", 0),
+        'volume_6h': opp["pool_data"].get("volume_6h", 0),
+        'volume_1h': opp["pool_data"].get("volume_1h", 0),
+        'liquidity': opp["pool_data"].get("liquidity", 0),
+        'buys_24h': opp["pool_data"].get("buys_24h", 0),
+        'sells_24h': opp["pool_data"].get("sells_24h", 0),
+        'buy_ratio': opp["pool_data"].get("buy_ratio", 0),
+        'total_txns': opp["pool_data"].get("total_txns", 0),
+        'age_hours': opp["pool_data"].get("age_hours", 0),
+        'volume_acceleration_1h_vs_6h': opp["pool_data"].get("volume_acceleration_1h_vs_6h", 0),
+        'volume_acceleration_6h_vs_24h': opp["pool_data"].get("volume_acceleration_6h_vs_24h", 0),
+        'entry_price': entry_price,
+        'stop_loss_price': stop_loss_price,
+        'stop_loss_percent': sl_percent,  # V4.0: Dynamic SL
+        'tp1_price': tp1_price,
+        'tp1_percent': tp1_percent,  # V4.0: Dynamic TP1
+        'tp2_price': tp2_price,
+        'tp2_percent': tp2_percent,  # V4.0: Dynamic TP2
+        'tp3_price': tp3_price,
+        'tp3_percent': tp3_percent,  # V4.0: Dynamic TP3
+        'alert_message': alert_msg,
+        # RÈGLE 5: Données de vélocité du pump
+        'velocite_pump': regle5_data['velocite_pump'],
+        'type_pump': regle5_data['type_pump'],
+        'decision_tp_tracking': regle5_data['decision_tp_tracking'],
+        'temps_depuis_alerte_precedente': regle5_data['temps_depuis_alerte_precedente'],
+        'is_alerte_suivante': regle5_data['is_alerte_suivante'],
+        'whale_score': (whale_analysis or {}).get('whale_score', 0),
+        'whale_pattern': (whale_analysis or {}).get('pattern', 'NORMAL'),
+        'concentration_risk': (whale_analysis or {}).get('concentration_risk', 'MEDIUM'),
+        'buyers_1h': (whale_analysis or {}).get('buyers_1h', 0),
+        'sellers_1h': (whale_analysis or {}).get('sellers_1h', 0),
+        'avg_buys_per_buyer': (whale_analysis or {}).get('avg_buys_per_buyer', 0),
+        'avg_sells_per_seller': (whale_analysis or {}).get('avg_sells_per_seller', 0),
+        'unique_wallet_ratio': (whale_analysis or {}).get('unique_wallet_ratio', 1.0),
+        'market_cap_usd': opp["pool_data"].get("market_cap_usd", 0),
+        'fdv_usd': opp["pool_data"].get("fdv_usd", 0),
+        # V4.1: Quality scoring
+        'quality_score': opp.get("quality_score", 0),
+        'quality_tier': opp.get("quality_tier", "STANDARD"),
+        'vol_liq_ratio': opp.get("vol_liq_ratio", 0),
+        'security_score': security_result.get('security_score', 0),
+        'lp_lock_percentage': security_result.get('lp_lock_percentage', 0),
+        'buy_tax': security_result.get('buy_tax', 0),
+        'sell_tax': security_result.get('sell_tax', 0),
+        'is_renounced': security_result.get('is_renounced', False),
+        'has_mint_function': security_result.get('has_mint_function', False),
+        'contract_verified': security_result.get('contract_verified', False),
+    }
+
+
+def _on_alert_delivered(token_name: str, score: int, token_address: str, alert_data: Optional[Dict],
+                        alert_tracker, success: bool):
+    """Callback du dispatcher Telegram: sauvegarde en DB + tracking auto + VIP, puis libère la réservation."""
+    try:
+        _save_delivered_alert(token_name, score, alert_data, alert_tracker, success)
+    finally:
+        # Après save_alert(): l'index voit désormais l'alerte (ou l'envoi a échoué)
+        alert_tracker.release_alert(token_address)
+
+
+def _save_delivered_alert(token_name: str, score: int, alert_data: Optional[Dict], alert_tracker, success: bool):
+    if not success:
+        log(f"❌ Échec alerte: {token_name}")
+        return
 
-            log(f"   🏆 Quality: {quality_result['quality_score']}/100 ({quality_result['tier']})")
-
-            opportunities.append({
-                "pool_data": pool_data,
-                "score": score,
-                "base_score": base_score,
-                "momentum_bonus": momentum_bonus,
-                "whale_analysis": whale_analysis,
-                "momentum": momentum,
-                "multi_pool_data": multi_pool_data,
-                "signals": signals,
-                "resistance_data": resistance_data,
-                "security_result": security_result,
-                # V4.1: Quality scoring
-                "quality_score": quality_result['quality_score'],
-                "quality_tier": quality_result['tier'],
-                "quality_factors": quality_result['factors'],
-                "vol_liq_ratio": vol_liq_ratio,
-            })
-
-            log(f"   ✅ Opportunité: {pool_data['name']} (Score: {score})")
+    log(f"✅ Alerte envoyée: {token_name} (Score: {score})")
+    if alert_data is None:
+        return
 
-    # Trier par score
-    opportunities.sort(key=lambda x: x["score"], reverse=True)
+    # SAUVEGARDE EN BASE DE DONNÉES + TRACKING AUTO
+    try:
+        alert_id = alert_tracker.save_alert(alert_data)
+        if alert_id > 0:
+            log(f"   💾 Sauvegardé en DB (ID: {alert_id}) - Tracking auto démarré")
 
-    log(f"\n📊 TOTAL: {len(opportunities)} opportunités détectées")
+            # VALIDATION STRATÉGIE VIP: Vérifier si prête au trade
+            try:
+                check_and_send_vip_alert(alert_data, alert_id, send_telegram_async)
+            except Exception as vip_error:
+                log(f"   ⚠️ Erreur validation VIP: {vip_error}")
+        else:
+            log(f"   ⚠️ Échec sauvegarde DB (token déjà existant?)")
 
-    return opportunities, tokens_rejected
+    except Exception as e:
+        log(f"   ⚠️ Erreur sauvegarde DB: {e}")
 
 
 def process_and_send_alerts(
     opportunities: List[Dict],
     alert_tracker,
-    security_checker
+    security_checker,
+    max_alerts: int = MAX_ALERTS_PER_SCAN
 ) -> Tuple[int, int]:
     """
     Traite les opportunités et envoie les alertes Telegram.
@@ -294,6 +687,7 @@ def process_and_send_alerts(
         opportunities: Liste des opportunités validées
         alert_tracker: Instance AlertTracker pour sauvegarde DB
         security_checker: Instance SecurityChecker pour infos sécurité
+        max_alerts: Alertes max (budget restant du scan en mode pipeline)
 
     Returns:
         (alerts_sent, tokens_rejected)
@@ -310,6 +704,11 @@ def process_and_send_alerts(
         token_address = opp["pool_data"]["pool_address"]
         network = opp["pool_data"]["network"]
 
+        # Alerte déjà en file d'envoi pour ce pool (même lot, re-poll ou pool chaud): pas encore dans l'index
+        if alert_tracker.alert_in_flight(token_address):
+            log(f"⏸️ Alerte déjà en file d'envoi: {opp['pool_data']['name']}")
+            continue
+
         # Vérifier si c'est la première alerte pour ce token
         is_first_alert = not alert_tracker.token_already_alerted(token_address)
 
@@ -344,131 +743,85 @@ def process_and_send_alerts(
         security_info = security_checker.format_security_warning(security_result)
         alert_msg = alert_msg + "\n" + security_info
 
-        if send_telegram(alert_msg):
-            log(f"✅ Alerte envoyée: {opp['pool_data']['name']} (Score: {opp['score']})")
-
-            # SAUVEGARDE EN BASE DE DONNÉES + TRACKING AUTO
-            try:
-                # Préparer les données pour la DB
-                price = opp["pool_data"].get("price_usd", 0)
-                entry_price = price
-
-                # ============================================
-                # V4.0: DYNAMIC TPs based on velocite_pump
-                # ============================================
-                velocite_pump = regle5_data.get('velocite_pump', 10)
-                dynamic_tps = calculate_dynamic_tps(velocite_pump)
-
-                # Use dynamic TPs instead of fixed percentages
-                tp1_percent = dynamic_tps['TP1']
-                tp2_percent = dynamic_tps['TP2']
-                tp3_percent = dynamic_tps['TP3']
-                sl_percent = dynamic_tps['SL']  # Now -12% instead of -10%
-
-                stop_loss_price = price * (1 + sl_percent / 100)
-                tp1_price = price * (1 + tp1_percent / 100)
-                tp2_price = price * (1 + tp2_percent / 100)
-                tp3_price = price * (1 + tp3_percent / 100)
-
-                log(f"   📊 Dynamic TPs (vel={velocite_pump:.1f}): TP1=+{tp1_percent}%, TP2=+{tp2_percent}%, TP3=+{tp3_percent}%, SL={sl_percent}%")
-
-                # Calculate tier for confidence level (CRITICAL for dashboard display)
-                tier = calculate_confidence_tier(opp["pool_data"])
-
-                alert_data = {
-                    'token_name': opp["pool_data"]["name"],
-                    'token_address': token_address,
-                    'network': network,
-                    'price_at_alert': price,
-                    'score': opp["score"],
-                    'tier': tier,  # CRITICAL: Added for dashboard filtering
-                    'base_score': opp["base_score"],
-                    'momentum_bonus': opp["momentum_bonus"],
-                    'confidence_score': security_result.get('security_score', 0),
-                    'volume_24h': opp["pool_data"].get("volume_24h", 0),
-                    'volume_6h': opp["pool_data"].get("volume_6h", 0),
-                    'volume_1h': opp["pool_data"].get("volume_1h", 0),
-                    'liquidity': opp["pool_data"].get("liquidity", 0),
-                    'buys_24h': opp["pool_data"].get("buys_24h", 0),
-                    'sells_24h': opp["pool_data"].get("sells_24h", 0),
-                    'buy_ratio': opp["pool_data"].get("buy_ratio", 0),
-                    'total_txns': opp["pool_data"].get("total_txns", 0),
-                    'age_hours': opp["pool_data"].get("age_hours", 0),
-                    'volume_acceleration_1h_vs_6h': opp["pool_data"].get("volume_acceleration_1h_vs_6h", 0),
-                    'volume_acceleration_6h_vs_24h': opp["pool_data"].get("volume_acceleration_6h_vs_24h", 0),
-                    'entry_price': entry_price,
-                    'stop_loss_price': stop_loss_price,
-                    'stop_loss_percent': sl_percent,  # V4.0: Dynamic SL
-                    'tp1_price': tp1_price,
-                    'tp1_percent': tp1_percent,  # V4.0: Dynamic TP1
-                    'tp2_price': tp2_price,
-                    'tp2_percent': tp2_percent,  # V4.0: Dynamic TP2
-                    'tp3_price': tp3_price,
-                    'tp3_percent': tp3_percent,  # V4.0: Dynamic TP3
-                    'alert_message': alert_msg,
-                    # RÈGLE 5: Données de vélocité du pump
-                    'velocite_pump': regle5_data['velocite_pump'],
-                    'type_pump': regle5_data['type_pump'],
-                    'decision_tp_tracking': regle5_data['decision_tp_tracking'],
-                    'temps_depuis_alerte_precedente': regle5_data['temps_depuis_alerte_precedente'],
-                    'is_alerte_suivante': regle5_data['is_alerte_suivante'],
-                    'whale_score': (whale_analysis or {}).get('whale_score', 0),
-                    'whale_pattern': (whale_analysis or {}).get('pattern', 'NORMAL'),
-                    'concentration_risk': (whale_analysis or {}).get('concentration_risk', 'MEDIUM'),
-                    'buyers_1h': (whale_analysis or {}).get('buyers_1h', 0),
-                    'sellers_1h': (whale_analysis or {}).get('sellers_1h', 0),
-                    'avg_buys_per_buyer': (whale_analysis or {}).get('avg_buys_per_buyer', 0),
-                    'avg_sells_per_seller': (whale_analysis or {}).get('avg_sells_per_seller', 0),
-                    'unique_wallet_ratio': (whale_analysis or {}).get('unique_wallet_ratio', 1.0),
-                    'market_cap_usd': opp["pool_data"].get("market_cap_usd", 0),
-                    'fdv_usd': opp["pool_data"].get("fdv_usd", 0),
-                    # V4.1: Quality scoring
-                    'quality_score': opp.get("quality_score", 0),
-                    'quality_tier': opp.get("quality_tier", "STANDARD"),
-                    'vol_liq_ratio': opp.get("vol_liq_ratio", 0),
-                    'security_score': security_result.get('security_score', 0),
-                    'lp_lock_percentage': security_result.get('lp_lock_percentage', 0),
-                    'buy_tax': security_result.get('buy_tax', 0),
-                    'sell_tax': security_result.get('sell_tax', 0),
-                    'is_renounced': security_result.get('is_renounced', False),
-                    'has_mint_function': security_result.get('has_mint_function', False),
-                    'contract_verified': security_result.get('contract_verified', False),
-                }
-
-                alert_id = alert_tracker.save_alert(alert_data)
-                if alert_id > 0:
-                    log(f"   💾 Sauvegardé en DB (ID: {alert_id}) - Tracking auto démarré")
-
-                    # VALIDATION STRATÉGIE VIP: Vérifier si prête au trade
-                    try:
-                        check_and_send_vip_alert(alert_data, alert_id, send_telegram)
-                    except Exception as vip_error:
-                        log(f"   ⚠️ Erreur validation VIP: {vip_error}")
-                else:
-                    log(f"   ⚠️ Échec sauvegarde DB (token déjà existant?)")
-
-            except Exception as e:
-                log(f"   ⚠️ Erreur sauvegarde DB: {e}")
+        # Sauvegarde DB + validation VIP après livraison, dans le thread d'envoi Telegram:
+        # le scan n'attend ni le réseau ni l'écriture SQLite
+        try:
+            alert_data = _build_alert_data(opp, alert_msg, regle5_data, security_result, token_address, network)
+        except Exception as e:
+            log(f"   ⚠️ Erreur préparation sauvegarde DB: {e}")
+            alert_data = None
 
+        # Réservation avant la mise en file: token_already_alerted / anti-spam ne voient l'alerte qu'après save_alert()
+        if not alert_tracker.reserve_alert(token_address):
+            log(f"⏸️ Alerte déjà en file d'envoi: {opp['pool_data']['name']}")
+            continue
+        on_delivered = partial(_on_alert_delivered, opp["pool_data"]["name"], opp["score"], token_address,
+                               alert_data, alert_tracker)
+        if send_telegram_async(alert_msg, callback=on_delivered):
+            log(f"📤 Alerte en file d'envoi: {opp['pool_data']['name']} (Score: {opp['score']})")
             alerts_sent += 1
         else:
-            log(f"❌ Échec alerte: {opp['pool_data']['name']}")
+            log(f"❌ Échec alerte (file Telegram pleine): {opp['pool_data']['name']}")
 
-        if alerts_sent >= MAX_ALERTS_PER_SCAN:
-            log(f"⚠️ Limite {MAX_ALERTS_PER_SCAN} alertes atteinte")
+        if alerts_sent >= max_alerts:
+            log(f"⚠️ Limite {max_alerts} alertes atteinte")
             break
 
-        time.sleep(1)
-
     return alerts_sent, tokens_rejected
 
 
-def track_active_alerts(alert_tracker) -> int:
+def _fetch_active_pools(alerts: List[Dict], all_pools: Optional[List[Dict]] = None) -> Dict[Tuple[str, str], Mapping]:
+    """
+    Données actuelles des pools alertés, en un minimum d'appels:
+    - pools déjà collectés par ce scan (all_pools): coût nul
+    - les autres via /pools/multi, groupés par réseau (ACTIVE_TRACKING_BATCH_SIZE par requête)
+
+    Returns:
+        {(network, adresse en minuscules): pool_data}
+    """
+    # Clé de correspondance en minuscules; requêtes avec la casse d'origine (adresses Solana base58)
+    wanted = {(alert['network'], alert['token_address'].lower()): alert['token_address'] for alert in alerts}
+
+    pools = {}
+    for pool_data in all_pools or []:
+        key = (pool_data.get('network'), (pool_data.get('pool_address') or '').lower())
+        if key in wanted:
+            pools[key] = pool_data
+    reused = len(pools)
+
+    missing: Dict[str, List[str]] = {}
+    for key in wanted.keys() - pools.keys():
+        missing.setdefault(key[0], []).append(wanted[key])
+
+    if missing:
+        jobs = list(missing.items())
+        with ThreadPoolExecutor(max_workers=min(COLLECTION_MAX_WORKERS, len(jobs))) as executor:
+            for (network, _), fetched in zip(jobs, executor.map(lambda job: get_pools_by_addresses(*job), jobs)):
+                for address, pool_data in fetched.items():
+                    pools[(network, address)] = pool_data
+
+    log(f"   📦 {len(wanted)} pools: {reused} repris du scan, {len(pools) - reused} via /pools/multi")
+    return pools
+
+
+def _on_update_delivered(token_name: str, success: bool):
+    """Callback du dispatcher Telegram pour les mises à jour du tracking actif."""
+    if success:
+        log(f"   ✅ Mise à jour envoyée pour {token_name}")
+    else:
+        log(f"   ❌ Échec envoi mise à jour: {token_name}")
+
+
+def track_active_alerts(alert_tracker, all_pools: Optional[List[Dict]] = None) -> int:
     """
     Tracking actif des alertes existantes pour détecter TP/SL.
 
+    Les pools sont rafraîchis en bloc (pools du scan + /pools/multi) et les
+    prix MAX sont écrits en une seule transaction.
+
     Args:
         alert_tracker: Instance AlertTracker
+        all_pools: Pools collectés par ce scan (réutilisés sans appel API)
 
     Returns:
         Nombre de mises à jour envoyées
@@ -481,39 +834,51 @@ def track_active_alerts(alert_tracker) -> int:
     active_alerts = alert_tracker.get_active_alerts(max_age_hours=ACTIVE_TRACKING_MAX_AGE_HOURS)
     log(f"   🔍 {len(active_alerts)} alertes actives à tracker (< {ACTIVE_TRACKING_MAX_AGE_HOURS}h)")
 
-    updates_sent = 0
+    # Vérifier cooldown (éviter spam)
+    due_alerts = []
     for alert in active_alerts:
         try:
-            alert_id = alert['id']
-            token_name = alert['token_name']
-            pool_address = alert['token_address']
-            network = alert['network']
-            created_at_str = alert['created_at']
-
-            # Vérifier cooldown (éviter spam)
-            created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
+            created_at = datetime.fromisoformat(alert['created_at'].replace('Z', '+00:00'))
             now = datetime.now(created_at.tzinfo) if created_at.tzinfo else datetime.now()
             minutes_elapsed = (now - created_at).total_seconds() / 60
 
             # Vérifier si dernière mise à jour était il y a moins de COOLDOWN minutes
-            if minutes_elapsed < ACTIVE_TRACKING_UPDATE_COOLDOWN_MINUTES:
-                continue  # Trop récent, skip
+            if minutes_elapsed >= ACTIVE_TRACKING_UPDATE_COOLDOWN_MINUTES:
+                due_alerts.append(alert)
+        except Exception as e:
+            log(f"   ❌ Erreur tracking {alert.get('token_name', 'unknown')}: {e}")
 
-            # Récupérer données actuelles du pool
-            pool_data = get_pool_by_address(network, pool_address)
+    if not due_alerts:
+        log(f"   📊 Tracking terminé: 0 mises à jour envoyées")
+        return 0
 
-            if not pool_data or not isinstance(pool_data, dict):
-                # Pool plus disponible (delisted, erreur API, etc.)
-                log(f"   ⚠️ Pool data invalide pour {token_name}: {type(pool_data)}")
-                continue
+    # Récupérer données actuelles des pools (groupé)
+    pools = _fetch_active_pools(due_alerts, all_pools)
 
-            current_price = pool_data.get('price_usd', 0)
+    tracked = []
+    for alert in due_alerts:
+        pool_data = pools.get((alert['network'], alert['token_address'].lower()))
 
-            if current_price <= 0:
-                continue
+        if not pool_data or not isinstance(pool_data, Mapping):
+            # Pool plus disponible (delisted, erreur API, etc.)
+            log(f"   ⚠️ Pool data invalide pour {alert['token_name']}: {type(pool_data)}")
+            continue
+
+        current_price = pool_data.get('price_usd', 0)
+
+        if current_price <= 0:
+            continue
+
+        tracked.append((alert, pool_data, current_price))
 
-            # Mettre à jour le prix MAX en temps réel
-            alert_tracker.update_price_max_realtime(alert_id, current_price)
+    # Mettre à jour le prix MAX en temps réel (une transaction pour toutes les alertes)
+    alert_tracker.update_prices_max_realtime({alert['id']: price for alert, _, price in tracked})
+
+    updates_sent = 0
+    for alert, pool_data, current_price in tracked:
+        try:
+            token_name = alert['token_name']
+            pool_address = alert['token_address']
 
             # Vérifier si on doit envoyer une mise à jour Telegram
             should_send_now, reason = should_send_alert(
@@ -546,21 +911,18 @@ def track_active_alerts(alert_tracker) -> int:
                     log(f"   Traceback: {traceback.format_exc()}")
                     continue  # Skip cette alerte
 
-                # Envoyer via Telegram
-                success = send_telegram(alert_msg)
-
-                if success:
+                # Envoyer via Telegram (file d'envoi: pas d'attente réseau ni de pause entre mises à jour)
+                on_delivered = partial(_on_update_delivered, token_name)
+                if send_telegram_async(alert_msg, callback=on_delivered):
                     updates_sent += 1
-                    log(f"   ✅ Mise à jour envoyée pour {token_name}")
+                    log(f"   📤 Mise à jour en file d'envoi pour {token_name}")
 
                     # Limiter le nombre de mises à jour par scan
                     if updates_sent >= 5:  # Max 5 mises à jour par scan
                         log(f"   ⚠️ Limite 5 mises à jour atteinte")
                         break
                 else:
-                    log(f"   ❌ Échec envoi mise à jour: {token_name}")
-
-                time.sleep(1)  # Pause entre mises à jour
+                    log(f"   ❌ Échec envoi mise à jour (file Telegram pleine): {token_name}")
 
         except Exception as e:
             log(f"   ❌ Erreur tracking {alert.get('token_name', 'unknown')}: {e}")
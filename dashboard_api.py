@@ -6,9 +6,11 @@ Endpoints:
 - GET /api/stats - Statistiques globales
 - GET /api/networks - Stats par réseau
 - GET /api/alerts/:id - Détail d'une alerte
+- GET /metrics - Métriques du scanner (format Prometheus)
+- GET /api/security/:network/:address - Dernier verdict sécurité en cache
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, jsonify, request, send_from_directory, Response
 from flask_cors import CORS
 import sqlite3
 import json
@@ -16,6 +18,11 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import os
 
+from utils.metrics import load_metrics_snapshot, render_prometheus
+from data.alerts_schema import ensure_alerts_schema
+from data.db import connect
+from data.security_cache import load_security_verdict
+
 app = Flask(__name__)
 CORS(app)  # Permettre les requêtes depuis le frontend
 
@@ -34,10 +41,15 @@ if not DB_PATH:
         DB_PATH = os.path.join(BASE_DIR, 'alerts_history.db')
 
 def get_db_connection():
-    """Connexion à la base de données SQLite."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Retourner des dictionnaires
-    return conn
+    """Connexion lecture seule à la base SQLite (WAL: n'attend pas les écritures du scanner)."""
+    return connect(DB_PATH, readonly=True, row_factory=sqlite3.Row)  # Row: retourner des dictionnaires
+
+# Filtres et tris sur created_at_epoch: migrer la base si le scanner ne l'a pas encore fait
+try:
+    for operation in ensure_alerts_schema(DB_PATH):
+        print(f"✅ Schéma alerts: {operation}")
+except sqlite3.Error as e:
+    print(f"⚠️ Migration du schéma alerts impossible ({DB_PATH}): {e}")
 
 def parse_alert_data(alert_row):
     """Parse une alerte de la DB en dict exploitable."""
@@ -142,6 +154,20 @@ def health():
     """Health check endpoint."""
     return jsonify({'status': 'ok', 'timestamp': datetime.now().isoformat()})
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Métriques du scanner (snapshot écrit en fin de scan) au format texte Prometheus."""
+    body = render_prometheus(load_metrics_snapshot(DB_PATH))
+    return Response(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/security/<network>/<address>', methods=['GET'])
+def get_security_verdict(network, address):
+    """Dernier verdict sécurité calculé par le scanner (cache partagé, aucun appel API)."""
+    verdict = load_security_verdict(network, address)
+    if verdict is None:
+        return jsonify({'error': 'Aucun verdict en cache pour ce token'}), 404
+    return jsonify(verdict)
+
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
     """
@@ -171,9 +197,9 @@ def get_alerts():
         params = []
 
         # Filtre par date
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        query += " AND created_at >= ?"
-        params.append(cutoff_date)
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
+        query += " AND created_at_epoch >= ?"
+        params.append(cutoff_epoch)
 
         # Filtres optionnels
         if network:
@@ -189,7 +215,7 @@ def get_alerts():
             params.append(min_score)
 
         # Tri et pagination
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        query += " ORDER BY created_at_epoch DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
         cursor = conn.execute(query, params)
@@ -221,7 +247,7 @@ def get_stats():
     """
     try:
         days = request.args.get('days', type=int, default=7)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         conn = get_db_connection()
 
@@ -244,8 +270,8 @@ def get_stats():
                 AVG(score) as avg_score,
                 AVG(liquidity) as avg_liq
             FROM alerts
-            WHERE created_at >= ?
-        """, [cutoff_date])
+            WHERE created_at_epoch >= ?
+        """, [cutoff_epoch])
 
         row = cursor.fetchone()
         stats['total_alerts'] = row['total']
@@ -256,9 +282,9 @@ def get_stats():
         cursor = conn.execute("""
             SELECT tier, COUNT(*) as count
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY tier
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['by_tier'][row['tier']] = row['count']
@@ -267,9 +293,9 @@ def get_stats():
         cursor = conn.execute("""
             SELECT network, COUNT(*) as count, AVG(score) as avg_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY network
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['by_network'][row['network']] = {
@@ -289,9 +315,9 @@ def get_stats():
                 END as range,
                 COUNT(*) as count
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY range
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['score_distribution'][row['range']] = row['count']
@@ -303,10 +329,10 @@ def get_stats():
                 COUNT(*) as count,
                 AVG(score) as avg_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY DATE(created_at)
             ORDER BY day DESC
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         stats['alerts_per_day'] = [
             {
@@ -329,7 +355,7 @@ def get_networks_stats():
     """Statistiques détaillées par réseau."""
     try:
         days = request.args.get('days', type=int, default=7)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         conn = get_db_connection()
 
@@ -343,10 +369,10 @@ def get_networks_stats():
                 MIN(score) as min_score,
                 MAX(score) as max_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY network
             ORDER BY total DESC
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         networks = []
         for row in cursor.fetchall():
@@ -402,7 +428,7 @@ def get_recent_alerts():
 
         cursor = conn.execute("""
             SELECT * FROM alerts
-            ORDER BY created_at DESC
+            ORDER BY created_at_epoch DESC
             LIMIT ?
         """, [limit])
 
@@ -423,7 +449,7 @@ def get_tracking_stats():
     """
     try:
         days = request.args.get('days', type=int, default=7)
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         conn = get_db_connection()
 
@@ -459,8 +485,8 @@ def get_tracking_stats():
 
         # Total alerts in period
         cursor = conn.execute("""
-            SELECT COUNT(*) FROM alerts WHERE created_at >= ?
-        """, [cutoff_date])
+            SELECT COUNT(*) FROM alerts WHERE created_at_epoch >= ?
+        """, [cutoff_epoch])
         stats['total_alerts'] = cursor.fetchone()[0]
 
         if stats['total_alerts'] == 0:
@@ -475,8 +501,8 @@ def get_tracking_stats():
             try:
                 cursor = conn.execute(f"""
                     SELECT COUNT(*) FROM alerts
-                    WHERE created_at >= ? AND {col} IS NOT NULL
-                """, [cutoff_date])
+                    WHERE created_at_epoch >= ? AND {col} IS NOT NULL
+                """, [cutoff_epoch])
                 stats['tracking_coverage'][col] = cursor.fetchone()[0]
             except Exception:
                 stats['tracking_coverage'][col] = 0
@@ -486,9 +512,9 @@ def get_tracking_stats():
             cursor = conn.execute("""
                 SELECT final_outcome, COUNT(*) as count
                 FROM alerts
-                WHERE created_at >= ? AND final_outcome IS NOT NULL
+                WHERE created_at_epoch >= ? AND final_outcome IS NOT NULL
                 GROUP BY final_outcome
-            """, [cutoff_date])
+            """, [cutoff_epoch])
             for row in cursor.fetchall():
                 if row[0] in stats['outcomes']:
                     stats['outcomes'][row[0]] = row[1]
@@ -499,8 +525,8 @@ def get_tracking_stats():
         try:
             cursor = conn.execute("""
                 SELECT COUNT(*) FROM alerts
-                WHERE created_at >= ? AND (final_outcome IS NULL OR final_outcome = '')
-            """, [cutoff_date])
+                WHERE created_at_epoch >= ? AND (final_outcome IS NULL OR final_outcome = '')
+            """, [cutoff_epoch])
             stats['outcomes']['ONGOING'] = cursor.fetchone()[0]
         except Exception:
             pass
@@ -510,9 +536,9 @@ def get_tracking_stats():
             cursor = conn.execute("""
                 SELECT highest_tp_reached, COUNT(*) as count
                 FROM alerts
-                WHERE created_at >= ? AND highest_tp_reached IS NOT NULL
+                WHERE created_at_epoch >= ? AND highest_tp_reached IS NOT NULL
                 GROUP BY highest_tp_reached
-            """, [cutoff_date])
+            """, [cutoff_epoch])
             for row in cursor.fetchall():
                 if row[0] in stats['tp_distribution']:
                     stats['tp_distribution'][row[0]] = row[1]
@@ -523,8 +549,8 @@ def get_tracking_stats():
         try:
             cursor = conn.execute("""
                 SELECT COUNT(*) FROM alerts
-                WHERE created_at >= ? AND is_closed = 1
-            """, [cutoff_date])
+                WHERE created_at_epoch >= ? AND is_closed = 1
+            """, [cutoff_epoch])
             stats['closed_alerts'] = cursor.fetchone()[0]
             stats['open_alerts'] = stats['total_alerts'] - stats['closed_alerts']
         except Exception:
@@ -534,8 +560,8 @@ def get_tracking_stats():
         try:
             cursor = conn.execute("""
                 SELECT COUNT(*) FROM alerts
-                WHERE created_at >= ? AND sl_hit = 1
-            """, [cutoff_date])
+                WHERE created_at_epoch >= ? AND sl_hit = 1
+            """, [cutoff_epoch])
             stats['sl_hit_count'] = cursor.fetchone()[0]
         except Exception:
             pass
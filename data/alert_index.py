@@ -0,0 +1,157 @@
+"""
+Index mémoire des tokens alertés
+
+Remplace, dans la boucle d'alertes du scanner, les requêtes SQL par candidat
+(token_already_alerted, count_alerts_for_token, get_last_alert_for_token):
+- Chargé une fois au démarrage depuis la table alerts
+- Maintenu par AlertTracker.save_alert() (seul point d'insertion des alertes)
+- Par token: nombre total d'alertes, dernière alerte, compteurs par tranche
+  de ALERT_INDEX_BUCKET_SECONDS sur ALERT_INDEX_RETENTION_HOURS
+- Alertes "en vol": réservées avant la mise en file Telegram, libérées après
+  save_alert() (ou échec d'envoi); une alerte en file mais pas encore
+  sauvegardée bloque déjà un second envoi pour le même token
+
+Le comptage récent est arrondi à la tranche: une alerte jusqu'à
+ALERT_INDEX_BUCKET_SECONDS plus ancienne que la fenêtre peut être comptée
+(l'anti-rug est au pire légèrement plus strict que la requête SQL).
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from config.settings import ALERT_INDEX_BUCKET_SECONDS, ALERT_INDEX_RETENTION_HOURS
+
+# Colonnes retournées par get_last_alert_for_token()
+LAST_ALERT_COLUMNS = (
+    'id', 'token_name', 'token_address', 'network',
+    'price_at_alert', 'score', 'base_score', 'momentum_bonus',
+    'confidence_score', 'volume_24h', 'volume_6h', 'volume_1h',
+    'liquidity', 'buys_24h', 'sells_24h', 'buy_ratio',
+    'total_txns', 'age_hours', 'created_at',
+    'entry_price', 'stop_loss_price', 'stop_loss_percent',
+    'tp1_price', 'tp1_percent', 'tp2_price', 'tp2_percent',
+    'tp3_price', 'tp3_percent',
+    'volume_acceleration_1h_vs_6h', 'volume_acceleration_6h_vs_24h',
+    'velocite_pump', 'type_pump', 'decision_tp_tracking',
+    'temps_depuis_alerte_precedente', 'is_alerte_suivante',
+)
+
+
+class AlertIndex:
+    """token_address -> nombre d'alertes, dernière alerte, compteurs récents par tranche."""
+
+    def __init__(self, bucket_seconds: int = ALERT_INDEX_BUCKET_SECONDS,
+                 retention_hours: float = ALERT_INDEX_RETENTION_HOURS):
+        self.bucket_seconds = bucket_seconds
+        self.retention_hours = retention_hours
+        self._counts: Dict[str, int] = {}
+        self._last: Dict[str, Dict] = {}
+        self._buckets: Dict[str, Dict[int, int]] = {}
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def load(self, conn) -> int:
+        """
+        (Re)charge l'index depuis la table alerts en 3 requêtes.
+
+        Returns:
+            Nombre de tokens indexés
+        """
+        counts = dict(conn.execute(
+            "SELECT token_address, COUNT(*) FROM alerts GROUP BY token_address"
+        ).fetchall())
+
+        # Dernière alerte par token (même ordre que l'ancienne requête: created_at DESC)
+        rows = conn.execute(f"""
+            SELECT {', '.join(LAST_ALERT_COLUMNS)} FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY token_address ORDER BY created_at DESC, id DESC
+                ) AS rn
+                FROM alerts
+            ) WHERE rn = 1
+        """).fetchall()
+        last = {row[2]: dict(zip(LAST_ALERT_COLUMNS, row)) for row in rows}
+
+        recent = conn.execute(
+            "SELECT token_address, created_at_epoch FROM alerts WHERE created_at_epoch >= ?",
+            (int(time.time() - self.retention_hours * 3600),),
+        ).fetchall()
+        buckets: Dict[str, Dict[int, int]] = {}
+        for token_address, alerted_at in recent:
+            token_buckets = buckets.setdefault(token_address, {})
+            bucket = int(alerted_at // self.bucket_seconds)
+            token_buckets[bucket] = token_buckets.get(bucket, 0) + 1
+
+        with self._lock:
+            self._counts, self._last, self._buckets = counts, last, buckets
+        return len(counts)
+
+    def add(self, row: Dict, alerted_at: Optional[float] = None):
+        """Enregistre une alerte insérée (row: colonnes de la table alerts, dont id et created_at)."""
+        token_address = row['token_address']
+        alerted_at = time.time() if alerted_at is None else alerted_at
+        bucket = int(alerted_at // self.bucket_seconds)
+        with self._lock:
+            self._counts[token_address] = self._counts.get(token_address, 0) + 1
+            self._last[token_address] = {column: row.get(column) for column in LAST_ALERT_COLUMNS}
+            token_buckets = self._buckets.setdefault(token_address, {})
+            token_buckets[bucket] = token_buckets.get(bucket, 0) + 1
+            self._prune(token_address, alerted_at)
+
+    def has(self, token_address: str) -> bool:
+        return token_address in self._counts
+
+    def count(self, token_address: str) -> int:
+        return self._counts.get(token_address, 0)
+
+    def count_recent(self, token_address: str, hours: float, now: Optional[float] = None) -> Optional[int]:
+        """
+        Alertes du token sur les `hours` dernières heures.
+
+        Returns:
+            Nombre d'alertes, ou None si la fenêtre dépasse la rétention (repli SQL)
+        """
+        if hours > self.retention_hours:
+            return None
+        now = time.time() if now is None else now
+        first_bucket = int((now - hours * 3600) // self.bucket_seconds)
+        with self._lock:
+            self._prune(token_address, now)
+            token_buckets = self._buckets.get(token_address, {})
+            return sum(count for bucket, count in token_buckets.items() if bucket >= first_bucket)
+
+    def last_alert(self, token_address: str) -> Optional[Dict]:
+        """Copie de la dernière alerte du token (None si jamais alerté)."""
+        last = self._last.get(token_address)
+        return dict(last) if last is not None else None
+
+    def reserve(self, token_address: str) -> bool:
+        """Marque une alerte en vol pour le token. False si une alerte est déjà en vol."""
+        with self._lock:
+            if token_address in self._in_flight:
+                return False
+            self._in_flight.add(token_address)
+            return True
+
+    def release(self, token_address: str):
+        """Fin de l'alerte en vol (sauvegardée dans l'index ou abandonnée)."""
+        with self._lock:
+            self._in_flight.discard(token_address)
+
+    def in_flight(self, token_address: str) -> bool:
+        return token_address in self._in_flight
+
+    def _prune(self, token_address: str, now: float):
+        """Supprime les tranches hors rétention d'un token (appelé sous self._lock)."""
+        token_buckets = self._buckets.get(token_address)
+        if not token_buckets:
+            return
+        oldest = int((now - self.retention_hours * 3600) // self.bucket_seconds)
+        for bucket in [b for b in token_buckets if b < oldest]:
+            del token_buckets[bucket]
+        if not token_buckets:
+            del self._buckets[token_address]
+
+    def __len__(self) -> int:
+        return len(self._counts)
@@ -0,0 +1,113 @@
+"""
+Cache d'état par alerte pour les mises à jour de prix MAX temps réel
+
+Avant: chaque pool tracké coûtait 3 SELECT (entry_price, minutes écoulées,
+MAX(highest_price)) + 1 upsert, à chaque scan. Ici, par alert_id:
+- entry_price, created_at_epoch, plus haut / plus bas courants
+- Hydraté une seule fois par alerte (une requête groupée pour toutes les
+  alertes inconnues), puis maintenu en mémoire (save_alert, checkpoints)
+- Dernière écriture retenue: un même (minute, prix) n'est pas réécrit
+  quand deux étapes du scan voient le même pool
+
+La mise à jour devient une comparaison Python + un executemany partagé.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class AlertState:
+    entry_price: float
+    created_epoch: int
+    max_price: Optional[float] = None
+    min_price: Optional[float] = None
+    last_write: Optional[Tuple[int, float]] = None
+
+    def observe(self, price: float):
+        self.max_price = price if self.max_price is None else max(self.max_price, price)
+        self.min_price = price if self.min_price is None else min(self.min_price, price)
+
+
+class AlertStateCache:
+    """alert_id -> AlertState, thread-safe (scanner + scheduler de tracking)."""
+
+    def __init__(self):
+        self._states: Dict[int, AlertState] = {}
+        self._unknown = set()  # IDs absents de la table alerts (pas de requête à chaque scan)
+        self._lock = threading.Lock()
+
+    def hydrate(self, conn, alert_ids: Iterable[int]) -> int:
+        """Charge en une requête les alertes pas encore en cache. Retourne le nombre chargé."""
+        with self._lock:
+            missing = [alert_id for alert_id in set(alert_ids)
+                       if alert_id not in self._states and alert_id not in self._unknown]
+        if not missing:
+            return 0
+
+        placeholders = ", ".join("?" * len(missing))
+        rows = conn.execute(f"""
+            SELECT a.id, a.entry_price, a.created_at_epoch,
+                   (SELECT MAX(highest_price) FROM price_tracking p WHERE p.alert_id = a.id),
+                   (SELECT MIN(lowest_price) FROM price_tracking p WHERE p.alert_id = a.id)
+            FROM alerts a WHERE a.id IN ({placeholders})
+        """, missing).fetchall()
+
+        with self._lock:
+            for alert_id, entry_price, created_epoch, max_price, min_price in rows:
+                self._states.setdefault(alert_id, AlertState(entry_price, created_epoch, max_price, min_price))
+            self._unknown.update(set(missing) - {row[0] for row in rows})
+        return len(rows)
+
+    def add(self, alert_id: int, entry_price: float, created_epoch: int):
+        """Nouvelle alerte (save_alert)."""
+        with self._lock:
+            self._states[alert_id] = AlertState(entry_price, created_epoch)
+            self._unknown.discard(alert_id)
+
+    def observe(self, alert_id: int, price: float):
+        """Prix écrit par un autre chemin (checkpoints du scheduler)."""
+        with self._lock:
+            state = self._states.get(alert_id)
+            if state is not None:
+                state.observe(price)
+
+    def get(self, alert_id: int) -> Optional[AlertState]:
+        return self._states.get(alert_id)
+
+    def build_realtime_rows(self, prices: Dict[int, float], now: float) -> Tuple[List[tuple], int]:
+        """
+        Lignes price_tracking (alert_id, minutes, prix, roi, plus haut, plus bas) à upserter.
+
+        Returns:
+            (lignes à écrire, nombre d'alertes déjà à jour ignorées)
+        """
+        rows = []
+        unchanged = 0
+        with self._lock:
+            for alert_id, current_price in prices.items():
+                state = self._states.get(alert_id)
+                if state is None or not state.entry_price:
+                    continue
+
+                minutes_elapsed = int((now - state.created_epoch) // 60)
+                if state.last_write == (minutes_elapsed, current_price):
+                    unchanged += 1
+                    continue
+
+                state.observe(current_price)
+                state.last_write = (minutes_elapsed, current_price)
+                roi = ((current_price - state.entry_price) / state.entry_price) * 100
+                rows.append((
+                    alert_id,
+                    minutes_elapsed,  # Minutes exactes depuis création
+                    current_price,
+                    roi,
+                    state.max_price,
+                    current_price  # lowest_price initialisé au prix actuel
+                ))
+        return rows, unchanged
+
+    def __len__(self) -> int:
+        return len(self._states)
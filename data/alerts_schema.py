@@ -0,0 +1,121 @@
+"""
+Migration des index de la table alerts (colonne epoch + index composites)
+
+Les filtres temporels `datetime(created_at) >= datetime('now', ...)`
+enveloppent la colonne dans une fonction: SQLite ne peut pas utiliser d'index
+et parcourt toute la table. On ajoute:
+- created_at_epoch INTEGER (secondes Unix UTC), rempli par trigger à
+  l'insertion, quel que soit le process qui insère
+- Index composites (network|token_address|tier, created_at_epoch) pour les
+  filtres du dashboard, du scanner et du cron
+- Index partiel des alertes ouvertes (cron de prix: timestamp + is_closed)
+
+Idempotent: appelé par AlertTracker.create_tables(), par
+verify_and_upgrade_database_schema.py et au démarrage des APIs dashboard
+(ensure_alerts_schema: leurs requêtes filtrent sur created_at_epoch, même si
+le scanner n'a pas encore ouvert la base).
+"""
+
+import os
+import sqlite3
+from typing import List
+
+from data.db import connect
+
+EPOCH_COLUMN = "created_at_epoch"
+
+ALERT_INDEXES = (
+    ("idx_alerts_created_at_epoch", "alerts(created_at_epoch)"),
+    ("idx_alerts_network_epoch", "alerts(network, created_at_epoch)"),
+    ("idx_alerts_token_address_epoch", "alerts(token_address, created_at_epoch)"),
+    ("idx_alerts_tier_epoch", "alerts(tier, created_at_epoch)"),
+)
+
+# Même expression que les requêtes du cron (condition requise pour que SQLite utilise l'index partiel)
+OPEN_ALERTS_WHERE = "is_closed IS NULL OR is_closed = 0"
+
+
+def _columns(conn: sqlite3.Connection) -> set:
+    return {row[1] for row in conn.execute("PRAGMA table_info(alerts)")}
+
+
+def upgrade_alerts_schema(conn: sqlite3.Connection) -> List[str]:
+    """
+    Ajoute la colonne epoch, son trigger et les index manquants (sans commit).
+
+    Returns:
+        Liste des opérations effectuées (vide si le schéma est déjà à jour)
+    """
+    applied = []
+    columns = _columns(conn)
+
+    if EPOCH_COLUMN not in columns:
+        try:
+            conn.execute(f"ALTER TABLE alerts ADD COLUMN {EPOCH_COLUMN} INTEGER")
+            applied.append(f"colonne {EPOCH_COLUMN}")
+        except sqlite3.OperationalError as e:
+            # Ajoutée entre-temps par un autre process (scanner / API au démarrage)
+            if "duplicate column" not in str(e):
+                raise
+
+    # Rattrapage des lignes existantes (et des insertions antérieures au trigger)
+    backfilled = conn.execute(f"""
+        UPDATE alerts SET {EPOCH_COLUMN} = CAST(strftime('%s', created_at) AS INTEGER)
+        WHERE {EPOCH_COLUMN} IS NULL AND created_at IS NOT NULL
+    """).rowcount
+    if backfilled:
+        applied.append(f"{backfilled} ligne(s) {EPOCH_COLUMN} remplie(s)")
+
+    trigger_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_alerts_created_at_epoch'"
+    ).fetchone()
+    if not trigger_exists:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_alerts_created_at_epoch
+            AFTER INSERT ON alerts
+            WHEN NEW.{EPOCH_COLUMN} IS NULL
+            BEGIN
+                UPDATE alerts SET {EPOCH_COLUMN} = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+                WHERE id = NEW.id;
+            END
+        """)
+        applied.append("trigger trg_alerts_created_at_epoch")
+
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    for name, target in ALERT_INDEXES:
+        if name not in existing:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+            applied.append(f"index {name}")
+
+    # is_closed n'existe que si le schéma backtesting (cron de prix) a été appliqué
+    if "is_closed" in columns and "idx_alerts_open" not in existing:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_alerts_open ON alerts(timestamp) WHERE {OPEN_ALERTS_WHERE}")
+        applied.append("index partiel idx_alerts_open")
+
+    if applied:
+        conn.execute("ANALYZE alerts")
+
+    return applied
+
+
+def ensure_alerts_schema(db_path: str) -> List[str]:
+    """
+    Migration au démarrage d'un process lecteur (connexion en écriture, commit).
+
+    Sans effet si la base ou la table alerts n'existe pas encore:
+    AlertTracker.create_tables() la crée déjà migrée.
+
+    Returns:
+        Liste des opérations effectuées
+    """
+    if not os.path.exists(db_path):
+        return []
+    conn = connect(db_path)
+    try:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alerts'").fetchone():
+            return []
+        applied = upgrade_alerts_schema(conn)
+        conn.commit()
+        return applied
+    finally:
+        conn.close()
@@ -0,0 +1,126 @@
+"""
+Mémo d'analyse - Pools inchangés d'un scan à l'autre
+
+Entre deux scans, la plupart des pools trending renvoient des attributs
+identiques ou presque; analyze_and_filter_tokens() recalculait pourtant
+momentum, score, filtres, résistance, signaux et qualité pour chacun.
+
+- Empreinte par pool des entrées du scoring et des filtres (montants,
+  compteurs, variations de prix, âge, multi-pool, heure UTC), quantifiée par
+  des tolérances configurables (ANALYSIS_MEMO_*)
+- Mémo par (réseau, adresse pool): empreinte + résultat du scan précédent
+  (score, rejet et sa raison, ou opportunité enrichie)
+- Même empreinte et entrée de moins de ANALYSIS_MEMO_TTL_SECONDS: le résultat
+  est réutilisé; une opportunité repasse seulement par la sécurité (cache
+  SecurityChecker) puis l'anti-spam / cooldown des alertes
+
+Les rejets du filtre sécurité ne sont pas mémorisés (réévalués par son cache).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from config.settings import (
+    ANALYSIS_MEMO_RELATIVE_TOLERANCE,
+    ANALYSIS_MEMO_PERCENT_TOLERANCE,
+    ANALYSIS_MEMO_AGE_TOLERANCE_HOURS,
+    ANALYSIS_MEMO_TTL_SECONDS,
+    ANALYSIS_MEMO_MAX_ENTRIES,
+)
+from utils.metrics import metrics
+
+# Montants et compteurs (tolérance relative); ratios, vélocité et type de pump en sont dérivés
+_AMOUNT_FIELDS = (
+    "liquidity", "volume_24h", "volume_6h", "volume_1h", "total_txns",
+    "buys_24h", "sells_24h", "buys_1h", "sells_1h",
+    "buyers_24h", "sellers_24h", "buyers_1h", "sellers_1h",
+)
+# Variations de prix en % (tolérance absolue)
+_PERCENT_FIELDS = ("price_change_1h", "price_change_3h", "price_change_6h", "price_change_24h")
+# Analyse multi-pool du groupe du token
+_MULTI_POOL_FIELDS = ("is_multi_pool", "num_pools", "is_weth_dominant", "dominant_pair")
+_MULTI_POOL_AMOUNT_FIELDS = ("total_volume", "total_liquidity")
+
+_LOG_STEP = math.log1p(ANALYSIS_MEMO_RELATIVE_TOLERANCE)
+
+
+def _amount_bucket(value) -> Optional[float]:
+    if value is None:
+        return None
+    if value <= 0:
+        return -math.inf
+    return round(math.log(value) / _LOG_STEP)
+
+
+def _step_bucket(value, step: float) -> Optional[int]:
+    return None if value is None else round(value / step)
+
+
+def pool_fingerprint(pool_data: Mapping, multi_pool_data: Mapping) -> Tuple:
+    """Empreinte quantifiée des entrées du scoring (égale si le pool n'a pas bougé au-delà des tolérances)."""
+    return (
+        tuple(_amount_bucket(pool_data.get(key)) for key in _AMOUNT_FIELDS),
+        tuple(_step_bucket(pool_data.get(key), ANALYSIS_MEMO_PERCENT_TOLERANCE) for key in _PERCENT_FIELDS),
+        _step_bucket(pool_data.get("age_hours"), ANALYSIS_MEMO_AGE_TOLERANCE_HOURS),
+        tuple(multi_pool_data.get(key) for key in _MULTI_POOL_FIELDS),
+        tuple(_amount_bucket(multi_pool_data.get(key)) for key in _MULTI_POOL_AMOUNT_FIELDS),
+        datetime.now(timezone.utc).hour,  # Filtre horaire et score qualité
+    )
+
+
+def memo_key(pool_data: Mapping) -> Tuple[str, str]:
+    return pool_data.get("network", "").lower(), pool_data["pool_address"].lower()
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    fingerprint: Tuple
+    stored_at: float
+    scores: Dict[str, Any]                      # score, base_score, momentum_bonus, whale_analysis, momentum
+    v3_filter_reasons: Optional[list] = None
+    rejection: Optional[Tuple[str, str, bool]] = None  # (filtre, raison, compte dans tokens_rejected)
+    opportunity: Optional[Dict[str, Any]] = None       # Enrichissements (sans pool_data, sécurité ni résistance)
+
+
+class AnalysisMemo:
+    """(réseau, adresse pool) -> AnalysisResult du dernier scan, LRU borné, thread-safe."""
+
+    def __init__(self, ttl_seconds: float = ANALYSIS_MEMO_TTL_SECONDS, max_entries: int = ANALYSIS_MEMO_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Tuple[str, str], AnalysisResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str], fingerprint: Tuple, now: Optional[float] = None) -> Optional[AnalysisResult]:
+        """Résultat réutilisable (même empreinte, non expiré), sinon None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            result = self._results.get(key)
+            if result is None or result.fingerprint != fingerprint or now - result.stored_at > self.ttl_seconds:
+                metrics.inc("analysis_memo_lookups_total", result="miss")
+                return None
+            metrics.inc("analysis_memo_lookups_total", result="hit")
+            return result
+
+    def put(self, key: Tuple[str, str], result: AnalysisResult):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+# Instance partagée par le scanner (persistante d'un scan à l'autre)
+analysis_memo = AnalysisMemo()
@@ -6,17 +6,189 @@ Gère les données en mémoire qui ne sont pas fournies par l'API:
 - Cooldowns pour éviter spam d'alertes
 """
 
+import threading
 import time
-from typing import Dict, Optional
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import (
+    BUY_RATIO_HISTORY_MAX_ENTRIES,
+    BUY_RATIO_HISTORY_WINDOW_SECONDS,
+    BUY_RATIO_IDLE_EVICTION_SECONDS,
+    BUY_RATIO_LOOKBACK_SECONDS,
+)
+from utils.metrics import metrics, record_cache_access
 
 
 # ============================================
 # CACHE GLOBAL - Buy Ratio History
 # ============================================
 # Historique des buy ratios par pool (pas fourni par API)
-# Structure: buy_ratio_history[base_token][pool_addr] = [(timestamp, ratio), ...]
-buy_ratio_history = defaultdict(lambda: defaultdict(list))
+# Par pool: série temporelle triée (timestamps croissants), fenêtre glissante de
+# BUY_RATIO_HISTORY_WINDOW_SECONDS. Pools ordonnés du moins au plus récemment mis à
+# jour: les pools inactifs (delistés, sortis des endpoints) sont évincés par l'avant.
+
+class _RatioSeries:
+    """Buffer circulaire (timestamp, ratio): purge amortie O(1), recherche par bisect."""
+
+    __slots__ = ("times", "values", "start")
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.values: List[float] = []
+        self.start = 0  # Entrées [0, start) expirées, compactées par lots
+
+    def append(self, timestamp: float, value: float):
+        self.times.append(timestamp)
+        self.values.append(value)
+
+    def trim(self, cutoff: float) -> int:
+        """Expire les entrées <= cutoff. Retourne le nombre d'entrées expirées."""
+        new_start = bisect_right(self.times, cutoff, self.start)
+        expired = new_start - self.start
+        self.start = new_start
+        # Compaction seulement quand la moitié du buffer est expirée (coût amorti O(1))
+        if self.start >= 32 and self.start * 2 >= len(self.times):
+            del self.times[:self.start]
+            del self.values[:self.start]
+            self.start = 0
+        return expired
+
+    def value_before(self, timestamp: float) -> Optional[float]:
+        """Valeur la plus récente strictement avant timestamp."""
+        index = bisect_left(self.times, timestamp, self.start) - 1
+        return self.values[index] if index >= self.start else None
+
+    def latest(self) -> Optional[float]:
+        return self.values[-1] if len(self) else None
+
+    def __len__(self) -> int:
+        return len(self.times) - self.start
+
+
+class BuyRatioHistory:
+    """(base_token, pool_addr) -> _RatioSeries, borné en âge et en nombre d'entrées."""
+
+    def __init__(self, window_seconds: float = BUY_RATIO_HISTORY_WINDOW_SECONDS,
+                 idle_seconds: float = BUY_RATIO_IDLE_EVICTION_SECONDS,
+                 max_entries: int = BUY_RATIO_HISTORY_MAX_ENTRIES):
+        self.window_seconds = window_seconds
+        self.idle_seconds = idle_seconds
+        self.max_entries = max_entries
+        self._series: "OrderedDict[Tuple[str, str], _RatioSeries]" = OrderedDict()
+        self._last_update: Dict[Tuple[str, str], float] = {}
+        self._entries = 0
+        self._evicted = {"idle": 0, "cap": 0}
+        self._lock = threading.Lock()
+
+    def add(self, base_token: str, pool_addr: str, ratio: float, now: Optional[float] = None) -> bool:
+        """
+        Ajoute un point et purge la fenêtre du pool, puis les pools inactifs.
+
+        Returns:
+            True si le pool avait déjà un historique (hit cache)
+        """
+        now = time.time() if now is None else now
+        key = (base_token, pool_addr)
+        with self._lock:
+            series = self._series.get(key)
+            hit = bool(series)
+            if series is None:
+                series = self._series[key] = _RatioSeries()
+            else:
+                self._series.move_to_end(key)
+            series.append(now, ratio)
+            self._last_update[key] = now
+            self._entries += 1 - series.trim(now - self.window_seconds)
+            self._evict(now)
+        return hit
+
+    def change(self, base_token: str, pool_addr: str, lookback_seconds: float = BUY_RATIO_LOOKBACK_SECONDS,
+               now: Optional[float] = None) -> Optional[float]:
+        """Variation (%) entre la dernière valeur et la plus récente d'avant lookback_seconds."""
+        now = time.time() if now is None else now
+        with self._lock:
+            series = self._series.get((base_token, pool_addr))
+            if series is None or len(series) < 2:
+                return None
+            past = series.value_before(now - lookback_seconds)
+            current = series.latest()
+
+        if past is None or past == 0:
+            return None
+        return ((current - past) / past) * 100
+
+    def _evict(self, now: float):
+        """Évince par l'avant (moins récemment mis à jour): pools inactifs, puis au-delà du plafond."""
+        idle_cutoff = now - self.idle_seconds
+        while self._series:
+            key, series = next(iter(self._series.items()))
+            if self._last_update[key] > idle_cutoff:
+                break
+            self._drop(key, series, "idle")
+
+        # Le pool qui vient d'être mis à jour (en fin d'ordre) n'est jamais évincé
+        while self._entries > self.max_entries and len(self._series) > 1:
+            key, series = next(iter(self._series.items()))
+            self._drop(key, series, "cap")
+
+    def _drop(self, key: Tuple[str, str], series: _RatioSeries, reason: str):
+        del self._series[key]
+        del self._last_update[key]
+        self._entries -= len(series)
+        self._evicted[reason] += 1
+        metrics.inc("buy_ratio_history_evictions_total", reason=reason)
+
+    def dump(self) -> List[tuple]:
+        """État sérialisable (snapshot): (base_token, pool_addr, dernière maj, timestamps, ratios) par pool."""
+        with self._lock:
+            return [
+                (key[0], key[1], self._last_update[key], series.times[series.start:], series.values[series.start:])
+                for key, series in self._series.items()
+            ]
+
+    def load(self, state: List[tuple], now: Optional[float] = None) -> int:
+        """Restaure un dump() (ordre LRU conservé), puis purge ce qui a expiré entre-temps."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._series.clear()
+            self._last_update.clear()
+            self._entries = 0
+            for base_token, pool_addr, last_update, times, values in state:
+                series = _RatioSeries()
+                series.times, series.values = list(times), list(values)
+                series.trim(now - self.window_seconds)
+                if not series:
+                    continue
+                key = (base_token, pool_addr)
+                self._series[key] = series
+                self._last_update[key] = last_update
+                self._entries += len(series)
+            self._evict(now)
+            return len(self._series)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+            self._last_update.clear()
+            self._entries = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pools": len(self._series),
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "evicted_idle": self._evicted["idle"],
+                "evicted_cap": self._evicted["cap"],
+            }
+
+    def __len__(self) -> int:
+        return self._entries
+
+
+buy_ratio_history = BuyRatioHistory()
 
 
 def update_buy_ratio_history(pool_data: Dict):
@@ -26,19 +198,10 @@ def update_buy_ratio_history(pool_data: Dict):
     Args:
         pool_data: Données du pool avec buys_24h, sells_24h, base_token_name, pool_address
     """
-    base_token = pool_data["base_token_name"]
-    pool_addr = pool_data["pool_address"]
-    now = time.time()
-
     # Buy ratio 24h
     buy_ratio = pool_data["buys_24h"] / pool_data["sells_24h"] if pool_data["sells_24h"] > 0 else 1.0
-    buy_ratio_history[base_token][pool_addr].append((now, buy_ratio))
-
-    # Nettoyer historique (garder 2h seulement - on a besoin que de 1h)
-    cutoff = now - 7200  # 2h
-    buy_ratio_history[base_token][pool_addr] = [
-        (t, v) for t, v in buy_ratio_history[base_token][pool_addr] if t > cutoff
-    ]
+    hit = buy_ratio_history.add(pool_data["base_token_name"], pool_data["pool_address"], buy_ratio)
+    record_cache_access("buy_ratio", hit=hit)
 
 
 def get_buy_ratio_change(base_token: str, pool_addr: str) -> Optional[float]:
@@ -52,26 +215,7 @@ def get_buy_ratio_change(base_token: str, pool_addr: str) -> Optional[float]:
     Returns:
         Variation en pourcentage, ou None si pas assez de données
     """
-    hist = buy_ratio_history[base_token][pool_addr]
-
-    if not hist or len(hist) < 2:
-        return None
-
-    now = time.time()
-    one_hour_ago = now - 3600  # 1h
-
-    # Trouver valeur la plus proche d'il y a 1h
-    past_values = [v for t, v in hist if t < one_hour_ago]
-    if not past_values:
-        return None
-
-    past = past_values[-1]  # Plus récente valeur avant 1h
-    current = hist[-1][1]
-
-    if past == 0:
-        return None
-
-    return ((current - past) / past) * 100
+    return buy_ratio_history.change(base_token, pool_addr)
 
 
 def clear_buy_ratio_history():
@@ -81,8 +225,14 @@ def clear_buy_ratio_history():
 
 def get_buy_ratio_history_size() -> int:
     """Retourne le nombre total d'entrées dans l'historique (debug)."""
-    total = 0
-    for token_dict in buy_ratio_history.values():
-        for pool_list in token_dict.values():
-            total += len(pool_list)
-    return total
+    size = len(buy_ratio_history)
+    metrics.set_gauge("buy_ratio_history_entries", size)
+    return size
+
+
+def get_buy_ratio_history_stats() -> Dict:
+    """Pools suivis, entrées, plafond et évictions (idle / cap) de l'historique buy ratio."""
+    stats = buy_ratio_history.stats()
+    metrics.set_gauge("buy_ratio_history_entries", stats["entries"])
+    metrics.set_gauge("buy_ratio_history_pools", stats["pools"])
+    return stats
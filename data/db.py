@@ -0,0 +1,189 @@
+"""
+Couche de stockage SQLite - Pragmas, connexions lecture et file d'écriture unique
+
+alerts_history.db est partagé par le scanner, le scheduler de tracking, le
+cron de prix et les workers gunicorn du dashboard:
+- WAL: les lectures du dashboard ne bloquent plus les écritures du scanner
+- synchronous=NORMAL, mmap_size, cache_size, busy_timeout
+- Lecteurs: connexions propres en query_only
+- Écritures du process: une seule thread (WriteQueue) qui regroupe les
+  opérations en file dans des transactions périodiques au lieu d'un commit
+  par ligne. Chaque opération tourne dans un SAVEPOINT: une erreur n'annule
+  qu'elle-même, pas le lot.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from config.settings import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE_BYTES,
+    DB_WRITE_FLUSH_SECONDS,
+    DB_WRITE_MAX_BATCH,
+)
+from utils.helpers import log
+from utils.metrics import metrics
+
+_STOP = object()
+
+
+def apply_pragmas(conn: sqlite3.Connection, readonly: bool = False) -> sqlite3.Connection:
+    """Pragmas communs; WAL est persistant dans le fichier, activé par les connexions écriture."""
+    conn.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_MS)}")
+    conn.execute(f"PRAGMA cache_size = -{int(SQLITE_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(SQLITE_MMAP_SIZE_BYTES)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+    try:
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if str(mode).lower() != "wal":
+            log(f"⚠️ SQLite: WAL indisponible (journal_mode={mode})")
+    except sqlite3.OperationalError as e:
+        log(f"⚠️ SQLite: activation WAL impossible: {e}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def connect(db_path: str, readonly: bool = False, row_factory=None,
+            check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Ouvre une connexion avec les pragmas du projet.
+
+    Args:
+        db_path: Fichier SQLite
+        readonly: Connexion lecteur (query_only)
+        row_factory: ex: sqlite3.Row
+        check_same_thread: False si la connexion est partagée entre threads
+    """
+    conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, check_same_thread=check_same_thread)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return apply_pragmas(conn, readonly=readonly)
+
+
+class WriteQueue:
+    """
+    Thread d'écriture unique d'un fichier SQLite.
+
+    Les opérations sont des callables fn(conn) exécutées dans la thread
+    d'écriture; elles ne doivent pas appeler commit()/rollback() (la
+    transaction du lot est gérée ici). Le Future est résolu après le COMMIT.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = DB_WRITE_FLUSH_SECONDS,
+                 max_batch: int = DB_WRITE_MAX_BATCH):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self.conn = connect(db_path, check_same_thread=False)
+        self.conn.isolation_level = None  # Transactions explicites (BEGIN IMMEDIATE / COMMIT)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="SQLiteWriter")
+        self._thread.start()
+
+    # ===== API =====
+
+    def submit(self, fn: Callable[[sqlite3.Connection], Any]) -> Future:
+        future: Future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def execute(self, sql: str, params: Iterable = ()) -> Future:
+        """Future résolu avec le curseur (lastrowid / rowcount) après commit."""
+        params = tuple(params)
+        return self.submit(lambda conn: conn.execute(sql, params))
+
+    def executemany(self, sql: str, seq_of_params: Iterable) -> Future:
+        rows = list(seq_of_params)
+        return self.submit(lambda conn: conn.executemany(sql, rows))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Attend que toutes les écritures déjà en file soient commitées (read-your-writes)."""
+        self.submit(lambda conn: None).result(timeout)
+
+    def close(self, timeout: float = 10.0):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self.conn.close()
+
+    # ===== Thread d'écriture =====
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            operations = [op for op in batch if op is not _STOP]
+            if operations:
+                self._commit_batch(operations)
+            if stop:
+                return
+
+    def _commit_batch(self, operations):
+        start = time.perf_counter()
+        outcomes = []
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for fn, future in operations:
+                self.conn.execute("SAVEPOINT op")
+                try:
+                    result = fn(self.conn)
+                    self.conn.execute("RELEASE op")
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    log(f"⚠️ SQLite: écriture annulée ({type(e).__name__}: {e})")
+                    self.conn.execute("ROLLBACK TO op")
+                    self.conn.execute("RELEASE op")
+                    outcomes.append((future, None, e))
+            self.conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            log(f"❌ SQLite: lot de {len(operations)} écriture(s) annulé: {e}")
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            outcomes = [(future, None, e) for _, future in operations]
+
+        metrics.observe("sqlite_write_seconds", time.perf_counter() - start, op="write_batch")
+        metrics.inc("sqlite_write_ops_total", len(operations))
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_write_queues: Dict[str, WriteQueue] = {}
+_write_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path: str) -> WriteQueue:
+    """WriteQueue unique du process pour ce fichier (créée au premier appel)."""
+    key = os.path.abspath(db_path)
+    with _write_queues_lock:
+        if key not in _write_queues:
+            _write_queues[key] = WriteQueue(db_path)
+        return _write_queues[key]
+
+
+def close_write_queue(db_path: str):
+    key = os.path.abspath(db_path)
+    with _write_queues_lock:
+        writer = _write_queues.pop(key, None)
+    if writer is not None:
+        writer.close()
@@ -0,0 +1,121 @@
+"""
+PoolSnapshot - Représentation compacte d'un pool parsé
+
+Remplace le dict de ~35 clés retourné par parse_pool_data():
+- dataclass(slots=True): pas de __dict__ par instance, accès attribut rapide
+- Vue Mapping rétrocompatible: pool_data["liquidity"], pool_data.get(...),
+  "key" in pool_data, dict(pool_data) continuent de fonctionner
+- Les clés hors schéma ajoutées en cours de route (ex: v3_filter_reasons)
+  sont stockées dans `extras`
+"""
+
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator
+
+
+@dataclass(slots=True, eq=False)
+class PoolSnapshot(MutableMapping):
+    """Snapshot d'un pool GeckoTerminal à l'instant du scan."""
+
+    name: str = "Unknown"
+    base_token_name: str = ""
+    token_name: str = ""      # V3: Pour watchlist
+    token_symbol: str = ""    # V3: Pour watchlist
+    price_usd: float = 0.0
+    volume_24h: float = 0.0
+    volume_6h: float = 0.0
+    volume_1h: float = 0.0
+    liquidity: float = 0.0
+    total_txns: int = 0
+    buys_24h: int = 0
+    sells_24h: int = 0
+    buys_6h: int = 0
+    sells_6h: int = 0
+    buys_1h: int = 0
+    sells_1h: int = 0
+    buyers_24h: int = 0
+    sellers_24h: int = 0
+    buyers_6h: int = 0
+    sellers_6h: int = 0
+    buyers_1h: int = 0
+    sellers_1h: int = 0
+    buy_ratio: float = 1.0
+    price_change_24h: float = 0.0
+    price_change_6h: float = 0.0
+    price_change_3h: float = 0.0
+    price_change_1h: float = 0.0
+    age_hours: float = 0.0
+    network: str = "unknown"
+    pool_address: str = ""
+    fdv_usd: float = 0.0
+    market_cap_usd: float = 0.0
+    volume_acceleration_1h_vs_6h: float = 0.0
+    volume_acceleration_6h_vs_24h: float = 0.0
+    velocite_pump: float = 0.0  # V3: Pour filtres backtest
+    type_pump: str = "LENT"     # V3: Pour filtres backtest
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    # ===== Vue Mapping (compatibilité pool_data[...] / pool_data.get(...)) =====
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_NAMES:
+            return getattr(self, key)
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _FIELD_NAMES:
+            setattr(self, key, value)
+        else:
+            self.extras[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _FIELD_NAMES:
+            raise KeyError(f"Champ fixe non supprimable: {key}")
+        del self.extras[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _FIELD_ORDER
+        yield from self.extras
+
+    def __len__(self) -> int:
+        return len(_FIELD_ORDER) + len(self.extras)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_NAMES or key in self.extras
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Chemin rapide: évite le try/except KeyError de Mapping.get
+        if key in _FIELD_NAMES:
+            return getattr(self, key)
+        return self.extras.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"PoolSnapshot(name={self.name!r}, network={self.network!r}, pool_address={self.pool_address!r})"
+
+    # ===== Conversions =====
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PoolSnapshot":
+        """Construit un snapshot depuis un dict (clés inconnues -> extras)."""
+        known = {k: v for k, v in data.items() if k in _FIELD_NAMES}
+        snapshot = cls(**known)
+        for key, value in data.items():
+            if key not in _FIELD_NAMES:
+                snapshot.extras[key] = value
+        return snapshot
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copie en dict simple (JSON, sauvegarde DB...)."""
+        data = {name: getattr(self, name) for name in _FIELD_ORDER}
+        data.update(self.extras)
+        return data
+
+    def copy(self) -> "PoolSnapshot":
+        snapshot = PoolSnapshot(**{name: getattr(self, name) for name in _FIELD_ORDER})
+        snapshot.extras = dict(self.extras)
+        return snapshot
+
+
+_FIELD_ORDER = tuple(f.name for f in fields(PoolSnapshot) if f.name != "extras")
+_FIELD_NAMES = frozenset(_FIELD_ORDER)
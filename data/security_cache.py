@@ -0,0 +1,162 @@
+"""
+Cache persistant des vérifications de sécurité (SQLite, borné LRU)
+
+Remplace le dict en mémoire de SecurityChecker (perdu à chaque redéploiement):
+- Une entrée par (réseau, token, check): honeypot, lp_lock, contract + verdict global
+- TTL par check: honeypot/ownership changent rarement, le LP lock expire plus vite
+- Résultats négatifs / erreurs API (checked=False) gardés peu de temps
+- Borné: au-delà de SECURITY_CACHE_MAX_ENTRIES, les entrées les moins
+  récemment lues sont supprimées (LRU via last_access)
+
+Fichier SQLite séparé de la base des alertes (pas de contention avec les
+écritures du scanner), lisible par le scanner, le dashboard et le price tracker.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config.settings import (
+    SECURITY_CACHE_DB_PATH,
+    SECURITY_CACHE_MAX_ENTRIES,
+    SECURITY_CACHE_TTL_SECONDS,
+    SECURITY_CACHE_NEGATIVE_TTL_SECONDS,
+)
+from utils.helpers import log
+
+# Nombre d'écritures entre deux purges (expirés + excédent LRU)
+PRUNE_EVERY_WRITES = 100
+
+
+def _cache_key(network: str, token_address: str, check: str) -> str:
+    return f"{network}:{token_address.lower()}:{check}"
+
+
+class SecurityCache:
+    """Cache clé/valeur JSON avec TTL par check, partagé entre process via SQLite."""
+
+    def __init__(self, db_path: str = SECURITY_CACHE_DB_PATH, max_entries: int = SECURITY_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")  # Lecteurs (dashboard) non bloqués par le scanner
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS security_cache (
+                cache_key TEXT PRIMARY KEY,
+                network TEXT NOT NULL,
+                token_address TEXT NOT NULL,
+                check_name TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                checked INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_security_cache_last_access ON security_cache(last_access)")
+        self.conn.commit()
+
+    @staticmethod
+    def ttl_for(check: str, checked: bool) -> float:
+        """TTL d'un résultat: court si négatif/erreur, sinon selon le check."""
+        if not checked:
+            return SECURITY_CACHE_NEGATIVE_TTL_SECONDS
+        return SECURITY_CACHE_TTL_SECONDS.get(check, SECURITY_CACHE_NEGATIVE_TTL_SECONDS)
+
+    def get(self, network: str, token_address: str, check: str) -> Optional[Dict]:
+        """Résultat en cache non expiré, ou None."""
+        key = _cache_key(network, token_address, check)
+        now = time.time()
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT payload, expires_at FROM security_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    return None
+                self.conn.execute("UPDATE security_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+                self.conn.commit()
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            log(f"⚠️ Cache sécurité indisponible (lecture): {e}")
+            return None
+
+    def set(self, network: str, token_address: str, check: str, result: Dict, ttl: Optional[float] = None):
+        """Enregistre un résultat (TTL par défaut: ttl_for(check, result['checked']))."""
+        checked = bool(result.get('checked', True))
+        if ttl is None:
+            ttl = self.ttl_for(check, checked)
+        now = time.time()
+        try:
+            with self._lock:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO security_cache
+                        (cache_key, network, token_address, check_name, payload, checked, created_at, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (_cache_key(network, token_address, check), network, token_address.lower(), check,
+                     json.dumps(result), int(checked), now, now + ttl, now),
+                )
+                self.conn.commit()
+                self._writes += 1
+                if self._writes % PRUNE_EVERY_WRITES == 0:
+                    self._prune(now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            log(f"⚠️ Cache sécurité indisponible (écriture): {e}")
+
+    def _prune(self, now: float):
+        """Supprime les entrées expirées puis l'excédent LRU (appelé sous self._lock)."""
+        self.conn.execute("DELETE FROM security_cache WHERE expires_at <= ?", (now,))
+        excess = self.conn.execute("SELECT COUNT(*) FROM security_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                """
+                DELETE FROM security_cache WHERE cache_key IN (
+                    SELECT cache_key FROM security_cache ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+        self.conn.commit()
+
+    def prune(self):
+        """Purge immédiate (expirés + borne LRU)."""
+        try:
+            with self._lock:
+                self._prune(time.time())
+        except sqlite3.Error as e:
+            log(f"⚠️ Cache sécurité indisponible (purge): {e}")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def load_security_verdict(network: str, token_address: str, db_path: str = SECURITY_CACHE_DB_PATH) -> Optional[Dict]:
+    """
+    Lecture seule du dernier verdict global d'un token (dashboard, price tracker).
+    Ne met pas à jour last_access et ne crée pas la base si elle n'existe pas.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
+    except sqlite3.Error:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT payload, expires_at FROM security_cache WHERE cache_key = ?",
+            (_cache_key(network, token_address, "verdict"),),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    verdict = json.loads(row[0])
+    verdict['cache_expired'] = row[1] <= time.time()
+    return verdict
@@ -0,0 +1,114 @@
+"""
+Snapshot / warm-start de l'état mémoire des scanners
+
+Les structures en mémoire (historique buy ratio du scanner V3, cooldowns du
+scanner Hyperliquid) sont perdues à chaque redéploiement Railway: pendant
+l'heure qui suit, get_buy_ratio_change() retourne None et les cooldowns
+Hyperliquid laissent repartir des alertes déjà envoyées.
+
+- Sections enregistrées par le process (register(nom, dump, load))
+- Fichier binaire compact: en-tête + pickle compressé zlib
+- Écriture atomique: fichier temporaire + fsync + os.replace (jamais de
+  snapshot à moitié écrit, même si le conteneur est tué pendant l'écriture)
+- Sauvegarde périodique (maybe_save) et restauration au démarrage; un snapshot
+  trop ancien ou illisible est ignoré (démarrage à froid)
+
+Le cache SecurityChecker (data/security_cache.py) et l'anti-spam des alertes
+V3 (base d'alertes SQLite + AlertIndex) sont déjà persistants.
+"""
+
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+from utils.helpers import log
+
+MAGIC = b"BMSTATE1"
+
+
+class StateSnapshot:
+    """Registre de sections sérialisées ensemble dans un fichier snapshot."""
+
+    def __init__(self, path: str, interval_seconds: float, max_age_seconds: float):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self._sections: Dict[str, Tuple[Callable[[], Any], Callable[[Any], Any]]] = {}
+        self._last_save = time.time()
+
+    def register(self, name: str, dump: Callable[[], Any], load: Callable[[Any], Any]):
+        """dump() -> données picklables; load(données) restaure la section."""
+        self._sections[name] = (dump, load)
+
+    def save(self) -> bool:
+        """Écrit toutes les sections (atomique). Retourne False en cas d'erreur."""
+        start = time.perf_counter()
+        try:
+            payload = {
+                "saved_at": time.time(),
+                "sections": {name: dump() for name, (dump, _) in self._sections.items()},
+            }
+            data = MAGIC + zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            self._last_save = time.time()
+            log(f"💾 Snapshot état: {len(data) / 1024:.1f} Ko en {(time.perf_counter() - start) * 1000:.0f}ms ({self.path})")
+            return True
+        except Exception as e:
+            log(f"⚠️ Snapshot état impossible: {e}")
+            return False
+
+    def maybe_save(self) -> bool:
+        """Sauvegarde si interval_seconds est écoulé depuis la dernière."""
+        if time.time() - self._last_save < self.interval_seconds:
+            return False
+        return self.save()
+
+    def restore(self) -> List[str]:
+        """
+        Recharge les sections enregistrées depuis le fichier.
+
+        Returns:
+            Noms des sections restaurées (vide: démarrage à froid)
+        """
+        if not os.path.exists(self.path):
+            log("ℹ️ Pas de snapshot d'état: démarrage à froid")
+            return []
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if not data.startswith(MAGIC):
+                raise ValueError("en-tête inconnu")
+            payload = pickle.loads(zlib.decompress(data[len(MAGIC):]))
+        except Exception as e:
+            log(f"⚠️ Snapshot d'état illisible, ignoré: {e}")
+            return []
+
+        age = time.time() - payload["saved_at"]
+        if age > self.max_age_seconds:
+            log(f"ℹ️ Snapshot d'état trop ancien ({age / 3600:.1f}h), ignoré")
+            return []
+
+        restored = []
+        for name, state in payload["sections"].items():
+            if name not in self._sections:
+                continue
+            try:
+                self._sections[name][1](state)
+                restored.append(name)
+            except Exception as e:
+                log(f"⚠️ Section '{name}' du snapshot non restaurée: {e}")
+
+        log(f"♻️ État restauré ({age:.0f}s): {', '.join(restored) or 'aucune section'}")
+        return restored
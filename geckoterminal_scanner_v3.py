@@ -30,6 +30,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from collections.abc import Mapping
 
 # Système de sécurité et tracking
 from security_checker import SecurityChecker
@@ -105,6 +106,7 @@ from utils.helpers import (
 )
 
 from utils.telegram import send_telegram
+from utils.metrics import metrics, persist_scan_metrics
 
 from utils.api_client import (
     get_trending_pools,
@@ -116,6 +118,7 @@ from utils.api_client import (
 from data.cache import (
     update_buy_ratio_history,
     get_buy_ratio_change,
+    get_buy_ratio_history_stats,
 )
 
 from core.filters import (
@@ -583,7 +586,7 @@ def analyser_alerte_suivante(previous_alert: Dict, current_price: float, pool_da
             'temps_ecoule_heures': 0
         }
 
-    if not pool_data or not isinstance(pool_data, dict):
+    if not pool_data or not isinstance(pool_data, Mapping):
         log(f"   ⚠️ pool_data invalide dans analyser_alerte_suivante: {type(pool_data)}")
         return {
             'decision': 'ERROR',
@@ -1522,29 +1525,45 @@ def scan_geckoterminal():
         report_liquidity_stats,
     )
 
-    all_pools = collect_pools_from_networks(liquidity_stats)
+    metrics.begin_scan()
+
+    with metrics.time_stage("collect"):
+        all_pools = collect_pools_from_networks(liquidity_stats)
 
     # ÉTAPE 2: Mettre à jour historique buy ratio
-    for pool_data in all_pools:
-        update_buy_ratio_history(pool_data)
+    with metrics.time_stage("buy_ratio_history"):
+        for pool_data in all_pools:
+            update_buy_ratio_history(pool_data)
+        get_buy_ratio_history_stats()  # Gauges entrées / pools suivis
 
     # ÉTAPE 3: Mettre à jour prix MAX pour tokens trackés
-    update_price_max_for_tracked_tokens(all_pools, alert_tracker)
+    with metrics.time_stage("price_max_update"):
+        update_price_max_for_tracked_tokens(all_pools, alert_tracker)
 
     # ÉTAPE 4: Analyser et filtrer les opportunités
-    opportunities, tokens_rejected = analyze_and_filter_tokens(all_pools, security_checker)
+    with metrics.time_stage("analyze"):
+        opportunities, tokens_rejected = analyze_and_filter_tokens(all_pools, security_checker)
 
     # ÉTAPE 5: Traiter et envoyer les alertes
-    alerts_sent, tokens_rejected_alerts = process_and_send_alerts(
-        opportunities, alert_tracker, security_checker
-    )
+    with metrics.time_stage("alerts"):
+        alerts_sent, tokens_rejected_alerts = process_and_send_alerts(
+            opportunities, alert_tracker, security_checker
+        )
     tokens_rejected += tokens_rejected_alerts
 
     # ÉTAPE 6: Tracking actif des alertes existantes
-    updates_sent = track_active_alerts(alert_tracker)
+    with metrics.time_stage("active_tracking"):
+        updates_sent = track_active_alerts(alert_tracker, all_pools)
 
     # ÉTAPE 7: Rapport des statistiques de liquidité
-    report_liquidity_stats(liquidity_stats)
+    with metrics.time_stage("report"):
+        report_liquidity_stats(liquidity_stats)
+
+    # Métriques du scan -> table scan_metrics (lue par /metrics du dashboard)
+    scan_summary = metrics.end_scan(len(all_pools), len(opportunities), alerts_sent)
+    if alert_tracker is not None:
+        persist_scan_metrics(alert_tracker.db_path, scan_summary, writer=alert_tracker.writer)
+    log(f"⏱️ Étapes: " + ", ".join(f"{k}={v:.1f}s" for k, v in scan_summary["stages"].items()))
 
     log(f"\n✅ Scan terminé: {alerts_sent} alertes envoyées, {tokens_rejected} tokens rejetés (sécurité)")
     log("=" * 80)
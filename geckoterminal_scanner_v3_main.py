@@ -4,7 +4,22 @@ Ce fichier ajoute la fonction main() manquante.
 """
 
 import os
+import signal
+import threading
 import time
+from config.settings import (
+    ENABLE_PRICE_TRACKING_SCHEDULER,
+    ENABLE_SCAN_PIPELINE,
+    SCAN_CADENCE_MAX_SECONDS,
+    SCAN_CADENCE_MIN_SECONDS,
+    SCANNER_STATE_MAX_AGE_SECONDS,
+    SCANNER_STATE_PATH,
+    SCANNER_STATE_SNAPSHOT_INTERVAL_SECONDS,
+)
+from core.scan_pipeline import ScanPipeline
+from data.cache import buy_ratio_history
+from data.state_snapshot import StateSnapshot
+from utils.telegram import flush_telegram
 from geckoterminal_scanner_v3 import (
     scan_geckoterminal,
     security_checker,
@@ -14,10 +29,13 @@ from geckoterminal_scanner_v3 import (
     log,
 )
 
+# État mémoire sauvegardé périodiquement et restauré au démarrage
+state_snapshot = None
+
 # Initialiser les systèmes globaux
 def init_systems():
     """Initialise les systèmes de sécurité et tracking."""
-    global security_checker, alert_tracker
+    global security_checker, alert_tracker, state_snapshot
 
     if security_checker is None:
         security_checker = SecurityChecker()
@@ -30,11 +48,31 @@ def init_systems():
         alert_tracker = AlertTracker(db_path=db_path)
         log(f"✅ AlertTracker initialisé (DB: {db_path})")
 
+    # Reprendre les checkpoints de tracking prix en attente (redémarrage / redéploiement)
+    if ENABLE_PRICE_TRACKING_SCHEDULER:
+        alert_tracker.start_scheduler()
+
+    # Warm-start: historique buy ratio du dernier snapshot
+    # (l'anti-spam des alertes est déjà persistant: base d'alertes + AlertIndex)
+    if state_snapshot is None:
+        state_snapshot = StateSnapshot(
+            SCANNER_STATE_PATH,
+            interval_seconds=SCANNER_STATE_SNAPSHOT_INTERVAL_SECONDS,
+            max_age_seconds=SCANNER_STATE_MAX_AGE_SECONDS,
+        )
+        state_snapshot.register("buy_ratio_history", buy_ratio_history.dump, buy_ratio_history.load)
+        state_snapshot.restore()
+
 
 def main():
     """
     Fonction principale - Boucle de scan continue.
     """
+    # Redéploiement Railway (SIGTERM): même arrêt propre que Ctrl+C (snapshot final)
+    # signal.signal() n'est permis que dans le thread principal (alerte.py lance main() dans un thread)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
     # Initialiser les systèmes
     init_systems()
 
@@ -44,34 +82,52 @@ def main():
     scanner.alert_tracker = alert_tracker
 
     log("🚀 Démarrage du scanner GeckoTerminal V3...")
-    log("🔄 Mode: Scan continu toutes les 2 minutes")
+    if ENABLE_SCAN_PIPELINE:
+        log(f"🔄 Mode: Pipeline (collecte / scoring / alertes / tracking concurrents, "
+            f"cadence adaptative {SCAN_CADENCE_MIN_SECONDS}-{SCAN_CADENCE_MAX_SECONDS}s par réseau)")
+    else:
+        log("🔄 Mode: Scan continu toutes les 2 minutes")
     log("⛓️ Réseaux surveillés: ETH, BSC, Base, Solana, Polygon, Avalanche")
     log("")
 
     scan_count = 0
+    pipeline = None
 
     try:
-        while True:
-            scan_count += 1
-            log(f"\n{'='*80}")
-            log(f"🔍 SCAN #{scan_count}")
-            log(f"{'='*80}\n")
-
-            try:
-                # Lancer un scan
-                scan_geckoterminal()
-
-            except Exception as e:
-                log(f"❌ Erreur durant le scan: {e}")
-                import traceback
-                log(f"Traceback: {traceback.format_exc()}")
-
-            # Attendre 2 minutes avant le prochain scan
-            log(f"\n⏳ Attente de 120 secondes avant le prochain scan...")
-            time.sleep(120)
+        if ENABLE_SCAN_PIPELINE:
+            # Snapshot de l'état mémoire en fin de tour (au plus toutes les SCANNER_STATE_SNAPSHOT_INTERVAL_SECONDS)
+            pipeline = ScanPipeline(security_checker, alert_tracker, on_round_end=state_snapshot.maybe_save)
+            pipeline.run_forever()
+        else:
+            while True:
+                scan_count += 1
+                log(f"\n{'='*80}")
+                log(f"🔍 SCAN #{scan_count}")
+                log(f"{'='*80}\n")
+
+                try:
+                    # Lancer un scan
+                    scan_geckoterminal()
+
+                except Exception as e:
+                    log(f"❌ Erreur durant le scan: {e}")
+                    import traceback
+                    log(f"Traceback: {traceback.format_exc()}")
+
+                # Snapshot de l'état mémoire (au plus toutes les SCANNER_STATE_SNAPSHOT_INTERVAL_SECONDS)
+                state_snapshot.maybe_save()
+
+                # Attendre 2 minutes avant le prochain scan
+                log(f"\n⏳ Attente de 120 secondes avant le prochain scan...")
+                time.sleep(120)
 
     except KeyboardInterrupt:
         log("\n\n⏹️ Arrêt du scanner demandé par l'utilisateur")
+        if pipeline is not None:
+            pipeline.stop()
+        state_snapshot.save()
+        # Alertes encore en file Telegram (et leur sauvegarde DB)
+        flush_telegram(timeout=30)
         log("👋 Scanner arrêté proprement")
 
 
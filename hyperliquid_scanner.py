@@ -8,11 +8,13 @@ import sys
 import os
 import time
 import json
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from utils.http_client import http_post
+from data.state_snapshot import StateSnapshot
+
 # UTF-8 pour emojis Windows
 if sys.platform == "win32":
     import io
@@ -55,6 +57,14 @@ alert_cooldown = {}
 
 COOLDOWN_SECONDS = 1800  # 30 min entre alertes meme signal
 
+# Snapshot des cooldowns (survit aux redeploiements)
+STATE_PATH = os.getenv(
+    "HYPERLIQUID_STATE_PATH",
+    "/data/hyperliquid_state.bin" if os.path.exists("/data") else "hyperliquid_state.bin",
+)
+state_snapshot = StateSnapshot(STATE_PATH, interval_seconds=300, max_age_seconds=COOLDOWN_SECONDS)
+state_snapshot.register("alert_cooldown", lambda: dict(alert_cooldown), alert_cooldown.update)
+
 # Logs
 def log(msg: str):
     print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {msg}")
@@ -69,7 +79,7 @@ def send_telegram(message: str) -> bool:
             "parse_mode": "Markdown",
             "disable_web_page_preview": True
         }
-        response = requests.post(url, json=data, timeout=10)
+        response = http_post(url, json=data, timeout=10)
         return response.status_code == 200
     except Exception as e:
         log(f"❌ Erreur Telegram: {e}")
@@ -79,7 +89,7 @@ def api_request(endpoint_type: str, data: Dict) -> Optional[Dict]:
     """Requete API Hyperliquid generique."""
     try:
         payload = {"type": endpoint_type, **data}
-        response = requests.post(HYPERLIQUID_API, json=payload, timeout=15)
+        response = http_post(HYPERLIQUID_API, json=payload, timeout=15)
 
         if response.status_code == 429:
             log(f"⚠️ Rate limit atteint, pause 60s...")
@@ -671,9 +681,12 @@ def main():
     log(f"   - Volume spike: +{(THRESHOLDS['volume_spike_ratio']-1)*100:.0f}%")
     log(f"🔄 Scan toutes les 2 minutes (rate limit: 1200/min)")
 
+    state_snapshot.restore()
+
     while True:
         try:
             scan_hyperliquid()
+            state_snapshot.maybe_save()
 
             # Attendre 2 minutes avant prochain scan
             log("\n💤 Pause 2 min avant prochain scan...\n")
@@ -681,6 +694,7 @@ def main():
 
         except KeyboardInterrupt:
             log("\n⏹️  Arret du scanner")
+            state_snapshot.save()
             break
 
         except Exception as e:
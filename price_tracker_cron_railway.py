@@ -11,10 +11,13 @@ USAGE:
 
 import os
 import sqlite3
-import requests
-import time
 from datetime import datetime, timedelta
 
+from data.db import connect
+from utils.http_client import http_get
+from utils.price_service import fetch_prices
+from utils.rate_limiter import geckoterminal_limiter, request_with_rate_limit
+
 # Determiner le chemin de la base SQLite
 if os.path.exists('/data/alerts_history.db'):
     # Railway: volume monté à /data/
@@ -33,9 +36,7 @@ price_source_stats = {'dexscreener': 0, 'geckoterminal': 0, 'failed': 0}
 
 def get_db_connection():
     """Retourne une connexion SQLite"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return connect(DB_PATH, row_factory=sqlite3.Row)
 
 def fetch_dexscreener_price(network, pool_address):
     """
@@ -61,7 +62,7 @@ def fetch_dexscreener_price(network, pool_address):
     url = f"{DEXSCREENER_API}/pairs/{chain}/{pool_address}"
 
     try:
-        response = requests.get(url, timeout=8)
+        response = http_get(url, timeout=8)
         if response.status_code == 200:
             data = response.json()
             # DexScreener peut retourner 'pair' ou 'pairs'
@@ -90,7 +91,12 @@ def fetch_geckoterminal_price(network, pool_address):
     url = f"{GECKOTERMINAL_API}/networks/{gt_network}/pools/{pool_address}"
 
     try:
-        response = requests.get(url, timeout=10)
+        # Token bucket partage: pacing + retry Retry-After sur 429
+        response = request_with_rate_limit(
+            geckoterminal_limiter,
+            lambda: http_get(url, timeout=10),
+            label=f"pool {pool_address[:8]}",
+        )
         if response.status_code == 200:
             data = response.json()
             price_usd = float(data['data']['attributes']['base_token_price_usd'])
@@ -373,13 +379,18 @@ if __name__ == '__main__':
     tracked = 0
     tp_hit = {'TP1': 0, 'TP2': 0, 'TP3': 0, 'SL': 0, 'ONGOING': 0, 'ALREADY_CLOSED': 0}
 
+    # Tous les prix en quelques requêtes groupées (DexScreener puis GeckoTerminal multi-pool)
+    prices = fetch_prices(
+        ((alert['network'], alert['pool_address']) for alert in alerts),
+        stats=price_source_stats,
+    )
+    print(f"      OK {len(prices)}/{len(alerts)} prix recuperes")
+
     for i, alert in enumerate(alerts, 1):
         if i % 10 == 0:
             print(f"      Progress: {i}/{len(alerts)}")
-            time.sleep(2)  # Rate limit
 
-        # Fetch prix actuel
-        current_price = fetch_current_price(alert['network'], alert['pool_address'])
+        current_price = prices.get(alert['pool_address'])
 
         if current_price is None:
             continue
@@ -396,9 +407,6 @@ if __name__ == '__main__':
 
         tracked += 1
 
-        # Rate limit: 5 req/s
-        time.sleep(0.2)
-
     print(f"      OK {tracked} alertes trackees")
     print()
 
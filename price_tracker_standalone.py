@@ -7,10 +7,14 @@ Usage: python price_tracker_standalone.py
 
 import os
 import sqlite3
-import requests
 import time
 from datetime import datetime, timedelta
 
+from data.db import connect
+from utils.http_client import http_get
+from utils.price_service import fetch_prices
+from utils.rate_limiter import geckoterminal_limiter, request_with_rate_limit
+
 # Database path - shared volume with bot-market
 DB_PATH = '/data/alerts_history.db'
 
@@ -21,9 +25,7 @@ TRACKING_INTERVAL = 1800
 
 def get_db_connection():
     """Returns a SQLite connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return connect(DB_PATH, row_factory=sqlite3.Row)
 
 def fetch_current_price(network, pool_address):
     """Fetch current price via GeckoTerminal API"""
@@ -41,7 +43,12 @@ def fetch_current_price(network, pool_address):
     url = f"{GECKOTERMINAL_API}/networks/{gt_network}/pools/{pool_address}"
 
     try:
-        response = requests.get(url, timeout=10)
+        # Shared token bucket: pacing + Retry-After aware retries on 429
+        response = request_with_rate_limit(
+            geckoterminal_limiter,
+            lambda: http_get(url, timeout=10),
+            label=f"pool {pool_address[:8]}",
+        )
         if response.status_code == 200:
             data = response.json()
             price_usd = float(data['data']['attributes']['base_token_price_usd'])
@@ -218,11 +225,15 @@ def run_tracking_cycle():
     tracked = 0
     results = {'TP1': 0, 'TP2': 0, 'TP3': 0, 'SL': 0, 'ONGOING': 0}
 
+    # Batched price lookups (DexScreener, then GeckoTerminal multi-pool)
+    prices = fetch_prices((alert['network'], alert['pool_address']) for alert in alerts)
+    print(f"      Prices: {len(prices)}/{len(alerts)}")
+
     for i, alert in enumerate(alerts, 1):
         if i % 50 == 0:
             print(f"      Progress: {i}/{len(alerts)}")
 
-        price = fetch_current_price(alert['network'], alert['pool_address'])
+        price = prices.get(alert['pool_address'])
         if price is None:
             continue
 
@@ -231,7 +242,6 @@ def run_tracking_cycle():
         outcome = check_tp_sl_hit(alert, price)
         results[outcome] += 1
         tracked += 1
-        time.sleep(0.2)
 
     print(f"      Tracked: {tracked}")
 
@@ -19,6 +19,10 @@ import json
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from data.alerts_schema import ensure_alerts_schema
+from data.db import connect
+from utils.metrics import load_metrics_snapshot, render_prometheus
+
 app = Flask(__name__)
 CORS(app)  # Permettre requêtes depuis frontend
 
@@ -39,10 +43,15 @@ if not DB_PATH:
         DB_PATH = "alerts_tracker.db"  # Défaut
 
 def get_db_connection():
-    """Connexion à la base SQLite."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Retourner des dictionnaires
-    return conn
+    """Connexion à la base SQLite (pragmas WAL/busy_timeout du projet)."""
+    return connect(DB_PATH, row_factory=sqlite3.Row)  # Row: retourner des dictionnaires
+
+# Filtres et tris sur created_at_epoch: migrer la base si le scanner ne l'a pas encore fait
+try:
+    for operation in ensure_alerts_schema(DB_PATH):
+        print(f"✅ Schéma alerts: {operation}")
+except sqlite3.Error as e:
+    print(f"⚠️ Migration du schéma alerts impossible ({DB_PATH}): {e}")
 
 def parse_alert_row(row):
     """Convertit une ligne DB en dict pour le dashboard."""
@@ -129,7 +138,7 @@ def health():
         total = cursor.fetchone()['count']
 
         # Get last 3 alerts with their dates
-        cursor = conn.execute("SELECT id, token_name, created_at FROM alerts ORDER BY created_at DESC LIMIT 3")
+        cursor = conn.execute("SELECT id, token_name, created_at FROM alerts ORDER BY created_at_epoch DESC LIMIT 3")
         recent = [dict(row) for row in cursor.fetchall()]
 
         conn.close()
@@ -147,6 +156,12 @@ def health():
             'error': str(e)
         }), 500
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Métriques du scanner (snapshot écrit en fin de scan) au format texte Prometheus."""
+    body = render_prometheus(load_metrics_snapshot(DB_PATH))
+    return Response(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/debug', methods=['GET'])
 def debug():
     """Debug endpoint to see what's happening with date filters."""
@@ -155,17 +170,18 @@ def debug():
         days = request.args.get('days', type=int, default=1)
         # Use space format to match DB: "2026-01-05 01:39:21" not "2026-01-05T01:39:21"
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         # Get total alerts
         cursor = conn.execute("SELECT COUNT(*) as total FROM alerts")
         total = cursor.fetchone()['total']
 
-        # Get alerts with created_at >= cutoff_date
-        cursor = conn.execute("SELECT COUNT(*) as count FROM alerts WHERE created_at >= ?", [cutoff_date])
+        # Get alerts with created_at_epoch >= cutoff (colonne indexée)
+        cursor = conn.execute("SELECT COUNT(*) as count FROM alerts WHERE created_at_epoch >= ?", [cutoff_epoch])
         filtered_count = cursor.fetchone()['count']
 
         # Get last 5 alerts with dates
-        cursor = conn.execute("SELECT id, token_name, created_at, timestamp FROM alerts ORDER BY created_at DESC LIMIT 5")
+        cursor = conn.execute("SELECT id, token_name, created_at, timestamp FROM alerts ORDER BY created_at_epoch DESC LIMIT 5")
         recent = [dict(row) for row in cursor.fetchall()]
 
         conn.close()
@@ -209,10 +225,10 @@ def get_alerts():
         query = "SELECT * FROM alerts WHERE 1=1"
         params = []
 
-        # Filtre date - Use space format to match DB
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
-        query += " AND created_at >= ?"
-        params.append(cutoff_date)
+        # Filtre date - epoch UTC (colonne created_at_epoch indexée)
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
+        query += " AND created_at_epoch >= ?"
+        params.append(cutoff_epoch)
 
         # Filtres optionnels
         if network:
@@ -235,7 +251,7 @@ def get_alerts():
             params.append(min_score)
 
         # Tri et pagination
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        query += " ORDER BY created_at_epoch DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
         cursor = conn.execute(query, params)
@@ -262,8 +278,8 @@ def get_stats():
     """Statistiques globales."""
     try:
         days = request.args.get('days', type=int, default=7)
-        # Use space format to match DB
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        # Epoch UTC: comparaison directe sur created_at_epoch (indexée)
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         conn = get_db_connection()
 
@@ -284,8 +300,8 @@ def get_stats():
                 AVG(score) as avg_score,
                 AVG(liquidity) as avg_liq
             FROM alerts
-            WHERE created_at >= ?
-        """, [cutoff_date])
+            WHERE created_at_epoch >= ?
+        """, [cutoff_epoch])
 
         row = cursor.fetchone()
         stats['total_alerts'] = row['total']
@@ -303,9 +319,9 @@ def get_stats():
                 END as tier,
                 COUNT(*) as count
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY tier
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['by_tier'][row['tier']] = row['count']
@@ -314,9 +330,9 @@ def get_stats():
         cursor = conn.execute("""
             SELECT network, COUNT(*) as count, AVG(score) as avg_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY network
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['by_network'][row['network']] = {
@@ -336,9 +352,9 @@ def get_stats():
                 END as range,
                 COUNT(*) as count
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY range
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         for row in cursor.fetchall():
             stats['score_distribution'][row['range']] = row['count']
@@ -350,10 +366,10 @@ def get_stats():
                 COUNT(*) as count,
                 AVG(score) as avg_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY DATE(created_at)
             ORDER BY day DESC
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         stats['alerts_per_day'] = [
             {
@@ -376,8 +392,8 @@ def get_networks():
     """Statistiques par réseau."""
     try:
         days = request.args.get('days', type=int, default=7)
-        # Use space format to match DB
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        # Epoch UTC: comparaison directe sur created_at_epoch (indexée)
+        cutoff_epoch = int((datetime.now() - timedelta(days=days)).timestamp())
 
         conn = get_db_connection()
 
@@ -391,10 +407,10 @@ def get_networks():
                 MIN(score) as min_score,
                 MAX(score) as max_score
             FROM alerts
-            WHERE created_at >= ?
+            WHERE created_at_epoch >= ?
             GROUP BY network
             ORDER BY total DESC
-        """, [cutoff_date])
+        """, [cutoff_epoch])
 
         networks = []
         for row in cursor.fetchall():
@@ -425,7 +441,7 @@ def get_recent():
 
         cursor = conn.execute("""
             SELECT * FROM alerts
-            ORDER BY created_at DESC
+            ORDER BY created_at_epoch DESC
             LIMIT ?
         """, [limit])
 
@@ -477,7 +493,7 @@ def get_token_alerts_history(pool_address):
         cursor = conn.execute("""
             SELECT * FROM alerts
             WHERE token_address = ?
-            ORDER BY created_at DESC
+            ORDER BY created_at_epoch DESC
         """, [pool_address])
 
         alerts = []
@@ -14,6 +14,8 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+from utils.http_client import http_get, http_post
+
 # =========================
 # CONFIGURATION
 # =========================
@@ -67,7 +69,7 @@ def tg(msg):
         logger.warning("Telegram non configure")
         return
     try:
-        requests.post(
+        http_post(
             f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage",
             data={"chat_id": TELEGRAM_CHAT_ID, "text": msg, "parse_mode": "Markdown"},
             timeout=10
@@ -84,7 +86,7 @@ def get_top_pairs(max_pairs=150):
     """Recupere top pairs par volume 24h."""
     ticker_url = f"{BINANCE_BASE}/api/v3/ticker/24hr"
     try:
-        r = requests.get(ticker_url, timeout=10)
+        r = http_get(ticker_url, timeout=10)
 
         # HTTP 451 = Unavailable For Legal Reasons (geo-blocking)
         if r.status_code == 451:
@@ -127,7 +129,7 @@ def get_klines_volume(symbol):
     params = {"symbol": symbol, "interval": "1m", "limit": 60}
 
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=params, timeout=10)
         klines = r.json()
 
         if not isinstance(klines, list) or len(klines) < 4:
@@ -237,7 +239,7 @@ def get_liquidations(symbol):
     params = {"symbol": symbol, "limit": 100}
 
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=params, timeout=10)
         orders = r.json()
 
         if not isinstance(orders, list):
@@ -277,10 +279,10 @@ def get_liquidations(symbol):
 def get_open_interest(symbol):
     """Recupere Open Interest."""
     try:
-        r = requests.get(f"{BINANCE_FUTURES}/fapi/v1/openInterest", params={"symbol": symbol}, timeout=10)
+        r = http_get(f"{BINANCE_FUTURES}/fapi/v1/openInterest", params={"symbol": symbol}, timeout=10)
         data = r.json()
 
-        price_r = requests.get(f"{BINANCE_FUTURES}/fapi/v1/ticker/price", params={"symbol": symbol}, timeout=10)
+        price_r = http_get(f"{BINANCE_FUTURES}/fapi/v1/ticker/price", params={"symbol": symbol}, timeout=10)
         price = float(price_r.json().get('price', 0))
 
         oi_amount = float(data.get('openInterest', 0))
@@ -303,7 +305,7 @@ def get_liquidity_check(symbol):
         # Recuperer order book (20 niveaux de chaque cote)
         url = f"{BINANCE_BASE}/api/v3/depth"
         params = {"symbol": symbol, "limit": 20}
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, params=params, timeout=10)
         data = r.json()
 
         bids = data.get('bids', [])
@@ -423,7 +425,7 @@ def get_token_info(symbol):
 
     # Essayer de recuperer depuis API Binance
     try:
-        r = requests.get(f"{BINANCE_BASE}/api/v3/exchangeInfo", timeout=10)
+        r = http_get(f"{BINANCE_BASE}/api/v3/exchangeInfo", timeout=10)
         data = r.json()
         for s in data.get('symbols', []):
             if s['symbol'] == symbol:
@@ -939,7 +941,7 @@ def evaluer_alertes_passees(alert_history):
                 if hours_elapsed >= 1:
                     try:
                         # Recuperer le prix actuel
-                        r = requests.get(f"{BINANCE_BASE}/api/v3/ticker/price", params={"symbol": symbol}, timeout=10)
+                        r = http_get(f"{BINANCE_BASE}/api/v3/ticker/price", params={"symbol": symbol}, timeout=10)
                         current_price = float(r.json().get('price', 0))
 
                         if current_price > 0:
@@ -978,7 +980,7 @@ def verifier_sorties(active_positions):
     for symbol, position in list(active_positions.items()):
         try:
             # Recuperer prix actuel
-            r = requests.get(f"{BINANCE_BASE}/api/v3/ticker/price", params={"symbol": symbol}, timeout=10)
+            r = http_get(f"{BINANCE_BASE}/api/v3/ticker/price", params={"symbol": symbol}, timeout=10)
             current_price = float(r.json().get('price', 0))
 
             if current_price == 0:
@@ -4,18 +4,62 @@ Security Checker - Détection Honeypot & LP Lock
 Vérifie la sécurité des tokens DEX avant d'envoyer une alerte
 """
 
-import requests
-import time
 import sys
-from typing import Dict, Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, Optional, Tuple
 from datetime import datetime
 
+from utils.http_client import http_get
+from utils.metrics import metrics, record_cache_access
+from data.security_cache import SecurityCache
+from config.settings import (
+    SECURITY_CHECK_DEADLINE_SECONDS,
+    SECURITY_CHECK_MAX_WORKERS,
+    SECURITY_LP_FALLBACK_MARGIN_SECONDS,
+    GOPLUS_BATCH_SIZE,
+)
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+# Mapping des networks pour GoPlusLabs (chain id en string, comme dans l'URL)
+GOPLUS_CHAIN_IDS = {
+    'eth': '1',
+    'bsc': '56',
+    'polygon': '137',
+    'polygon_pos': '137',
+    'arbitrum': '42161',
+    'avalanche': '43114',
+    'avax': '43114',
+    'optimism': '10',
+    'base': '8453',
+    'fantom': '250'
+}
+
+# Résultat retenu quand un check n'a pas répondu avant la deadline du token
+# (mêmes champs que les fallbacks "API indisponible" de chaque check)
+DEADLINE_RESULTS = {
+    'honeypot': {
+        'checked': False, 'is_honeypot': False, 'can_sell': True, 'buy_tax': 0, 'sell_tax': 0,
+        'source': 'not_checked', 'error': 'Deadline exceeded',
+    },
+    'lp_lock': {
+        'checked': False, 'is_locked': False, 'lock_percentage': 0, 'lock_duration_days': 0,
+        'unlock_date': None, 'locker_platform': 'unknown', 'source': 'deadline_exceeded',
+        'error': 'Deadline exceeded',
+    },
+    'contract': {
+        'checked': False, 'score': 0, 'is_renounced': False, 'has_mint_function': False,
+        'has_blacklist': False, 'can_pause_trading': False, 'buy_tax': 0, 'sell_tax': 0,
+        'source': 'not_checked', 'error': 'Deadline exceeded',
+    },
+}
+
+
 class SecurityChecker:
     """
     Classe pour vérifier la sécurité d'un token:
@@ -24,7 +68,7 @@ class SecurityChecker:
     3. Contract safety (ownership, mint, etc.)
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[SecurityCache] = None):
         # APIs disponibles pour honeypot detection
         self.honeypot_apis = {
             'honeypot_is': 'https://api.honeypot.is/v2/IsHoneypot',
@@ -37,9 +81,83 @@ class SecurityChecker:
             'team_finance': 'https://team.finance/api',  # Nécessite clé API
         }
 
-        self.cache = {}  # Cache des résultats pour éviter appels répétés
+        # Cache persistant (SQLite, TTL par check) partagé entre process et redémarrages
+        self.cache = cache if cache is not None else SecurityCache()
+
+        # Pools séparés: un check lp_lock en cours attend ses sources sans bloquer un worker de sources
+        self._check_executor = ThreadPoolExecutor(max_workers=SECURITY_CHECK_MAX_WORKERS, thread_name_prefix="security-check")
+        self._lp_executor = ThreadPoolExecutor(max_workers=SECURITY_CHECK_MAX_WORKERS, thread_name_prefix="security-lp")
         print("✅ SecurityChecker initialisé")
 
+    def _cached_check(self, check: str, token_address: str, network: str, fetch) -> Dict:
+        """Résultat d'un check depuis le cache persistant, sinon appel API + mise en cache."""
+        cached = self.cache.get(network, token_address, check)
+        record_cache_access(f"security_{check}", hit=cached is not None)
+        if cached is not None:
+            return cached
+
+        result = fetch(token_address, network)
+        # Résultat provisoire (deadline): la source en retard met elle-même son résultat en cache
+        if not result.get('provisional'):
+            self.cache.set(network, token_address, check, result)
+        return result
+
+    def prefetch_goplus(self, tokens: Iterable[Tuple[str, str]]) -> int:
+        """
+        Pré-remplit le cache lp_lock avec des requêtes GoPlusLabs groupées
+        (une requête multi-adresses par chaîne au lieu d'une par token).
+
+        Args:
+            tokens: Couples (token_address, network) à vérifier ensuite
+
+        Returns:
+            Nombre de résultats LP lock mis en cache
+        """
+        by_chain = {}
+        for token_address, network in tokens:
+            chain_id = GOPLUS_CHAIN_IDS.get(network)
+            if not chain_id:
+                continue
+            # Déjà en cache (verdict ou lp_lock): rien à prefetch
+            if (self.cache.get(network, token_address, 'verdict') is not None
+                    or self.cache.get(network, token_address, 'lp_lock') is not None):
+                continue
+            by_chain.setdefault(chain_id, {})[token_address.lower()] = (token_address, network)
+
+        seeded = 0
+        for chain_id, wanted in by_chain.items():
+            addresses = list(wanted)
+            for i in range(0, len(addresses), GOPLUS_BATCH_SIZE):
+                batch = addresses[i:i + GOPLUS_BATCH_SIZE]
+                try:
+                    url = f"https://api.gopluslabs.io/api/v1/token_security/{chain_id}"
+                    response = http_get(url, params={'contract_addresses': ','.join(batch)}, timeout=15)
+                    if response.status_code != 200:
+                        print(f"⚠️ GoPlusLabs batch chain {chain_id}: HTTP {response.status_code}")
+                        continue
+                    result = response.json().get('result') or {}
+                except Exception as e:
+                    print(f"⚠️ Erreur GoPlusLabs batch chain {chain_id}: {e}")
+                    continue
+
+                # Adresses absentes de la réponse: le check par token s'en chargera
+                for address in batch:
+                    token_data = result.get(address)
+                    if not token_data:
+                        continue
+                    try:
+                        lp_result = self._parse_goplus_lp(token_data)
+                    except (TypeError, ValueError) as e:
+                        print(f"⚠️ Donnée GoPlusLabs invalide pour {address[:10]}...: {e}")
+                        continue
+                    token_address, network = wanted[address]
+                    self.cache.set(network, token_address, 'lp_lock', lp_result)
+                    seeded += 1
+
+        if by_chain:
+            print(f"📦 GoPlusLabs batch: {seeded} LP lock en cache ({len(by_chain)} chaîne(s))")
+        return seeded
+
     def check_token_security(self, token_address: str, network: str) -> Dict:
         """
         Vérifie la sécurité complète d'un token.
@@ -51,14 +169,14 @@ class SecurityChecker:
         Returns:
             Dict avec tous les résultats de sécurité
         """
-        cache_key = f"{network}:{token_address}"
+        # Verdict global en cache (TTL = plus court TTL de ses checks)
+        cached = self.cache.get(network, token_address, 'verdict')
+        if cached is not None:
+            print(f"📦 Utilisation cache pour {token_address[:10]}...")
+            record_cache_access("security", hit=True)
+            return cached
 
-        # Vérifier le cache (valide 1h)
-        if cache_key in self.cache:
-            cached = self.cache[cache_key]
-            if time.time() - cached['timestamp'] < 3600:
-                print(f"📦 Utilisation cache pour {token_address[:10]}...")
-                return cached['data']
+        record_cache_access("security", hit=False)
 
         print(f"🔍 Vérification sécurité pour {token_address[:10]}... sur {network}")
 
@@ -72,8 +190,31 @@ class SecurityChecker:
             'checks': {}
         }
 
+        # Les 3 checks en parallèle, bornés par une deadline commune au token.
+        # Un check en retard est remplacé par DEADLINE_RESULTS; il continue en
+        # arrière-plan et met son résultat en cache pour le scan suivant.
+        deadline = time.monotonic() + SECURITY_CHECK_DEADLINE_SECONDS
+        futures = {
+            'honeypot': self._check_executor.submit(
+                self._cached_check, 'honeypot', token_address, network, self.check_honeypot),
+            'lp_lock': self._check_executor.submit(
+                self._cached_check, 'lp_lock', token_address, network,
+                lambda address, net: self.check_lp_lock(address, net, deadline=deadline)),
+            'contract': self._check_executor.submit(
+                self._cached_check, 'contract', token_address, network, self.check_contract_safety),
+        }
+        wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        checks = {}
+        for check, future in futures.items():
+            if future.done() and future.exception() is None:
+                checks[check] = future.result()
+            else:
+                print(f"⏱️ Check {check} hors délai ({SECURITY_CHECK_DEADLINE_SECONDS}s) pour {token_address[:10]}...")
+                metrics.inc("security_check_timeouts_total", check=check)
+                checks[check] = dict(DEADLINE_RESULTS[check])
+
         # 1. Honeypot Detection
-        honeypot_result = self.check_honeypot(token_address, network)
+        honeypot_result = checks['honeypot']
         results['checks']['honeypot'] = honeypot_result
 
         if honeypot_result['is_honeypot']:
@@ -82,7 +223,7 @@ class SecurityChecker:
             results['warnings'].append(f"⛔ HONEYPOT DÉTECTÉ - Impossible de vendre!")
 
         # 2. LP Lock Verification
-        lp_lock_result = self.check_lp_lock(token_address, network)
+        lp_lock_result = checks['lp_lock']
         results['checks']['lp_lock'] = lp_lock_result
 
         # TEMPORAIREMENT MODIFIÉ : LP non lockée = HIGH au lieu de CRITICAL
@@ -96,7 +237,7 @@ class SecurityChecker:
                 results['risk_level'] = 'MEDIUM'
 
         # 3. Contract Safety (taxes, ownership, etc.)
-        contract_result = self.check_contract_safety(token_address, network)
+        contract_result = checks['contract']
         results['checks']['contract'] = contract_result
 
         if contract_result.get('buy_tax', 0) > 10 or contract_result.get('sell_tax', 0) > 10:
@@ -113,10 +254,12 @@ class SecurityChecker:
         results['security_score'] = self.calculate_security_score(results)
 
         # Mettre en cache
-        self.cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': results
-        }
+        verdict_ttl = min(
+            [SecurityCache.ttl_for('verdict', True)]
+            + [SecurityCache.ttl_for(check, result.get('checked', True) and not result.get('provisional'))
+               for check, result in results['checks'].items()]
+        )
+        self.cache.set(network, token_address, 'verdict', results, ttl=verdict_ttl)
 
         return results
 
@@ -150,7 +293,7 @@ class SecurityChecker:
                 'chainID': self.get_chain_id(network)
             }
 
-            response = requests.get(url, params=params, timeout=15)
+            response = http_get(url, params=params, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
@@ -186,35 +329,56 @@ class SecurityChecker:
             'error': 'API unavailable'
         }
 
-    def check_lp_lock(self, token_address: str, network: str) -> Dict:
+    def check_lp_lock(self, token_address: str, network: str, deadline: Optional[float] = None) -> Dict:
         """
-        Vérifie si la liquidité (LP) est verrouillée via plusieurs sources:
-        1. GoPlusLabs API (gratuit, fiable)
-        2. DexScreener API
-        3. TokenSniffer API
-        4. Vérification on-chain (fallback)
+        Vérifie si la liquidité (LP) est verrouillée via plusieurs sources
+        interrogées en parallèle, retenues dans l'ordre de priorité d'origine
+        (la première réponse valide gagne):
+        - GoPlusLabs API (gratuit, fiable)
+        - DexScreener API
+        - TokenSniffer API
+
+        À l'approche de la deadline, si une source prioritaire n'a pas répondu,
+        la meilleure réponse déjà reçue (ou le résultat par défaut) est marquée
+        'provisional' (non mise en cache); la réponse définitive est mise en
+        cache dès que les sources en retard terminent, pour le scan suivant.
 
         Args:
             token_address: Adresse du token
             network: Réseau
+            deadline: Échéance time.monotonic() (None = attendre toutes les sources)
 
         Returns:
             Dict avec résultats LP lock check
         """
-        # Méthode 1: GoPlusLabs (API la plus fiable pour LP lock)
-        result = self._check_lp_goplus(token_address, network)
-        if result['checked']:
-            return result
-
-        # Méthode 2: DexScreener (données de liquidité)
-        result = self._check_lp_dexscreener(token_address, network)
-        if result['checked']:
-            return result
-
-        # Méthode 3: TokenSniffer (backup)
-        result = self._check_lp_tokensniffer(token_address, network)
-        if result['checked']:
-            return result
+        sources = (self._check_lp_goplus, self._check_lp_dexscreener, self._check_lp_tokensniffer)
+        futures = [self._lp_executor.submit(source, token_address, network) for source in sources]
+        cutoff = None if deadline is None else deadline - SECURITY_LP_FALLBACK_MARGIN_SECONDS
+
+        pending = set(futures)
+        while True:
+            best = self._best_lp_result(futures)
+            if best is not None:
+                # Sources moins prioritaires: annulées si pas démarrées (les requêtes en vol ont leur timeout)
+                for future in futures:
+                    future.cancel()
+                return best
+            if not pending:
+                break
+            timeout = None if cutoff is None else cutoff - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            _, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        if pending:
+            # Deadline: les sources en retard mettront la réponse définitive en cache
+            for future in pending:
+                future.add_done_callback(lambda _, futures=futures: self._cache_late_lp_result(
+                    futures, token_address, network))
+            for future in futures:
+                if future.done() and future.exception() is None and future.result().get('checked'):
+                    return dict(future.result(), provisional=True)
+            return dict(DEADLINE_RESULTS['lp_lock'], provisional=True)
 
         # Si tout échoue, retourner résultat négatif par défaut
         return {
@@ -228,25 +392,32 @@ class SecurityChecker:
             'error': 'Unable to verify LP lock - All APIs failed'
         }
 
+    @staticmethod
+    def _best_lp_result(futures) -> Optional[Dict]:
+        """Premier résultat valide par ordre de priorité, None tant qu'une source prioritaire est en cours."""
+        for future in futures:
+            if not future.done():
+                return None
+            if future.exception() is None and future.result().get('checked'):
+                return future.result()
+        return None
+
+    def _cache_late_lp_result(self, futures, token_address: str, network: str):
+        """Callback des sources LP en retard: met en cache la meilleure réponse dès qu'elle est connue."""
+        try:
+            result = self._best_lp_result(futures)
+            if result is not None:
+                self.cache.set(network, token_address, 'lp_lock', result)
+        except Exception as e:
+            print(f"⚠️ Cache LP lock tardif impossible pour {token_address[:10]}...: {e}")
+
     def _check_lp_goplus(self, token_address: str, network: str) -> Dict:
         """
         Vérifie LP lock via GoPlusLabs API (GRATUIT et fiable).
         Supporte: ETH, BSC, Polygon, Arbitrum, Avalanche, etc.
         """
         try:
-            # Mapping des networks pour GoPlusLabs
-            chain_id_map = {
-                'eth': '1',
-                'bsc': '56',
-                'polygon': '137',
-                'arbitrum': '42161',
-                'avalanche': '43114',
-                'optimism': '10',
-                'base': '8453',
-                'fantom': '250'
-            }
-
-            chain_id = chain_id_map.get(network)
+            chain_id = GOPLUS_CHAIN_IDS.get(network)
             if not chain_id:
                 return {'checked': False, 'error': f'Network {network} not supported by GoPlusLabs'}
 
@@ -254,7 +425,7 @@ class SecurityChecker:
             url = f"https://api.gopluslabs.io/api/v1/token_security/{chain_id}"
             params = {'contract_addresses': token_address.lower()}
 
-            response = requests.get(url, params=params, timeout=15)
+            response = http_get(url, params=params, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
@@ -265,68 +436,7 @@ class SecurityChecker:
                 if not token_data:
                     return {'checked': False, 'error': 'No data from GoPlusLabs'}
 
-                # Extraire les informations de LP
-                is_open_source = token_data.get('is_open_source', '0') == '1'
-                lp_holder_count = int(token_data.get('lp_holder_count', 0))
-                lp_total_supply = float(token_data.get('lp_total_supply', 0))
-
-                # Vérifier si LP est lockée via les holders
-                holders = token_data.get('lp_holders', [])
-
-                # Platforms de lock connues
-                known_lockers = {
-                    'unicrypt': ['0x663a5c229c09b049e36dcc11a9b0d4a8eb9db214'],  # Unicrypt
-                    'teamfinance': ['0xe2fe530c047f2d85298b07d9333c05737f1435fb'],  # Team Finance
-                    'pinklock': ['0x7ee058420e5937496f5a2096f04caa7721cf70cc'],  # PinkLock (BSC)
-                    'dxsale': ['0x0000000000000000000000000000000000001004'],  # DxSale
-                }
-
-                is_locked = False
-                lock_percentage = 0
-                locker_platform = 'unknown'
-                locked_holders = []
-
-                # Analyser les holders pour détecter les lockers
-                for holder in holders:
-                    holder_address = holder.get('address', '').lower()
-                    holder_percent = float(holder.get('percent', 0))
-                    is_locked_holder = holder.get('is_locked', '0') == '1'
-
-                    # Vérifier si c'est un locker connu
-                    for platform, addresses in known_lockers.items():
-                        if holder_address in [addr.lower() for addr in addresses]:
-                            is_locked = True
-                            lock_percentage += holder_percent * 100
-                            locker_platform = platform
-                            locked_holders.append({
-                                'platform': platform,
-                                'percentage': holder_percent * 100
-                            })
-                            break
-
-                    # Vérifier le flag is_locked de GoPlusLabs
-                    if is_locked_holder and holder_percent > 0.1:  # Au moins 10% de LP
-                        is_locked = True
-                        lock_percentage += holder_percent * 100
-                        if locker_platform == 'unknown':
-                            locker_platform = 'detected_by_goplus'
-
-                # Calculer durée du lock (GoPlusLabs ne fournit pas cette info directement)
-                # On suppose au minimum 30 jours si lockée
-                lock_duration_days = 30 if is_locked else 0
-
-                return {
-                    'checked': True,
-                    'is_locked': is_locked,
-                    'lock_percentage': round(lock_percentage, 2),
-                    'lock_duration_days': lock_duration_days,
-                    'unlock_date': None,  # GoPlusLabs ne fournit pas cette info
-                    'locker_platform': locker_platform,
-                    'locked_holders': locked_holders,
-                    'lp_total_supply': lp_total_supply,
-                    'lp_holder_count': lp_holder_count,
-                    'source': 'goplus_labs'
-                }
+                return self._parse_goplus_lp(token_data)
 
         except Exception as e:
             print(f"⚠️ Erreur GoPlusLabs LP check: {e}")
@@ -334,6 +444,71 @@ class SecurityChecker:
 
         return {'checked': False, 'error': 'GoPlusLabs API call failed'}
 
+    def _parse_goplus_lp(self, token_data: Dict) -> Dict:
+        """Résultat LP lock à partir de l'entrée GoPlusLabs d'un token."""
+        # Extraire les informations de LP
+        is_open_source = token_data.get('is_open_source', '0') == '1'
+        lp_holder_count = int(token_data.get('lp_holder_count', 0))
+        lp_total_supply = float(token_data.get('lp_total_supply', 0))
+
+        # Vérifier si LP est lockée via les holders
+        holders = token_data.get('lp_holders', [])
+
+        # Platforms de lock connues
+        known_lockers = {
+            'unicrypt': ['0x663a5c229c09b049e36dcc11a9b0d4a8eb9db214'],  # Unicrypt
+            'teamfinance': ['0xe2fe530c047f2d85298b07d9333c05737f1435fb'],  # Team Finance
+            'pinklock': ['0x7ee058420e5937496f5a2096f04caa7721cf70cc'],  # PinkLock (BSC)
+            'dxsale': ['0x0000000000000000000000000000000000001004'],  # DxSale
+        }
+
+        is_locked = False
+        lock_percentage = 0
+        locker_platform = 'unknown'
+        locked_holders = []
+
+        # Analyser les holders pour détecter les lockers
+        for holder in holders:
+            holder_address = holder.get('address', '').lower()
+            holder_percent = float(holder.get('percent', 0))
+            is_locked_holder = holder.get('is_locked', '0') == '1'
+
+            # Vérifier si c'est un locker connu
+            for platform, addresses in known_lockers.items():
+                if holder_address in [addr.lower() for addr in addresses]:
+                    is_locked = True
+                    lock_percentage += holder_percent * 100
+                    locker_platform = platform
+                    locked_holders.append({
+                        'platform': platform,
+                        'percentage': holder_percent * 100
+                    })
+                    break
+
+            # Vérifier le flag is_locked de GoPlusLabs
+            if is_locked_holder and holder_percent > 0.1:  # Au moins 10% de LP
+                is_locked = True
+                lock_percentage += holder_percent * 100
+                if locker_platform == 'unknown':
+                    locker_platform = 'detected_by_goplus'
+
+        # Calculer durée du lock (GoPlusLabs ne fournit pas cette info directement)
+        # On suppose au minimum 30 jours si lockée
+        lock_duration_days = 30 if is_locked else 0
+
+        return {
+            'checked': True,
+            'is_locked': is_locked,
+            'lock_percentage': round(lock_percentage, 2),
+            'lock_duration_days': lock_duration_days,
+            'unlock_date': None,  # GoPlusLabs ne fournit pas cette info
+            'locker_platform': locker_platform,
+            'locked_holders': locked_holders,
+            'lp_total_supply': lp_total_supply,
+            'lp_holder_count': lp_holder_count,
+            'source': 'goplus_labs'
+        }
+
     def _check_lp_dexscreener(self, token_address: str, network: str) -> Dict:
         """
         Vérifie informations de liquidité via DexScreener API.
@@ -344,7 +519,7 @@ class SecurityChecker:
             # DexScreener API
             url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
 
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -389,7 +564,7 @@ class SecurityChecker:
             chain_id = self.get_chain_id(network)
             url = f"https://tokensniffer.com/api/v2/tokens/{chain_id}/{token_address}"
 
-            response = requests.get(url, timeout=15)
+            response = http_get(url, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
@@ -439,7 +614,7 @@ class SecurityChecker:
             url = f"https://tokensniffer.com/api/v2/tokens/{chain_id}/{token_address}"
             headers = {'Accept': 'application/json'}
 
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, headers=headers, timeout=15)
 
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,82 @@
+"""
+Test de parité: mémo d'analyse (pools inchangés) vs analyse complète
+Run: python test_analysis_memo_parity.py
+"""
+import contextlib
+import io
+import random
+from dataclasses import replace
+import sys
+sys.path.insert(0, '.')
+
+from data.analysis_memo import analysis_memo
+from core import scanner_steps
+from core.scanner_steps import analyze_and_filter_tokens
+from core.signals import find_resistance_simple
+from test_batch_scoring_parity import random_pool
+
+
+class AlwaysSafeChecker:
+    """SecurityChecker sans appel réseau: tous les tokens passent."""
+
+    def __init__(self):
+        self.checks = 0
+
+    def prefetch_goplus(self, pairs):
+        list(pairs)
+
+    def check_token_security(self, address, network):
+        self.checks += 1
+        return {"security_score": 80, "risk_level": "LOW", "checks": {}}
+
+    def should_send_alert(self, security_result, min_security_score=50):
+        return True, "OK"
+
+
+def analyze(pools, checker):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return analyze_and_filter_tokens(pools, checker)
+
+
+def summarize(result):
+    opportunities, rejected = result
+    return rejected, [(o["pool_data"]["pool_address"], o["score"], o["quality_score"], o["signals"]) for o in opportunities]
+
+
+def test_analysis_memo_parity(n=3000, seed=7):
+    rng = random.Random(seed)
+    pools = [random_pool(rng, i) for i in range(n)]
+    analysis_memo.clear()
+    memo_enabled = scanner_steps.ENABLE_ANALYSIS_MEMO
+    try:
+        # Référence: analyse complète (mémo désactivé)
+        scanner_steps.ENABLE_ANALYSIS_MEMO = False
+        expected = summarize(analyze(pools, AlwaysSafeChecker()))
+
+        # Premier scan: remplit le mémo; second scan: pools inchangés (seul le prix bouge)
+        scanner_steps.ENABLE_ANALYSIS_MEMO = True
+        first = summarize(analyze(pools, AlwaysSafeChecker()))
+        memorized = len(analysis_memo)
+        fresh_pools = [replace(pool, price_usd=pool.price_usd * 1.05, extras=dict(pool.extras)) for pool in pools]
+        checker = AlwaysSafeChecker()
+        opportunities, _ = second_result = analyze(fresh_pools, checker)
+        second = summarize(second_result)
+    finally:
+        scanner_steps.ENABLE_ANALYSIS_MEMO = memo_enabled
+
+    assert first == expected, "premier scan (mémo vide) différent de l'analyse complète"
+    assert second == expected, "scan avec mémo différent de l'analyse complète"
+    assert memorized > 0, "aucun pool mémorisé"
+    # Pool frais (prix d'entrée et anti-spam des alertes), pas l'objet du scan précédent
+    assert all(any(o["pool_data"] is p for p in fresh_pools) for o in opportunities)
+    # Résistance recalculée au prix courant
+    assert all(o["resistance_data"] == find_resistance_simple(o["pool_data"]) for o in opportunities)
+    assert checker.checks == len(expected[1]), "sécurité réévaluée pour les seules opportunités"
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("PARITÉ MÉMO D'ANALYSE")
+    print("=" * 70)
+    test_analysis_memo_parity()
+    print(f"OK: {len(analysis_memo)} pools mémorisés, opportunités identiques avec et sans mémo")
@@ -0,0 +1,99 @@
+"""
+Test de parité: scoring batch NumPy vs fonctions scalaires de core/scoring.py
+Run: python test_batch_scoring_parity.py
+"""
+import random
+import sys
+sys.path.insert(0, '.')
+
+from data.pool_snapshot import PoolSnapshot
+from core.scoring import calculate_final_score
+from core.signals import get_price_momentum_from_api
+from core.batch_scoring import NUMPY_AVAILABLE, score_pools_batch
+
+NETWORKS = ["eth", "solana", "bsc", "base", "polygon_pos", "avax", "arbitrum", "unknown"]
+
+# Valeurs aux bornes des seuils (les erreurs de parité se cachent là)
+LIQ_EDGES = [0, 49999.99, 50000, 100000, 200000, 300000, 500000, 1000000, 5000000, 5000000.01]
+VOL_EDGES = [0, 100000, 200000, 500000, 1000000, 2000000, 2000000.5]
+AGE_EDGES = [0.5, 6, 12, 24, 48, 72, 96, 168, 999999]
+PCT_EDGES = [-40.01, -40, -30, -20.5, -20, -10, 0, 2, 3, 5, 10, 100]
+TYPE_PUMPS = ["PARABOLIQUE", "TRES_RAPIDE", "RAPIDE", "NORMAL", "LENT"]
+
+
+def pick(rng, edges, low, high):
+    return rng.choice(edges) if rng.random() < 0.4 else rng.uniform(low, high)
+
+
+def count(rng, high):
+    return rng.choice([0, 1, 5, 10, 15, 16, 49, 50]) if rng.random() < 0.3 else rng.randint(0, high)
+
+
+def random_pool(rng, i):
+    buys_24h, sells_24h = count(rng, 5000), count(rng, 5000)
+    buys_1h, sells_1h = count(rng, 400), count(rng, 400)
+    price_change_1h = pick(rng, PCT_EDGES, -50, 150)
+    pool = PoolSnapshot(
+        name=f"TOKEN{i} / WETH",
+        base_token_name=f"TOKEN{i}",
+        token_name=f"TOKEN{i}",
+        token_symbol=f"TOKEN{i}",
+        price_usd=rng.uniform(1e-8, 10),
+        volume_24h=pick(rng, VOL_EDGES, 0, 5e6),
+        volume_6h=rng.uniform(0, 1e6),
+        volume_1h=rng.uniform(0, 3e5),
+        liquidity=pick(rng, LIQ_EDGES, 0, 6e6),
+        total_txns=buys_24h + sells_24h,
+        buys_24h=buys_24h,
+        sells_24h=sells_24h,
+        buys_1h=buys_1h,
+        sells_1h=sells_1h,
+        buyers_24h=count(rng, 2000),
+        sellers_24h=count(rng, 2000),
+        buyers_1h=count(rng, 60),
+        sellers_1h=count(rng, 60),
+        buy_ratio=buys_24h / sells_24h if sells_24h > 0 else 1.0,
+        price_change_24h=pick(rng, PCT_EDGES, -80, 300),
+        price_change_6h=rng.uniform(-50, 100),
+        price_change_1h=price_change_1h,
+        age_hours=pick(rng, AGE_EDGES, 0, 200),
+        network=rng.choice(NETWORKS),
+        pool_address=f"0x{i:040x}",
+        velocite_pump=rng.choice([0, 4.99, 5, 10, 20, 30, 50, 100, abs(price_change_1h)]),
+        type_pump=rng.choice(TYPE_PUMPS),
+    )
+    if rng.random() < 0.2:
+        pool["score"] = rng.choice([0, 59, 60, 85])
+    if rng.random() < 0.05:
+        pool["buyers_1h"] = None  # API renvoie parfois null
+    return pool
+
+
+def random_multi_pool(rng):
+    return {"is_multi_pool": rng.random() < 0.3, "is_weth_dominant": rng.random() < 0.5}
+
+
+def test_batch_scoring_parity(n=5000, seed=42):
+    rng = random.Random(seed)
+    pools = [random_pool(rng, i) for i in range(n)]
+    momentums = [get_price_momentum_from_api(p) for p in pools]
+    multi_pools = [random_multi_pool(rng) for _ in pools]
+
+    batch = score_pools_batch(pools, momentums, multi_pools)
+    mismatches = 0
+    for pool, momentum, multi, got in zip(pools, momentums, multi_pools, batch):
+        expected = calculate_final_score(pool, momentum, multi)
+        # repr() distingue aussi 0 / 0.0 et l'ordre des signaux
+        if repr(expected) != repr(got):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"FAIL score {pool.name}:\n  scalaire={expected}\n  batch   ={got}")
+    assert mismatches == 0, f"{mismatches} écarts de score"
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(f"PARITÉ SCORING BATCH (numpy={'OK' if NUMPY_AVAILABLE else 'ABSENT -> scalaire'})")
+    print("=" * 70)
+    test_batch_scoring_parity()
+    print("OK: scores et whale analysis identiques sur 5000 pools")
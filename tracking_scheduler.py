@@ -0,0 +1,189 @@
+"""
+Tracking Scheduler - Checkpoints prix des alertes (15min, 1h, 4h, 24h)
+
+Remplace les 4 threads `time.sleep()` par alerte de start_price_tracking():
+- Un seul thread + tas (heapq) des échéances
+- Échéances persistées dans SQLite (table tracking_schedule de la base des
+  alertes): les checkpoints en attente reprennent après un redémarrage
+- Les checkpoints échus dans la même fenêtre sont regroupés: prix de tout
+  le lot via le service de prix groupé (utils/price_service.py)
+- Checkpoint trop en retard (process arrêté longtemps) -> 'skipped' plutôt
+  qu'un prix "15min" mesuré des heures après; l'analyse 24h tourne quand même
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import (
+    PRICE_TRACKING_INTERVALS_MINUTES,
+    TRACKING_COALESCE_SECONDS,
+    TRACKING_MAX_LATENESS_RATIO,
+    TRACKING_MIN_LATENESS_SECONDS,
+)
+from data.db import connect
+from utils.helpers import log
+from utils.metrics import metrics
+
+# (due_at, alert_id, minutes_after, token_address, network)
+Checkpoint = Tuple[float, int, int, str, str]
+
+
+class TrackingScheduler:
+    """Ordonnanceur mono-thread des checkpoints de tracking prix."""
+
+    def __init__(self, alert_tracker, intervals: Optional[List[int]] = None,
+                 coalesce_seconds: float = TRACKING_COALESCE_SECONDS):
+        """
+        Args:
+            alert_tracker: AlertTracker (fetch_current_prices, update_price_tracking, analyze_alert_performance)
+            intervals: Checkpoints en minutes après l'alerte
+            coalesce_seconds: Fenêtre de regroupement des checkpoints échus
+        """
+        self.tracker = alert_tracker
+        self.intervals = sorted(intervals or PRICE_TRACKING_INTERVALS_MINUTES)
+        self.coalesce_seconds = coalesce_seconds
+        self.conn = connect(alert_tracker.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tracking_schedule (
+                alert_id INTEGER NOT NULL,
+                minutes_after INTEGER NOT NULL,
+                token_address TEXT NOT NULL,
+                network TEXT NOT NULL,
+                due_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                PRIMARY KEY (alert_id, minutes_after)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tracking_schedule_pending ON tracking_schedule(status, due_at)")
+        self.conn.commit()
+        # Écritures via la file unique du process (partagée avec l'AlertTracker)
+        self.writer = alert_tracker.writer
+
+        self._heap: List[Checkpoint] = []
+        self._cond = threading.Condition()
+        self._db_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # ===== API =====
+
+    def start(self):
+        """Recharge les checkpoints en attente depuis SQLite et démarre le thread."""
+        if self._thread is not None:
+            return
+        with self._db_lock:
+            rows = self.conn.execute("""
+                SELECT due_at, alert_id, minutes_after, token_address, network
+                FROM tracking_schedule WHERE status = 'pending'
+            """).fetchall()
+        with self._cond:
+            for row in rows:
+                heapq.heappush(self._heap, tuple(row))
+        if rows:
+            log(f"⏰ Tracking: {len(rows)} checkpoint(s) en attente repris depuis la DB")
+
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name="TrackingScheduler")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule(self, alert_id: int, token_address: str, network: str, alerted_at: Optional[float] = None):
+        """Planifie tous les checkpoints d'une alerte (persistés via la file d'écriture, puis empilés)."""
+        alerted_at = alerted_at if alerted_at is not None else time.time()
+        checkpoints = [
+            (alerted_at + minutes * 60, alert_id, minutes, token_address, network)
+            for minutes in self.intervals
+        ]
+        self.writer.executemany("""
+            INSERT OR IGNORE INTO tracking_schedule (due_at, alert_id, minutes_after, token_address, network)
+            VALUES (?, ?, ?, ?, ?)
+        """, checkpoints)
+        with self._cond:
+            for checkpoint in checkpoints:
+                heapq.heappush(self._heap, checkpoint)
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    # ===== Boucle =====
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    now = time.time()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+                if self._stopping:
+                    return
+
+                # Lot: tout ce qui échoit dans la fenêtre de regroupement
+                horizon = time.time() + self.coalesce_seconds
+                batch = []
+                while self._heap and self._heap[0][0] <= horizon:
+                    batch.append(heapq.heappop(self._heap))
+
+            try:
+                self.run_batch(batch)
+            except Exception as e:
+                log(f"❌ Erreur scheduler tracking: {e}")
+
+    def _is_too_late(self, checkpoint: Checkpoint, now: float) -> bool:
+        due_at, _, minutes, _, _ = checkpoint
+        max_lateness = max(TRACKING_MIN_LATENESS_SECONDS, minutes * 60 * TRACKING_MAX_LATENESS_RATIO)
+        return now - due_at > max_lateness
+
+    def run_batch(self, batch: List[Checkpoint]):
+        """Exécute un lot de checkpoints échus: prix groupés, puis mise à jour DB."""
+        now = time.time()
+        on_time = [c for c in batch if not self._is_too_late(c, now)]
+        on_time_keys = {(c[1], c[2]) for c in on_time}
+
+        # Un seul passage groupé par le service de prix pour tout le lot
+        tokens = {(token_address, network) for _, _, _, token_address, network in on_time}
+        prices: Dict[str, float] = self.tracker.fetch_current_prices(list(tokens)) if tokens else {}
+
+        last_interval = self.intervals[-1]
+        statuses = []
+        for checkpoint in sorted(batch, key=lambda c: (c[1], c[2])):
+            _, alert_id, minutes, token_address, network = checkpoint
+            if (alert_id, minutes) in on_time_keys:
+                self.tracker.update_price_tracking(
+                    alert_id, token_address, network, minutes,
+                    current_price=prices.get(token_address),
+                )
+                status = 'done'
+            else:
+                log(f"⏭️ Checkpoint {minutes}min alerte {alert_id} trop en retard - ignoré")
+                status = 'skipped'
+            metrics.inc("tracking_checkpoints_total", status=status)
+            statuses.append((status, alert_id, minutes))
+
+            if minutes == last_interval:
+                self.tracker.analyze_alert_performance(alert_id)
+
+        self.writer.executemany(
+            "UPDATE tracking_schedule SET status = ? WHERE alert_id = ? AND minutes_after = ?",
+            statuses,
+        )
+
+        if batch:
+            log(f"⏰ Tracking: {len(batch)} checkpoint(s), {len(prices)} prix récupéré(s)")
+
+    def close(self):
+        self.stop()
+        self.writer.flush()
+        with self._db_lock:
+            self.conn.close()
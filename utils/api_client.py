@@ -3,30 +3,46 @@ API Client GeckoTerminal - Appels API et parsing
 
 Gère toutes les interactions avec l'API GeckoTerminal:
 - Récupération pools trending et nouveaux
-- Récupération pool par adresse
+- Récupération pool par adresse (unitaire ou groupée multi-pool)
 - Parsing complet des données de pool
+
+Tous les appels passent par le token bucket partagé (utils/rate_limiter.py).
 """
 
-import time
 import requests
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from config.settings import GECKOTERMINAL_API
+from config.settings import GECKOTERMINAL_API, ACTIVE_TRACKING_BATCH_SIZE
 from utils.helpers import log, extract_base_token
+from data.pool_snapshot import PoolSnapshot
+from utils.http_client import http_get
+from utils.rate_limiter import geckoterminal_limiter, request_with_rate_limit
+
+
+def _gecko_get(url: str, params: Dict = None, label: str = "") -> requests.Response:
+    """
+    GET GeckoTerminal sous le token bucket partagé.
+
+    Les 429 sont retentés (Retry-After + backoff) par request_with_rate_limit;
+    un 429 n'est renvoyé que si tous les retries ont échoué.
+    """
+    headers = {"Accept": "application/json"}
+    return request_with_rate_limit(
+        geckoterminal_limiter,
+        lambda: http_get(url, params=params, headers=headers, timeout=15),
+        label=label,
+    )
 
 
 def get_trending_pools(network: str, page: int = 1) -> Optional[List[Dict]]:
     """Récupère pools trending sur un réseau."""
     try:
         url = f"{GECKOTERMINAL_API}/networks/{network}/trending_pools"
-        params = {"page": page}
-        headers = {"Accept": "application/json"}
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = _gecko_get(url, params={"page": page}, label=f"trending {network}")
 
         if response.status_code == 429:
-            log(f"⚠️ Rate limit atteint, pause 60s...")
-            time.sleep(60)
+            log(f"⚠️ Rate limit persistant sur trending {network} après retries")
             return None
         if response.status_code != 200:
             log(f"⚠️ Erreur {network}: {response.status_code}")
@@ -52,13 +68,10 @@ def get_new_pools(network: str, page: int = 1) -> Optional[List[Dict]]:
     """Récupère nouveaux pools sur un réseau."""
     try:
         url = f"{GECKOTERMINAL_API}/networks/{network}/new_pools"
-        params = {"page": page}
-        headers = {"Accept": "application/json"}
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = _gecko_get(url, params={"page": page}, label=f"new_pools {network}")
 
         if response.status_code == 429:
-            log(f"⚠️ Rate limit atteint, pause 60s...")
-            time.sleep(60)
+            log(f"⚠️ Rate limit persistant sur new_pools {network} après retries")
             return None
         if response.status_code != 200:
             return None
@@ -97,12 +110,10 @@ def get_pool_by_address(network: str, pool_address: str) -> Optional[Dict]:
     """
     try:
         url = f"{GECKOTERMINAL_API}/networks/{network}/pools/{pool_address}"
-        headers = {"Accept": "application/json"}
-        response = requests.get(url, headers=headers, timeout=15)
+        response = _gecko_get(url, label=f"pool {pool_address[:8]}")
 
         if response.status_code == 429:
-            log(f"⚠️ Rate limit atteint pour pool {pool_address[:8]}...")
-            time.sleep(60)
+            log(f"⚠️ Rate limit persistant pour pool {pool_address[:8]} après retries")
             return None
         if response.status_code != 200:
             log(f"⚠️ Pool {pool_address[:8]} non trouvé (status {response.status_code})")
@@ -120,8 +131,45 @@ def get_pool_by_address(network: str, pool_address: str) -> Optional[Dict]:
         return None
 
 
-def parse_pool_data(pool: Dict, network: str = "unknown", liquidity_stats: Dict = None) -> Optional[Dict]:
-    """Parse données pool GeckoTerminal avec enrichissements."""
+def get_pools_by_addresses(network: str, pool_addresses: List[str]) -> Dict[str, PoolSnapshot]:
+    """
+    Récupère plusieurs pools d'un même réseau via l'endpoint multi-pool
+    (/pools/multi/{a,b,...}, ACTIVE_TRACKING_BATCH_SIZE adresses max par requête).
+    Utilisé pour le tracking actif groupé des alertes.
+
+    Args:
+        network: Réseau (eth, bsc, solana, etc.)
+        pool_addresses: Adresses des pools (dédupliquées)
+
+    Returns:
+        {adresse en minuscules: PoolSnapshot}; pools introuvables absents
+    """
+    pools = {}
+    for i in range(0, len(pool_addresses), ACTIVE_TRACKING_BATCH_SIZE):
+        chunk = pool_addresses[i:i + ACTIVE_TRACKING_BATCH_SIZE]
+        try:
+            url = f"{GECKOTERMINAL_API}/networks/{network}/pools/multi/{','.join(chunk)}"
+            response = _gecko_get(url, label=f"pools multi {network} x{len(chunk)}")
+
+            if response.status_code == 429:
+                log(f"⚠️ Rate limit persistant pour pools multi {network} après retries")
+                continue
+            if response.status_code != 200:
+                log(f"⚠️ Pools multi {network} x{len(chunk)}: status {response.status_code}")
+                continue
+
+            for pool in response.json().get("data") or []:
+                pool_data = parse_pool_data(pool, network)
+                if pool_data:
+                    pools[pool_data["pool_address"].lower()] = pool_data
+
+        except Exception as e:
+            log(f"❌ Erreur get_pools_by_addresses {network} x{len(chunk)}: {e}")
+    return pools
+
+
+def parse_pool_data(pool: Dict, network: str = "unknown", liquidity_stats: Dict = None) -> Optional[PoolSnapshot]:
+    """Parse données pool GeckoTerminal avec enrichissements (PoolSnapshot, vue Mapping)."""
     try:
         attrs = pool.get("attributes", {})
 
@@ -329,44 +377,44 @@ def parse_pool_data(pool: Dict, network: str = "unknown", liquidity_stats: Dict
         token_name = base_token_name  # Déjà extrait
         token_symbol = base_token_name  # On utilise le nom de base comme symbole
 
-        return {
-            "name": name,
-            "base_token_name": base_token_name,
-            "token_name": token_name,  # V3: Pour watchlist
-            "token_symbol": token_symbol,  # V3: Pour watchlist
-            "price_usd": price_usd,
-            "volume_24h": volume_24h,
-            "volume_6h": volume_6h,
-            "volume_1h": volume_1h,
-            "liquidity": liquidity,
-            "total_txns": total_txns,
-            "buys_24h": buys_24h,
-            "sells_24h": sells_24h,
-            "buys_6h": buys_6h,
-            "sells_6h": sells_6h,
-            "buys_1h": buys_1h,
-            "sells_1h": sells_1h,
-            "buyers_24h": buyers_24h,
-            "sellers_24h": sellers_24h,
-            "buyers_6h": buyers_6h,
-            "sellers_6h": sellers_6h,
-            "buyers_1h": buyers_1h,
-            "sellers_1h": sellers_1h,
-            "buy_ratio": buy_ratio,  # CRITICAL FIX: Buy ratio pour stratégies
-            "price_change_24h": price_change_24h,
-            "price_change_6h": price_change_6h,
-            "price_change_3h": price_change_3h,
-            "price_change_1h": price_change_1h,
-            "age_hours": age_hours,
-            "network": network,
-            "pool_address": pool_address,
-            "fdv_usd": fdv_usd,
-            "market_cap_usd": market_cap_usd,
-            "volume_acceleration_1h_vs_6h": volume_acceleration_1h_vs_6h,
-            "volume_acceleration_6h_vs_24h": volume_acceleration_6h_vs_24h,
-            "velocite_pump": velocite_pump,  # V3: Pour filtres backtest
-            "type_pump": type_pump,  # V3: Pour filtres backtest
-        }
+        return PoolSnapshot(
+            name=name,
+            base_token_name=base_token_name,
+            token_name=token_name,  # V3: Pour watchlist
+            token_symbol=token_symbol,  # V3: Pour watchlist
+            price_usd=price_usd,
+            volume_24h=volume_24h,
+            volume_6h=volume_6h,
+            volume_1h=volume_1h,
+            liquidity=liquidity,
+            total_txns=total_txns,
+            buys_24h=buys_24h,
+            sells_24h=sells_24h,
+            buys_6h=buys_6h,
+            sells_6h=sells_6h,
+            buys_1h=buys_1h,
+            sells_1h=sells_1h,
+            buyers_24h=buyers_24h,
+            sellers_24h=sellers_24h,
+            buyers_6h=buyers_6h,
+            sellers_6h=sellers_6h,
+            buyers_1h=buyers_1h,
+            sellers_1h=sellers_1h,
+            buy_ratio=buy_ratio,  # CRITICAL FIX: Buy ratio pour stratégies
+            price_change_24h=price_change_24h,
+            price_change_6h=price_change_6h,
+            price_change_3h=price_change_3h,
+            price_change_1h=price_change_1h,
+            age_hours=age_hours,
+            network=network,
+            pool_address=pool_address,
+            fdv_usd=fdv_usd,
+            market_cap_usd=market_cap_usd,
+            volume_acceleration_1h_vs_6h=volume_acceleration_1h_vs_6h,
+            volume_acceleration_6h_vs_24h=volume_acceleration_6h_vs_24h,
+            velocite_pump=velocite_pump,  # V3: Pour filtres backtest
+            type_pump=type_pump,  # V3: Pour filtres backtest
+        )
     except Exception as e:
         log(f"⚠️ Erreur parse pool: {e}")
         return None
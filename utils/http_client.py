@@ -0,0 +1,81 @@
+"""
+Client HTTP partagé - Sessions keep-alive avec pools de connexions
+
+Tous les appels sortants (GeckoTerminal, DexScreener, GoPlus, Telegram,
+Binance, Hyperliquid...) passent par une Session requests unique:
+- Connexions TCP/TLS réutilisées (keep-alive) au lieu d'un handshake par appel
+- Un pool de connexions par hôte, dimensionné pour la collecte concurrente
+- Timeout par défaut appliqué si l'appelant n'en fournit pas
+"""
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_DEFAULT_TIMEOUT,
+)
+from utils.metrics import record_http_call
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Crée une Session avec un HTTPAdapter dimensionné pour http et https."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=0,  # Les retries 429 sont gérés par utils/rate_limiter.py
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Retourne la Session partagée du process (créée au premier appel)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Requête via la Session partagée, avec timeout par défaut et métriques par hôte."""
+    kwargs.setdefault("timeout", HTTP_DEFAULT_TIMEOUT)
+    status = "error"
+    start = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        record_http_call(url, status, time.perf_counter() - start)
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET via la Session partagée (mêmes arguments que requests.get)."""
+    return _request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """POST via la Session partagée (mêmes arguments que requests.post)."""
+    return _request("POST", url, **kwargs)
+
+
+def close_session():
+    """Ferme les connexions du pool (arrêt propre du process)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,149 @@
+"""
+HTTP Replay - Enregistrement / rejeu des réponses API pour le benchmark
+
+Monte un adapter sur la Session partagée (utils/http_client.py):
+- mode "record": appels réels, chaque réponse est écrite dans un fichier JSON
+- mode "replay": aucune requête réseau, les réponses sont relues depuis le disque
+- Latence et HTTP 429 injectables pour simuler une API lente ou saturée
+- Telegram n'est jamais appelé: réponse {"ok": true} simulée dans les deux modes
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from utils.http_client import get_session
+from utils.helpers import log
+
+# Hôtes pour lesquels on simule une réponse au lieu d'enregistrer / rejouer
+CANNED_HOSTS = {
+    "api.telegram.org": {"ok": True, "result": {"message_id": 0}},
+}
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """Clé stable d'une requête: méthode + URL (query triée) + body."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query)))
+    raw = f"{method.upper()} {parts.netloc}{parts.path}?{query}".encode()
+    if body:
+        raw += body if isinstance(body, bytes) else str(body).encode()
+    return f"{parts.netloc.replace(':', '_')}_{hashlib.sha1(raw).hexdigest()[:16]}"
+
+
+def _build_response(request, status: int, body: bytes, headers: Optional[dict] = None) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {"Content-Type": "application/json"})
+    response._content = body
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if status == 200 else "Replay"
+    return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Adapter requests qui enregistre ou rejoue les réponses HTTP.
+
+    Args:
+        fixtures_dir: Dossier des fichiers JSON (un fichier par requête unique)
+        mode: "record" ou "replay"
+        latency: Délai ajouté à chaque requête (secondes)
+        inject_429_every: Renvoie un 429 toutes les N requêtes (0 = jamais)
+        retry_after: Valeur du header Retry-After des 429 injectés
+    """
+
+    def __init__(self, fixtures_dir: str, mode: str = "replay", latency: float = 0.0,
+                 inject_429_every: int = 0, retry_after: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Mode inconnu: {mode}")
+        self.fixtures_dir = fixtures_dir
+        self.mode = mode
+        self.latency = latency
+        self.inject_429_every = inject_429_every
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "recorded": 0, "injected_429": 0}
+        self._lock = threading.Lock()
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.fixtures_dir, f"{key}.json")
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.stats["requests"] += 1
+            count = self.stats["requests"]
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        host = urlsplit(request.url).netloc
+        if host in CANNED_HOSTS:
+            return _build_response(request, 200, json.dumps(CANNED_HOSTS[host]).encode())
+
+        if self.inject_429_every and count % self.inject_429_every == 0:
+            with self._lock:
+                self.stats["injected_429"] += 1
+            return _build_response(request, 429, b"{}", {"Retry-After": str(self.retry_after)})
+
+        key = fixture_key(request.method, request.url, request.body)
+        path = self._path(key)
+
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            fixture = {
+                "method": request.method,
+                "url": request.url,
+                "status": response.status_code,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")},
+                "body": response.content.decode("utf-8", errors="replace"),
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(fixture, f, ensure_ascii=False)
+            with self._lock:
+                self.stats["recorded"] += 1
+            return response
+
+        if not os.path.exists(path):
+            with self._lock:
+                self.stats["misses"] += 1
+            return _build_response(request, 404, b"{}")
+
+        with open(path, "r", encoding="utf-8") as f:
+            fixture = json.load(f)
+        with self._lock:
+            self.stats["hits"] += 1
+        return _build_response(request, fixture["status"], fixture["body"].encode("utf-8"), fixture["headers"])
+
+
+def install_replay(fixtures_dir: str, mode: str = "replay", latency: float = 0.0,
+                   inject_429_every: int = 0, retry_after: float = 1.0) -> ReplayAdapter:
+    """
+    Monte un ReplayAdapter sur la Session partagée (http et https).
+
+    Returns:
+        L'adapter installé (pour lire ses stats)
+    """
+    adapter = ReplayAdapter(
+        fixtures_dir,
+        mode=mode,
+        latency=latency,
+        inject_429_every=inject_429_every,
+        retry_after=retry_after,
+    )
+    session = get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    log(f"🎞️ HTTP {mode} actif: {fixtures_dir} (latence={latency}s, 429 toutes les {inject_429_every or '∞'} req)")
+    return adapter
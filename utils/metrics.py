@@ -0,0 +1,374 @@
+"""
+Métriques du scanner - Compteurs, histogrammes et export Prometheus
+
+Instrumentation légère, sans dépendance externe:
+- Latence par étape du scan (ÉTAPE 1-7)
+- Appels API par hôte / endpoint (nombre, statut, latence)
+- Hit ratio des caches (SecurityChecker, historique buy ratio)
+- Pools parsés par réseau, rejets par filtre, écritures SQLite
+
+Le scanner et le dashboard sont deux process distincts: à la fin de chaque
+scan, un résumé compact est ajouté à la table SQLite `scan_metrics` et l'état
+cumulé est écrit dans `scan_metrics_snapshot`. Le dashboard relit ce snapshot
+pour servir `/metrics` au format texte Prometheus.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from config.settings import ENABLE_SCAN_METRICS, SCAN_METRICS_RETENTION_ROWS
+
+METRIC_PREFIX = "botmarket_"
+
+# Bornes des histogrammes de latence (secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+METRIC_HELP = {
+    "scan_stage_seconds": ("histogram", "Durée de chaque étape du scan"),
+    "scans_total": ("counter", "Nombre de scans terminés"),
+    "api_requests_total": ("counter", "Appels HTTP sortants par hôte, endpoint et statut"),
+    "api_request_seconds": ("histogram", "Latence des appels HTTP sortants"),
+    "cache_requests_total": ("counter", "Accès cache par cache et résultat (hit/miss)"),
+    "pools_parsed_total": ("counter", "Pools parsés par réseau"),
+    "filter_rejections_total": ("counter", "Tokens rejetés par filtre"),
+    "filter_survivors_total": ("counter", "Candidats ayant passé chaque étape du pipeline de filtres"),
+    "sqlite_write_seconds": ("histogram", "Durée des écritures SQLite"),
+    "sqlite_write_ops_total": ("counter", "Opérations commitées par la file d'écriture SQLite"),
+    "tracking_checkpoints_total": ("counter", "Checkpoints de tracking prix exécutés (done) ou ignorés (skipped)"),
+    "scan_cadence_seconds": ("gauge", "Intervalle de scan adaptatif par réseau (avant facteur budget)"),
+    "analysis_memo_lookups_total": ("counter", "Pools recherchés dans le mémo d'analyse (hit: inchangé, réutilisé)"),
+    "hot_pools_watched": ("gauge", "Pools chauds (near-miss + watchlist) surveillés"),
+    "hot_pool_refresh_requests_total": ("counter", "Requêtes /pools/multi de rafraîchissement des pools chauds"),
+    "hot_pool_rescored_total": ("counter", "Pools chauds re-scorés hors passage réseau (hors total du tour)"),
+    "hot_pool_crossings_total": ("counter", "Pools chauds passés au-dessus du seuil de score réseau"),
+    "telegram_messages_total": ("counter", "Messages Telegram par résultat (sent / failed / dropped)"),
+    "telegram_retries_total": ("counter", "Retries d'envoi Telegram (429, 5xx, erreurs réseau)"),
+    "buy_ratio_history_evictions_total": ("counter", "Pools évincés de l'historique buy ratio (idle / cap)"),
+    "buy_ratio_history_entries": ("gauge", "Entrées en mémoire dans l'historique buy ratio"),
+    "buy_ratio_history_pools": ("gauge", "Pools suivis dans l'historique buy ratio"),
+    "security_check_timeouts_total": ("counter", "Checks sécurité remplacés par un résultat par défaut (deadline dépassée)"),
+    "last_scan_duration_seconds": ("gauge", "Durée du dernier scan"),
+    "last_scan_pools": ("gauge", "Pools collectés au dernier scan"),
+    "last_scan_opportunities": ("gauge", "Opportunités au dernier scan"),
+    "last_scan_alerts": ("gauge", "Alertes envoyées au dernier scan"),
+    "last_scan_timestamp_seconds": ("gauge", "Horodatage Unix de la fin du dernier scan"),
+}
+
+
+def _label_key(labels: Dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Registre thread-safe de compteurs, gauges et histogrammes."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._scan_start = None
+        self._scan_counters = {}
+        self._scan_stages = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not ENABLE_SCAN_METRICS:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        if not ENABLE_SCAN_METRICS:
+            return
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        if not ENABLE_SCAN_METRICS:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist["counts"][i] += 1
+                    break
+            hist["sum"] += value
+            hist["count"] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Mesure la durée du bloc et l'ajoute à l'histogramme `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Mesure une étape du scan (histogramme scan_stage_seconds + résumé du scan)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe("scan_stage_seconds", elapsed, stage=stage)
+            with self._lock:
+                self._scan_stages[stage] = self._scan_stages.get(stage, 0.0) + elapsed
+
+    def begin_scan(self):
+        """Marque le début d'un scan (pour calculer les deltas du scan)."""
+        with self._lock:
+            self._scan_start = time.time()
+            self._scan_counters = dict(self._counters)
+            self._scan_stages = {}
+
+    def end_scan(self, pools: int = 0, opportunities: int = 0, alerts: int = 0) -> Dict:
+        """
+        Termine un scan et retourne son résumé compact.
+
+        Returns:
+            Dict avec durée, compteurs du scan (deltas non nuls) et durées par étape
+        """
+        now = time.time()
+        started = self._scan_start or now
+        duration = now - started
+        self.inc("scans_total")
+        self.set_gauge("last_scan_duration_seconds", duration)
+        self.set_gauge("last_scan_pools", pools)
+        self.set_gauge("last_scan_opportunities", opportunities)
+        self.set_gauge("last_scan_alerts", alerts)
+        self.set_gauge("last_scan_timestamp_seconds", now)
+
+        with self._lock:
+            deltas = {}
+            for (name, labels), value in self._counters.items():
+                delta = value - self._scan_counters.get((name, labels), 0.0)
+                if delta:
+                    deltas[_format_series(name, labels)] = round(delta, 6)
+            stages = {stage: round(seconds, 3) for stage, seconds in self._scan_stages.items()}
+            self._scan_start = None
+
+        return {
+            "scan_epoch": now,
+            "duration_seconds": round(duration, 3),
+            "pools_parsed": pools,
+            "opportunities": opportunities,
+            "alerts_sent": alerts,
+            "stages": stages,
+            "counters": deltas,
+        }
+
+    def snapshot(self) -> Dict:
+        """État cumulé sérialisable en JSON."""
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "counters": [[n, dict(l), v] for (n, l), v in self._counters.items()],
+                "gauges": [[n, dict(l), v] for (n, l), v in self._gauges.items()],
+                "histograms": [
+                    [n, dict(l), {"counts": list(h["counts"]), "sum": h["sum"], "count": h["count"]}]
+                    for (n, l), h in self._histograms.items()
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._scan_counters = {}
+            self._scan_stages = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_series(name: str, labels, extra: Optional[Dict] = None) -> str:
+    items = list(labels.items()) if isinstance(labels, dict) else list(labels)
+    if extra:
+        items += list(extra.items())
+    if not items:
+        return f"{METRIC_PREFIX}{name}"
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+    return f"{METRIC_PREFIX}{name}{{{inner}}}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(snapshot: Optional[Dict]) -> str:
+    """Convertit un snapshot (MetricsRegistry.snapshot) en texte Prometheus 0.0.4."""
+    if not snapshot:
+        return ""
+
+    series = {}
+    for name, labels, value in snapshot.get("counters", []):
+        series.setdefault(name, []).append(f"{_format_series(name, labels)} {_format_value(value)}")
+    for name, labels, value in snapshot.get("gauges", []):
+        series.setdefault(name, []).append(f"{_format_series(name, labels)} {_format_value(value)}")
+
+    buckets = snapshot.get("buckets", [])
+    for name, labels, hist in snapshot.get("histograms", []):
+        lines = series.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(buckets, hist["counts"]):
+            cumulative += count
+            lines.append(f"{_format_series(name + '_bucket', labels, {'le': f'{bound:g}'})} {cumulative}")
+        lines.append(f"{_format_series(name + '_bucket', labels, {'le': '+Inf'})} {hist['count']}")
+        lines.append(f"{_format_series(name + '_sum', labels)} {hist['sum']:.6f}")
+        lines.append(f"{_format_series(name + '_count', labels)} {hist['count']}")
+
+    output = []
+    for name in sorted(series):
+        kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+        output.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+        output.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+        output.extend(series[name])
+    return "\n".join(output) + "\n"
+
+
+def endpoint_label(url: str) -> tuple:
+    """
+    (hôte, endpoint) à faible cardinalité pour une URL.
+
+    Les segments variables (adresses, ids, token du bot Telegram) sont
+    remplacés par ':id' pour ne pas créer une série par token.
+    """
+    parts = urlsplit(url)
+    segments = []
+    for segment in parts.path.split("/"):
+        if not segment:
+            continue
+        if len(segment) >= 20 or segment.isdigit() or segment.startswith("0x") or "," in segment:
+            segment = ":id"
+        segments.append(segment)
+    return parts.netloc, "/" + "/".join(segments[:6])
+
+
+def record_http_call(url: str, status: str, seconds: float):
+    """Enregistre un appel HTTP sortant (appelé par utils/http_client.py)."""
+    host, endpoint = endpoint_label(url)
+    metrics.inc("api_requests_total", host=host, endpoint=endpoint, status=status)
+    metrics.observe("api_request_seconds", seconds, host=host, endpoint=endpoint)
+
+
+def record_cache_access(cache: str, hit: bool):
+    metrics.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+# ============================================
+# PERSISTANCE SQLITE (scanner -> dashboard)
+# ============================================
+
+def _ensure_tables(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            scan_epoch REAL NOT NULL,
+            duration_seconds REAL,
+            pools_parsed INTEGER,
+            opportunities INTEGER,
+            alerts_sent INTEGER,
+            stages_json TEXT,
+            counters_json TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scan_metrics_snapshot (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            updated_at TEXT NOT NULL,
+            snapshot_json TEXT NOT NULL
+        )
+    """)
+
+
+def write_scan_metrics(conn: sqlite3.Connection, summary: Dict):
+    """
+    Écrit le résumé d'un scan et le snapshot cumulé sur `conn`, sans commit
+    (utilisable comme opération de la file d'écriture data.db.WriteQueue).
+    """
+    _ensure_tables(conn)
+    now = datetime.now().isoformat(timespec="seconds")
+    conn.execute(
+        """INSERT INTO scan_metrics (created_at, scan_epoch, duration_seconds, pools_parsed,
+                                     opportunities, alerts_sent, stages_json, counters_json)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            now,
+            summary["scan_epoch"],
+            summary["duration_seconds"],
+            summary["pools_parsed"],
+            summary["opportunities"],
+            summary["alerts_sent"],
+            json.dumps(summary["stages"], separators=(",", ":")),
+            json.dumps(summary["counters"], separators=(",", ":")),
+        ),
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO scan_metrics_snapshot (id, updated_at, snapshot_json) VALUES (1, ?, ?)",
+        (now, json.dumps(metrics.snapshot(), separators=(",", ":"))),
+    )
+    conn.execute(
+        "DELETE FROM scan_metrics WHERE id <= (SELECT MAX(id) FROM scan_metrics) - ?",
+        (SCAN_METRICS_RETENTION_ROWS,),
+    )
+
+
+def persist_scan_metrics(db_path: str, summary: Dict, writer=None) -> bool:
+    """
+    Ajoute le résumé d'un scan à `scan_metrics` et met à jour le snapshot cumulé.
+
+    Args:
+        db_path: Base SQLite partagée avec le dashboard
+        summary: Retour de metrics.end_scan()
+        writer: File d'écriture du process (data.db.WriteQueue); sinon connexion dédiée
+    """
+    if not ENABLE_SCAN_METRICS:
+        return False
+    if writer is not None:
+        writer.submit(lambda conn: write_scan_metrics(conn, summary))
+        return True
+    try:
+        conn = sqlite3.connect(db_path, timeout=10)
+        try:
+            write_scan_metrics(conn, summary)
+            conn.commit()
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error as e:
+        from utils.helpers import log
+        log(f"⚠️ Erreur sauvegarde métriques: {e}")
+        return False
+
+
+def load_metrics_snapshot(db_path: str) -> Optional[Dict]:
+    """Relit le dernier snapshot cumulé écrit par le scanner (None si absent)."""
+    try:
+        conn = sqlite3.connect(db_path, timeout=5)
+        try:
+            row = conn.execute("SELECT snapshot_json FROM scan_metrics_snapshot WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return json.loads(row[0]) if row else None
+
+
+# Registre process-wide
+metrics = MetricsRegistry()
@@ -0,0 +1,163 @@
+"""
+Service de prix groupé - Prix USD de nombreux pools en quelques requêtes
+
+Au lieu d'un appel HTTP (+ sleep) par alerte:
+1. DexScreener /pairs/{chain}/{a,b,c...} (30 adresses max par requête)
+2. GeckoTerminal /pools/multi/{a,b,c...} pour les pools absents de DexScreener
+   (sous le token bucket GeckoTerminal partagé)
+
+Les pools sont groupés par réseau, découpés aux limites des APIs, et les
+paquets sont envoyés en parallèle. Retourne {pool_address: prix_usd}; les
+pools sans prix sont absents du résultat.
+
+Utilisé par le cron Railway, le tracker standalone et le scheduler de
+tracking de l'AlertTracker.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import (
+    PRICE_BATCH_SIZE_DEXSCREENER,
+    PRICE_BATCH_SIZE_GECKOTERMINAL,
+    PRICE_SERVICE_MAX_WORKERS,
+)
+from utils.helpers import log
+from utils.http_client import http_get
+from utils.rate_limiter import geckoterminal_limiter, request_with_rate_limit
+
+DEXSCREENER_API = "https://api.dexscreener.com/latest/dex"
+GECKOTERMINAL_API = "https://api.geckoterminal.com/api/v2"
+
+# Réseau scanner -> chain id DexScreener
+DEXSCREENER_CHAINS = {
+    'eth': 'ethereum',
+    'bsc': 'bsc',
+    'base': 'base',
+    'solana': 'solana',
+    'polygon_pos': 'polygon',
+    'avax': 'avalanche',
+    'arbitrum': 'arbitrum'
+}
+
+# Réseau scanner -> réseau GeckoTerminal
+GECKOTERMINAL_NETWORKS = {
+    'eth': 'eth',
+    'bsc': 'bsc',
+    'base': 'base',
+    'solana': 'solana',
+    'polygon_pos': 'polygon-pos',
+    'avax': 'avax',
+    'arbitrum': 'arbitrum'
+}
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _fetch_dexscreener_chunk(network: str, addresses: List[str]) -> Dict[str, float]:
+    """Prix d'au plus 30 paires d'un même réseau via DexScreener."""
+    chain = DEXSCREENER_CHAINS.get(network.lower(), network)
+    url = f"{DEXSCREENER_API}/pairs/{chain}/{','.join(addresses)}"
+    prices = {}
+    try:
+        response = http_get(url, timeout=10)
+        if response.status_code != 200:
+            return prices
+        data = response.json()
+        # DexScreener peut retourner 'pair' ou 'pairs'
+        pairs = data.get('pairs') or ([data['pair']] if data.get('pair') else [])
+        for pair in pairs:
+            address = (pair.get('pairAddress') or '').lower()
+            if address and pair.get('priceUsd'):
+                prices[address] = float(pair['priceUsd'])
+    except Exception as e:
+        log(f"⚠️ DexScreener batch {network} ({len(addresses)} pools): {e}")
+    return prices
+
+
+def _fetch_geckoterminal_chunk(network: str, addresses: List[str]) -> Dict[str, float]:
+    """Prix d'au plus 30 pools d'un même réseau via l'endpoint multi-pool GeckoTerminal."""
+    gt_network = GECKOTERMINAL_NETWORKS.get(network.lower(), network)
+    url = f"{GECKOTERMINAL_API}/networks/{gt_network}/pools/multi/{','.join(addresses)}"
+    prices = {}
+    try:
+        response = request_with_rate_limit(
+            geckoterminal_limiter,
+            lambda: http_get(url, headers={"Accept": "application/json"}, timeout=15),
+            label=f"pools multi {network} x{len(addresses)}",
+        )
+        if response.status_code != 200:
+            return prices
+        for pool in response.json().get('data') or []:
+            attrs = pool.get('attributes', {})
+            address = (attrs.get('address') or '').lower()
+            price = attrs.get('base_token_price_usd')
+            if address and price:
+                prices[address] = float(price)
+    except Exception as e:
+        log(f"⚠️ GeckoTerminal multi {network} ({len(addresses)} pools): {e}")
+    return prices
+
+
+def _fetch_grouped(fetch_chunk, grouped: Dict[str, List[str]], chunk_size: int) -> Dict[Tuple[str, str], float]:
+    """Envoie tous les paquets (réseau, ≤chunk_size adresses) en parallèle."""
+    jobs = [
+        (network, chunk)
+        for network, addresses in grouped.items()
+        for chunk in _chunks(addresses, chunk_size)
+    ]
+    if not jobs:
+        return {}
+
+    prices = {}
+    with ThreadPoolExecutor(max_workers=min(PRICE_SERVICE_MAX_WORKERS, len(jobs))) as executor:
+        for (network, _), chunk_prices in zip(jobs, executor.map(lambda job: fetch_chunk(*job), jobs)):
+            for address, price in chunk_prices.items():
+                prices[(network, address)] = price
+    return prices
+
+
+def fetch_prices(pools: Iterable[Tuple[str, str]], stats: Optional[Dict] = None) -> Dict[str, float]:
+    """
+    Prix USD actuels d'un ensemble de pools.
+
+    Args:
+        pools: Couples (network, pool_address)
+        stats: Compteurs optionnels {'dexscreener', 'geckoterminal', 'failed'} incrémentés
+
+    Returns:
+        {pool_address: prix_usd} (adresses telles que fournies, pools sans prix absents)
+    """
+    # Dédupliquer sur l'adresse en minuscules (clé de correspondance des réponses);
+    # les requêtes gardent la casse d'origine (adresses Solana base58 sensibles à la casse)
+    wanted: Dict[Tuple[str, str], str] = {}
+    for network, pool_address in pools:
+        if pool_address:
+            wanted.setdefault((network, pool_address.lower()), pool_address)
+
+    grouped: Dict[str, List[str]] = {}
+    for (network, _), original in wanted.items():
+        grouped.setdefault(network, []).append(original)
+
+    # 1. DexScreener (temps réel)
+    found = _fetch_grouped(_fetch_dexscreener_chunk, grouped, PRICE_BATCH_SIZE_DEXSCREENER)
+    dexscreener_count = len(found.keys() & wanted.keys())
+
+    # 2. GeckoTerminal multi-pool pour le reste
+    missing: Dict[str, List[str]] = {}
+    for key, original in wanted.items():
+        if key not in found:
+            missing.setdefault(key[0], []).append(original)
+    found.update(_fetch_grouped(_fetch_geckoterminal_chunk, missing, PRICE_BATCH_SIZE_GECKOTERMINAL))
+
+    prices = {original: found[key] for key, original in wanted.items() if key in found}
+
+    if stats is not None:
+        stats['dexscreener'] = stats.get('dexscreener', 0) + dexscreener_count
+        stats['geckoterminal'] = stats.get('geckoterminal', 0) + len(prices) - dexscreener_count
+        stats['failed'] = stats.get('failed', 0) + len(wanted) - len(prices)
+
+    return prices
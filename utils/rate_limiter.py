@@ -0,0 +1,144 @@
+"""
+Rate Limiter - Token bucket partagé pour les APIs externes
+
+Remplace les `time.sleep(60)` + `return None` sur HTTP 429:
+- Token bucket process-wide (requêtes/minute configurables + burst)
+- Pacing AVANT l'appel pour rester sous le plafond de l'API
+- Sur 429: respect du header Retry-After, backoff exponentiel avec jitter,
+  puis retry au lieu de perdre les données du réseau
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from config.settings import (
+    GECKOTERMINAL_REQUESTS_PER_MINUTE,
+    GECKOTERMINAL_BURST,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_BACKOFF_BASE_SECONDS,
+    RATE_LIMIT_MAX_BACKOFF_SECONDS,
+)
+from utils.helpers import log
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe.
+
+    `capacity` jetons max, rechargés à `rate_per_minute / 60` jetons par seconde.
+    Chaque requête consomme un jeton; sans jeton disponible, l'appelant attend.
+    `penalize()` bloque tout le bucket (tous les threads) pendant un délai,
+    utilisé quand l'API renvoie 429.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, name: str = "api"):
+        self.name = name
+        self.rate_per_second = max(rate_per_minute, 0.001) / 60.0
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate_per_minute / 6))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Consomme `tokens` jetons, en attendant si nécessaire.
+
+        Returns:
+            Temps total attendu en secondes
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                else:
+                    wait = (tokens - self._tokens) / self.rate_per_second
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float):
+        """Bloque toutes les acquisitions pendant `seconds` et vide le bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = 0.0
+            self._last_refill = now
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convertit un header Retry-After (secondes ou date HTTP) en secondes."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Délai avant le retry numéro `attempt` (0 = premier retry).
+
+    Retry-After est respecté s'il est fourni; sinon backoff exponentiel.
+    Un jitter de 0-25% évite que tous les threads repartent en même temps.
+    """
+    if retry_after is not None:
+        delay = retry_after
+    else:
+        delay = RATE_LIMIT_BACKOFF_BASE_SECONDS * (2 ** attempt)
+    delay = min(delay, RATE_LIMIT_MAX_BACKOFF_SECONDS)
+    return delay + random.uniform(0, delay * 0.25)
+
+
+def request_with_rate_limit(bucket: TokenBucket, send: Callable, label: str = "",
+                            max_retries: int = RATE_LIMIT_MAX_RETRIES):
+    """
+    Exécute `send()` (qui renvoie une requests.Response) sous le token bucket.
+
+    Sur 429, attend Retry-After / backoff (pour tout le process via
+    bucket.penalize) puis réessaie jusqu'à `max_retries` fois.
+    Les exceptions réseau de `send()` sont propagées à l'appelant.
+
+    Returns:
+        La dernière Response (peut être un 429 si les retries sont épuisés)
+    """
+    attempt = 0
+    while True:
+        bucket.acquire()
+        response = send()
+
+        if response.status_code != 429 or attempt >= max_retries:
+            return response
+
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+        log(f"⚠️ Rate limit {bucket.name} {label}: retry {attempt + 1}/{max_retries} dans {delay:.1f}s")
+        bucket.penalize(delay)
+        attempt += 1
+
+
+# Limiteur process-wide pour toutes les requêtes GeckoTerminal
+geckoterminal_limiter = TokenBucket(
+    GECKOTERMINAL_REQUESTS_PER_MINUTE,
+    capacity=GECKOTERMINAL_BURST,
+    name="GeckoTerminal",
+)
@@ -1,35 +1,207 @@
 """
 Module Telegram - Envoi de notifications
 
-Gère l'envoi des alertes via Telegram.
+Gère l'envoi des alertes via Telegram:
+- send_telegram(): envoi synchrone (scripts, tests)
+- send_telegram_async(): file d'envoi bornée traitée par un thread dédié,
+  le scan n'attend plus le réseau (ni les pauses entre messages)
+
+Le dispatcher respecte les limites de la Bot API (global ~30 msg/s,
+1 msg/s par chat, 20 msg/min par groupe/canal) via des token buckets et,
+sur 429, attend le `retry_after` renvoyé par Telegram avant de réessayer.
+Le résultat de chaque envoi est remonté par callback(success).
 """
 
-import requests
-from config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+import queue
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from config.settings import (
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_CHAT_ID,
+    TELEGRAM_QUEUE_MAX_SIZE,
+    TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+    TELEGRAM_CHAT_MESSAGES_PER_MINUTE,
+    TELEGRAM_GROUP_MESSAGES_PER_MINUTE,
+    TELEGRAM_MAX_RETRIES,
+)
+from utils.helpers import log
+from utils.http_client import http_post
+from utils.metrics import metrics
+from utils.rate_limiter import TokenBucket, backoff_delay
 
 
-def send_telegram(message: str) -> bool:
+def _post_message(message: str, chat_id, parse_mode: str) -> Tuple[bool, bool, Optional[float]]:
+    """
+    Un appel sendMessage.
+
+    Returns:
+        (succès, réessayable, retry_after en secondes si 429)
+    """
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    data = {
+        "chat_id": chat_id,
+        "text": message,
+        "parse_mode": parse_mode,
+        "disable_web_page_preview": True
+    }
+    response = http_post(url, json=data, timeout=10)
+    if response.status_code == 200:
+        return True, False, None
+    if response.status_code == 429:
+        try:
+            retry_after = response.json().get("parameters", {}).get("retry_after")
+        except ValueError:
+            retry_after = None
+        return False, True, float(retry_after) if retry_after is not None else None
+    # 5xx: réessayable; 4xx (Markdown invalide, chat inconnu...): définitif
+    return False, response.status_code >= 500, None
+
+
+def send_telegram(message: str, chat_id=None, parse_mode: str = "Markdown") -> bool:
     """
     Envoie une alerte via Telegram.
 
     Args:
         message: Message à envoyer (format Markdown supporté)
+        chat_id: Chat destinataire (défaut: TELEGRAM_CHAT_ID)
+        parse_mode: 'Markdown' ou 'HTML'
 
     Returns:
         True si envoi réussi, False sinon
     """
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        data = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message,
-            "parse_mode": "Markdown",
-            "disable_web_page_preview": True
-        }
-        response = requests.post(url, json=data, timeout=10)
-        return response.status_code == 200
+        success, _, _ = _post_message(message, chat_id or TELEGRAM_CHAT_ID, parse_mode)
+        return success
     except Exception as e:
-        # Import local pour éviter circular dependency
-        from utils.helpers import log
         log(f"❌ Erreur Telegram: {e}")
         return False
+
+
+class TelegramDispatcher:
+    """File d'envoi Telegram bornée, un thread d'envoi, limites de débit par chat et globale."""
+
+    def __init__(self, max_size: int = TELEGRAM_QUEUE_MAX_SIZE, max_retries: int = TELEGRAM_MAX_RETRIES):
+        self.max_retries = max_retries
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._global_bucket = TokenBucket(
+            TELEGRAM_GLOBAL_MESSAGES_PER_SECOND * 60,
+            capacity=TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+            name="Telegram",
+        )
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, message: str, chat_id=None, parse_mode: str = "Markdown",
+               callback: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Met un message en file (non bloquant).
+
+        Args:
+            callback: Appelé avec le résultat de l'envoi, depuis le thread d'envoi
+
+        Returns:
+            False si la file est pleine (message abandonné, callback(False) appelé)
+        """
+        item = (message, chat_id or TELEGRAM_CHAT_ID, parse_mode, callback)
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            log(f"⚠️ File Telegram pleine ({self._queue.maxsize}): message abandonné")
+            metrics.inc("telegram_messages_total", result="dropped")
+            self._notify(callback, False)
+            return False
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Attend l'envoi des messages en file. Retourne False si timeout atteint."""
+        with self._queue.all_tasks_done:
+            if timeout is None:
+                while self._queue.unfinished_tasks:
+                    self._queue.all_tasks_done.wait()
+                return True
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        key = str(chat_id)
+        bucket = self._chat_buckets.get(key)
+        if bucket is None:
+            # Groupes et canaux (ID négatif): 20 msg/min; chats privés: 1 msg/s
+            rate = TELEGRAM_GROUP_MESSAGES_PER_MINUTE if key.startswith("-") else TELEGRAM_CHAT_MESSAGES_PER_MINUTE
+            bucket = self._chat_buckets[key] = TokenBucket(rate, capacity=1, name=f"Telegram {key}")
+        return bucket
+
+    def _run(self):
+        while True:
+            message, chat_id, parse_mode, callback = self._queue.get()
+            try:
+                success = self._deliver(message, chat_id, parse_mode)
+                metrics.inc("telegram_messages_total", result="sent" if success else "failed")
+                self._notify(callback, success)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, message: str, chat_id, parse_mode: str) -> bool:
+        chat_bucket = self._chat_bucket(chat_id)
+        attempt = 0
+        while True:
+            chat_bucket.acquire()
+            self._global_bucket.acquire()
+            try:
+                success, retryable, retry_after = _post_message(message, chat_id, parse_mode)
+            except Exception as e:
+                log(f"❌ Erreur Telegram: {e}")
+                success, retryable, retry_after = False, True, None
+
+            if success or not retryable or attempt >= self.max_retries:
+                return success
+
+            delay = backoff_delay(attempt, retry_after)
+            log(f"⚠️ Telegram: retry {attempt + 1}/{self.max_retries} dans {delay:.1f}s")
+            metrics.inc("telegram_retries_total")
+            chat_bucket.penalize(delay)
+            attempt += 1
+
+    @staticmethod
+    def _notify(callback: Optional[Callable[[bool], None]], success: bool):
+        if callback is None:
+            return
+        try:
+            callback(success)
+        except Exception as e:
+            log(f"⚠️ Erreur callback Telegram: {e}")
+
+
+_dispatcher: Optional[TelegramDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> TelegramDispatcher:
+    """Dispatcher process-wide (thread démarré au premier appel)."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = TelegramDispatcher()
+        return _dispatcher
+
+
+def send_telegram_async(message: str, chat_id=None, parse_mode: str = "Markdown",
+                        callback: Optional[Callable[[bool], None]] = None) -> bool:
+    """
+    Met une alerte en file d'envoi Telegram (retour immédiat).
+
+    Returns:
+        True si le message est en file, False si la file est pleine
+    """
+    return get_dispatcher().submit(message, chat_id=chat_id, parse_mode=parse_mode, callback=callback)
+
+
+def flush_telegram(timeout: Optional[float] = None) -> bool:
+    """Attend la fin des envois en file (arrêt propre du process)."""
+    if _dispatcher is None:
+        return True
+    return _dispatcher.flush(timeout)
@@ -6,6 +6,8 @@ pour un backtesting reel et fiable
 import sqlite3
 import os
 
+from data.alerts_schema import upgrade_alerts_schema
+
 DB_LOCAL = r"c:\Users\ludo_\Documents\projets\owner\bot-market\alerts_history.db"
 
 def get_current_schema():
@@ -25,6 +27,7 @@ def get_required_columns_for_backtesting():
         'id': 'INTEGER PRIMARY KEY AUTOINCREMENT',
         'timestamp': 'TEXT',
         'created_at': 'TEXT',
+        'created_at_epoch': 'INTEGER',  # Secondes Unix UTC (filtres temporels indexables)
 
         # === TOKEN INFO ===
         'token_name': 'TEXT',
@@ -165,7 +168,7 @@ def generate_database_documentation():
     doc.append("")
 
     categories = {
-        'IDENTIFICATION': ['id', 'timestamp', 'created_at'],
+        'IDENTIFICATION': ['id', 'timestamp', 'created_at', 'created_at_epoch'],
         'TOKEN INFO': ['token_name', 'token_symbol', 'token_address', 'pool_address', 'network'],
         'PRIX': ['price_at_alert', 'entry_price'],
         'TP/SL': ['stop_loss_price', 'stop_loss_percent', 'tp1_price', 'tp1_percent',
@@ -264,6 +267,16 @@ if __name__ == '__main__':
             exit(1)
     else:
         print("      Aucune migration necessaire - schema deja complet!")
+
+    # Colonne epoch (trigger + backfill) et index composites / partiel
+    conn = sqlite3.connect(DB_LOCAL)
+    try:
+        index_operations = upgrade_alerts_schema(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    for operation in index_operations:
+        print(f"      OK {operation}")
     print()
 
     # 5. Verification finale